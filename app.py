@@ -22,7 +22,7 @@ def create_app():
         from src.model_loader_v11 import cargar_modelo_v11
         modelo_v11 = cargar_modelo_v11()
         
-        if hasattr(modelo_v11, 'modelo_xgb') and modelo_v11.modelo_xgb is not None:
+        if getattr(modelo_v11, 'modelo_cargado', False):
             print("✅ Modelo v11 cargado exitosamente - APLICACIÓN LISTA")
         else:
             print("⚠️ Modelo v11 cargado pero verificar estado")
@@ -31,6 +31,15 @@ def create_app():
         print(f"❌ ERROR CRÍTICO - Modelo v11 falló: {e}")
         print("🚨 Continuando sin modelo v11 (modo degradado)")
     
+    # Precargar el índice de recomendaciones (con preload lo heredan los workers)
+    from src.config import Config
+    if Config.RECOMMENDATIONS_WARM_UP:
+        try:
+            from src.database import db_manager
+            db_manager.recommendations_index.refresh()
+        except Exception as e:
+            print(f"⚠️ Índice de recomendaciones no disponible, se cargará en el primer uso: {e}")
+    
     # Registrar API
     try:
         from src.api import api_bp
@@ -68,8 +77,7 @@ def health():
     
     try:
         from src.model_loader_v11 import modelo_v11_global
-        modelo_status = (hasattr(modelo_v11_global, 'modelo_xgb') and 
-                        modelo_v11_global.modelo_xgb is not None)
+        modelo_status = getattr(modelo_v11_global, 'modelo_cargado', False)
     except:
         modelo_status = False
     
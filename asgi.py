@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+
+class PredictionASGIApp:
+    """App ASGI con las rutas de predicción de src/api.py
+
+    El event loop nunca hace trabajo pesado: la inferencia corre en un pool
+    de hilos acotado y, si hay más de max_pending peticiones esperando, se
+    responde 503 en lugar de encolar sin límite. El registro en BD ya es
+    asíncrono (src/prediction_logger.py) y las etiquetas se traducen sin red,
+    así que nada bloquea a las demás peticiones.
+
+    Uso:
+        uvicorn asgi:app --host 0.0.0.0 --port 10000
+    """
+
+    def __init__(self, max_workers=None, max_pending=64):
+        from src import api
+
+        self.api = api
+        self.max_pending = max_pending
+        self.pending = 0
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1,
+                                           thread_name_prefix="inference")
+        self.routes = {
+            ("POST", "/api/predict-v11"): self._predict,
+            ("GET", "/api/health"): self._health,
+            ("GET", "/api/test-model"): self._test_model,
+            ("GET", "/api/models"): self._models,
+            ("GET", "/health"): self._health,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        method = scope["method"]
+        path = scope["path"].rstrip("/") or "/"
+
+        if method == "OPTIONS":
+            await self._send(send, 204, b"", cors_preflight=True)
+            return
+
+        handler = self.routes.get((method, path))
+        if handler is None:
+            allowed = any(route_path == path for _, route_path in self.routes)
+            status = 405 if allowed else 404
+            await self._send_json(send, {"error": "Método no permitido" if allowed else "Ruta no encontrada"}, status)
+            return
+
+        body = await self._read_body(receive)
+        payload, status = await handler(body)
+        await self._send_json(send, payload, status)
+
+    async def _predict(self, body):
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            return {"error": "JSON inválido"}, 400
+        return await self._run_inference(self.api.predict_v11_response, data)
+
+    async def _health(self, body):
+        # Solo lee contadores en memoria: no hace falta salir del event loop
+        return self.api.health_response()
+
+    async def _test_model(self, body):
+        return await self._run_inference(self.api.test_model_response)
+
+    async def _models(self, body):
+        return self.api.models_response()
+
+    async def _run_inference(self, fn, *args):
+        """Ejecutar fn en el pool acotado (503 si ya hay demasiadas en espera)"""
+        if self.pending >= self.max_pending:
+            return {
+                "error": "Servidor ocupado",
+                "message": "Demasiadas predicciones en curso, intenta de nuevo"
+            }, 503
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, fn, *args)
+        finally:
+            self.pending -= 1
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                from src.model_loader_v11 import modelo_v11_global
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self.executor, modelo_v11_global.warm_up)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                from src.model_loader_v11 import modelo_v11_global
+                from src.prediction_logger import prediction_logger
+                prediction_logger.shutdown()
+                if modelo_v11_global.inference_backend is not None:
+                    modelo_v11_global.inference_backend.shutdown()
+                self.executor.shutdown(wait=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _read_body(receive):
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    async def _send_json(self, send, payload, status):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        await self._send(send, status, body, content_type=b"application/json")
+
+    @staticmethod
+    async def _send(send, status, body, content_type=None, cors_preflight=False):
+        headers = [(b"access-control-allow-origin", b"*"), (b"content-length", str(len(body)).encode())]
+        if content_type:
+            headers.append((b"content-type", content_type))
+        if cors_preflight:
+            headers += [(b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+                        (b"access-control-allow-headers", b"Content-Type")]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+def create_asgi_app():
+    """Factory ASGI: carga el modelo igual que app.py:create_app"""
+    from src.config import Config
+    from src.model_loader_v11 import cargar_modelo_v11
+
+    print("🚀 Iniciando aplicación ASGI - MODELO V11...")
+    try:
+        cargar_modelo_v11()
+    except Exception as e:
+        print(f"❌ ERROR CRÍTICO - Modelo v11 falló: {e}")
+        print("🚨 Continuando sin modelo v11 (modo degradado)")
+
+    # Con micro-batching los hilos solo esperan su lote: hace falta uno por petición en curso
+    max_workers = Config.ASGI_MAX_PENDING if Config.MICRO_BATCH_ENABLED else Config.ASGI_INFERENCE_WORKERS
+    application = PredictionASGIApp(max_workers=max_workers, max_pending=Config.ASGI_MAX_PENDING)
+    print(f"✅ Aplicación ASGI lista ({application.executor._max_workers} hilos de inferencia)")
+    return application
+
+app = create_asgi_app()
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get('PORT', 10000)))
@@ -1,14 +1,98 @@
+import gc
 import os
 
 # CRÍTICO: Bind al puerto dinámico de Render
 bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
 
+def _available_memory_mb():
+    """Memoria disponible para el contenedor (límite de cgroup o MemAvailable)"""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+            if value != "max" and int(value) < (1 << 60):
+                return int(value) // (1024 * 1024)
+        except (OSError, ValueError):
+            pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+def _auto_workers():
+    """Workers según núcleos (2*n+1) acotados por la memoria disponible"""
+    by_cores = 2 * (os.cpu_count() or 1) + 1
+    memory_mb = _available_memory_mb()
+    if memory_mb is None:
+        return by_cores
+
+    # Con preload los workers comparten el modelo; solo cuenta su memoria propia
+    master_mb = int(os.environ.get('GUNICORN_MASTER_MEMORY_MB', 250))
+    worker_mb = int(os.environ.get('GUNICORN_WORKER_MEMORY_MB', 60))
+    by_memory = max(1, (memory_mb - master_mb) // worker_mb)
+    return max(1, min(by_cores, by_memory))
+
 # Configuración optimizada
-workers = 1
+# GUNICORN_WORKERS: número fijo o "auto" (núcleos y memoria disponibles)
+_workers_setting = os.environ.get('GUNICORN_WORKERS', '1')
+workers = _auto_workers() if _workers_setting == 'auto' else int(_workers_setting)
 worker_class = "sync"
 timeout = 300
 keepalive = 5
-max_requests = 100
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 100))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 20))
+
+# Preload: cargar la app y el modelo una vez en el maestro y luego hacer fork.
+# Los workers reciclados por max_requests nacen ya con el modelo cargado.
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'false').lower() == 'true'
+
+def when_ready(server):
+    """Precalentar el modelo en el maestro antes del primer fork"""
+    if not preload_app:
+        return
+    from src.model_loader_v11 import modelo_v11_global
+    # El pool de INFERENCE_BACKEND=process es por proceso: lo arranca cada worker (post_worker_init)
+    modelo_v11_global.warm_up(start_backend=False)
+    gc.collect()
+
+def pre_fork(server, worker):
+    """Congelar el heap del maestro para que el GC no toque sus páginas
+
+    Sin gc.freeze() los recorridos del recolector escriben en los
+    encabezados de objetos heredados y rompen el copy-on-write.
+    """
+    if preload_app:
+        gc.freeze()
+
+def post_worker_init(worker):
+    """Arrancar el pool de inferencia del worker antes de aceptar peticiones
+
+    Así las primeras peticiones no pagan el arranque de los procesos ni
+    la carga del modelo en cada uno (INFERENCE_BACKEND=process).
+    """
+    import sys
+    loader = sys.modules.get('src.model_loader_v11')
+    if loader is not None and loader.modelo_v11_global.inference_backend is not None:
+        processes = loader.modelo_v11_global.inference_backend.warm_up()
+        print(f"🔥 Worker {os.getpid()}: pool de inferencia listo ({processes} procesos)")
+
+def worker_exit(server, worker):
+    """Vaciar el registro de predicciones y cerrar los pools de BD e inferencia"""
+    from src.prediction_logger import prediction_logger
+    prediction_logger.shutdown()
+
+    from src.model_loader_v11 import modelo_v11_global
+    if modelo_v11_global.inference_backend is not None:
+        modelo_v11_global.inference_backend.shutdown()
+
+    import sys
+    database = sys.modules.get('src.database')
+    if database is not None and database.db_manager._pool is not None:
+        database.db_manager._pool.close_all()
 
 # Logging
 accesslog = "-"
@@ -17,4 +101,5 @@ loglevel = "info"
 
 # Debug
 print(f"🚀 Gunicorn configurado para puerto: {os.environ.get('PORT', '10000')}")
-print(f"📡 Bind address: {bind}")
\ No newline at end of file
+print(f"📡 Bind address: {bind}")
+print(f"👷 Workers: {workers} | Preload: {'sí' if preload_app else 'no'}")
@@ -0,0 +1,56 @@
+"""Comparar el servidor sync actual (gunicorn + Flask) con el ASGI (uvicorn + asgi.py)
+
+Arranca cada servidor con un solo proceso, caché de predicciones
+desactivada, y corre scripts/load_test.py contra /api/predict-v11 con
+usuarios concurrentes. Reporta RPS y latencias p50/p99.
+
+Uso:
+    python scripts/benchmark_asgi.py [--users 1 16 64] [--duration 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+
+from benchmark_gunicorn import free_port
+from load_test import run_load, wait_until_ready
+
+SERVERS = {
+    "sync (gunicorn)": lambda port: [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"],
+    "asgi (uvicorn)": lambda port: [sys.executable, "-m", "uvicorn", "asgi:app", "--port", str(port),
+                                    "--log-level", "warning", "--no-access-log"],
+}
+
+def measure(name, users_list, duration):
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), GUNICORN_WORKERS="1", GUNICORN_MAX_REQUESTS="0",
+               PREDICTION_CACHE_SIZE="0")
+    server = subprocess.Popen(SERVERS[name](port), cwd=ROOT_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        url = f"http://127.0.0.1:{port}"
+        if not wait_until_ready(url, timeout=120):
+            raise RuntimeError(f"{name} no arrancó")
+        run_load(url, users=2, duration=2)  # calentar
+        return [(users, run_load(url, users=users, duration=duration)) for users in users_list]
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--duration", type=float, default=15)
+    args = parser.parse_args()
+
+    print(f"🖥️ {os.cpu_count()} CPU | {args.duration:.0f} s por corrida | caché desactivada")
+    print(f"   {'servidor':<16} {'usuarios':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errores':>8}")
+    for name in SERVERS:
+        for users, r in measure(name, args.users, args.duration):
+            print(f"   {name:<16} {users:>8} {r['rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['errors']:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Latencia del modelo binario (v9): ruta densa anterior vs índices vs lote
+
+modelo_diagnostico_v9_final.pkl no está en el repositorio, así que por
+defecto se entrena un XGBoost sustituto con la forma de v9 (132 síntomas y
+las clases de preprocesadores_v9_final.pkl) sobre datos sintéticos. Con
+--real se usa el modelo del registro.
+
+Uso:
+    python scripts/benchmark_binary_fast_path.py [--repeat 2000] [--batch 1000] [--real]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.config import Config
+from src.model_registry import ModelRegistry
+from src.predictor import ModelManager
+
+def stand_in_registry():
+    """Registro temporal con un XGBoost de la forma de v9"""
+    from xgboost import XGBClassifier
+
+    prep = joblib.load(os.path.join(Config.MODEL_PATH, 'preprocesadores_v9_final.pkl'))
+    n_features = len(prep['feature_columns'])
+    n_classes = len(prep['diagnosis_encoder'].classes_)
+    rng = np.random.default_rng(0)
+    X = (rng.random((n_classes * 40, n_features)) < 0.05).astype(np.float32)
+    y = np.repeat(np.arange(n_classes), 40)
+    model = XGBClassifier(n_estimators=30, max_depth=4, tree_method='hist').fit(X, y)
+
+    models_dir = tempfile.mkdtemp()
+    joblib.dump(model, os.path.join(models_dir, 'modelo_diagnostico_v9_final.pkl'))
+    joblib.dump(prep, os.path.join(models_dir, 'preprocesadores_v9_final.pkl'))
+    return ModelRegistry(models_dir)
+
+def legacy_predict(model_data, symptoms_array):
+    """Ruta anterior: np.array(...).reshape + predict + predict_proba"""
+    features = np.array(symptoms_array).reshape(1, -1)
+    model = model_data['model']
+    prediction = model.predict(features)[0]
+    probabilities = model.predict_proba(features)[0]
+    return model_data['preprocessor']['diagnosis_encoder'].inverse_transform([prediction])[0], max(probabilities)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--real", action="store_true")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(Config.MODEL_PATH) if args.real else stand_in_registry()
+    manager = ModelManager(registry)
+    model_data = registry.get('v9')
+    n_features = manager.feature_count('v9')
+
+    rng = np.random.default_rng(1)
+    cases = [np.flatnonzero(rng.random(n_features) < 0.04) for _ in range(64)]
+    dense = []
+    for indices in cases:
+        row = [0] * n_features
+        for i in indices:
+            row[i] = 1
+        dense.append(row)
+
+    for indices, row in zip(cases, dense):
+        old = legacy_predict(model_data, row)
+        new = manager.predict_binary(indices=indices, model_version='v9')
+        assert old[0] == new["diagnosis"], "Diagnóstico distinto entre rutas"
+
+    def timed(fn):
+        start = time.perf_counter()
+        for n in range(args.repeat):
+            fn(n % len(cases))
+        return (time.perf_counter() - start) / args.repeat * 1e6
+
+    legacy_us = timed(lambda n: legacy_predict(model_data, dense[n]))
+    dense_us = timed(lambda n: manager.predict_binary(dense[n], 'v9'))
+    indices_us = timed(lambda n: manager.predict_binary(indices=cases[n], model_version='v9'))
+
+    bitsets = np.packbits((rng.random((args.batch, n_features)) < 0.04).astype(np.uint8), axis=1)
+    start = time.perf_counter()
+    manager.predict_binary_batch(bitsets, 'v9')
+    batch_us = (time.perf_counter() - start) / args.batch * 1e6
+
+    print(f"🧪 {'v9 real' if args.real else 'XGBoost sustituto con forma de v9'} | {n_features} síntomas")
+    print(f"   {'ruta':<36} {'µs/predicción':>14}")
+    print(f"   {'anterior (predict + predict_proba)':<36} {legacy_us:>14.1f}")
+    print(f"   {'arreglo denso (un predict_proba)':<36} {dense_us:>14.1f}")
+    print(f"   {'índices + vector por hilo':<36} {indices_us:>14.1f}")
+    print(f"   {f'lote de {args.batch} (packbits)':<36} {batch_us:>14.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Latencia de scoring: modelos de árboles originales vs motor compilado
+
+Compara predict_proba de sklearn/XGBoost (y inplace_predict para XGBoost)
+con los modelos compilados por scripts/compile_tree_models.py, para una
+fila y para un lote, sobre el bosque de backup v11 y los XGBoost del
+registro.
+
+Uso:
+    python scripts/benchmark_compiled_trees.py [--repeat 500] [--batch 256]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+
+import joblib
+from scipy.sparse import vstack
+
+from load_test import SAMPLE_COMPLAINTS
+from src.compiled_trees import load_compiled_model
+from src.config import Config
+from src.model_registry import ModelRegistry
+from src.preprocessor import FeatureBuilder
+
+def timed(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def report(name, model, compiled, X, repeat, batch):
+    row = X[0]
+    rows = vstack([X] * (batch // X.shape[0] + 1)).tocsr()[:batch]
+    engines = [("original", model.predict_proba), ("compilado", compiled.predict_proba)]
+    if hasattr(model, "get_booster"):
+        booster = model.get_booster()
+        engines.insert(1, ("inplace_predict", booster.inplace_predict))
+
+    for engine, predict in engines:
+        single = timed(lambda: predict(row), repeat)
+        bulk = timed(lambda: predict(rows), max(1, repeat // 20)) / batch
+        print(f"   {name:<14} {engine:<16} {single:>10.1f} {bulk:>12.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=256)
+    args = parser.parse_args()
+
+    print(f"🌲 {args.repeat} repeticiones | lote de {args.batch}")
+    print(f"   {'modelo':<14} {'motor':<16} {'µs/1 fila':>10} {'µs/fila lote':>12}")
+
+    bundle = joblib.load(Config.V11_BACKUP_BUNDLE)
+    compiled = load_compiled_model(os.path.join(Config.COMPILED_MODELS_PATH, 'v11_backup'))
+    if compiled is None:
+        raise SystemExit("❌ Falta el compilado: python scripts/compile_tree_models.py")
+    X = bundle['tfidf_vectorizer'].transform([text.lower() for text in SAMPLE_COMPLAINTS])
+    report("v11_backup", bundle['modelo'], compiled, X, args.repeat, args.batch)
+
+    registry = ModelRegistry(Config.MODEL_PATH)
+    for version in registry.versions():
+        compiled = load_compiled_model(os.path.join(Config.COMPILED_MODELS_PATH, version))
+        model_data = registry.get(version)
+        if compiled is None or model_data['type'] != 'text':
+            continue
+        builder = FeatureBuilder.for_model(model_data)
+        X = vstack([builder.build_text_features(text)[0] for text in SAMPLE_COMPLAINTS]).tocsr()
+        report(version, model_data['model'], compiled, X, args.repeat, args.batch)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Latencia por consulta: conexión nueva por llamada vs pool de conexiones
+
+Por defecto usa un sustituto SQLite con una latencia de conexión simulada
+(--handshake-ms, el costo de TCP + TLS + autenticación contra MySQL). Con
+--mysql mide contra la BD configurada en .env.
+
+Uso:
+    python scripts/benchmark_db_pool.py [--queries 500] [--threads 4] [--handshake-ms 20] [--mysql]
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.db_pool import ConnectionPool
+
+QUERY = "SELECT recommendation_text FROM recommendations WHERE diagnosis_id = 1"
+
+def sqlite_factory(path, handshake_ms):
+    def factory():
+        time.sleep(handshake_ms / 1000)
+        return sqlite3.connect(path, check_same_thread=False)
+    return factory
+
+def create_sqlite_db():
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE recommendations (id INTEGER PRIMARY KEY, diagnosis_id INT, recommendation_text TEXT)")
+    connection.executemany("INSERT INTO recommendations (diagnosis_id, recommendation_text) VALUES (?, ?)",
+                           [(i % 10, f"Recomendación {i}") for i in range(200)])
+    connection.commit()
+    connection.close()
+    return path
+
+def run_query(connection, query):
+    cursor = connection.cursor()
+    cursor.execute(query)
+    cursor.fetchall()
+    cursor.close()
+
+def measure(borrow, queries, threads, query):
+    """Ejecutar las consultas repartidas en hilos y devolver latencias en ms"""
+    latencies = []
+    lock = threading.Lock()
+    per_thread = queries // threads
+
+    def worker():
+        local = []
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            borrow(query)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))],
+        "mean": statistics.fmean(latencies)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    parser.add_argument("--mysql", action="store_true", help="Medir contra la BD de .env")
+    args = parser.parse_args()
+
+    if args.mysql:
+        import mysql.connector
+        from src.config import Config
+        db_config = Config.get_db_config()
+        factory = lambda: mysql.connector.connect(**db_config)
+        query = "SELECT 1"
+        backend = f"MySQL {db_config['host']}"
+    else:
+        factory = sqlite_factory(create_sqlite_db(), args.handshake_ms)
+        query = QUERY
+        backend = f"SQLite + {args.handshake_ms:.0f} ms de conexión simulada"
+
+    def connect_per_call(q):
+        connection = factory()
+        try:
+            run_query(connection, q)
+        finally:
+            connection.close()
+
+    pool = ConnectionPool(factory, max_size=args.pool_size)
+
+    def pooled(q):
+        with pool.connection() as connection:
+            run_query(connection, q)
+
+    print(f"🗄️ {backend} | {args.queries} consultas | {args.threads} hilos | pool {args.pool_size}")
+    print(f"   {'modo':<18} {'media ms':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, borrow in (("conexión por uso", connect_per_call), ("pool", pooled)):
+        r = measure(borrow, args.queries, args.threads, query)
+        print(f"   {name:<18} {r['mean']:>9.2f} {r['p50']:>8.2f} {r['p99']:>8.2f}")
+    print(f"   📊 Pool: {pool.stats()}")
+    pool.close_all()
+
+if __name__ == "__main__":
+    main()
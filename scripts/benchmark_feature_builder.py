@@ -0,0 +1,81 @@
+"""Micro-benchmark de construcción de características por petición
+
+Compara la ruta anterior de ModelManager.predict_text (FeatureBuilder nuevo
+en cada llamada, `in classes_`, LabelEncoder.transform por campo y
+scipy.sparse.hstack) con el builder cacheado por versión, sobre un modelo
+de texto del registro. Verifica que ambas rutas den la misma fila.
+
+Uso:
+    python scripts/benchmark_feature_builder.py [--model v8_mejorado] [--repeat 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.sparse import hstack
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+
+from load_test import SAMPLE_COMPLAINTS
+from src.config import Config
+from src.model_registry import ModelRegistry
+from src.preprocessor import FeatureBuilder, TextPreprocessor
+
+DEMOGRAPHICS = [("21-40", "Unknown"), ("25-34", "Male"), (None, None)]
+
+def legacy_build(prep, text, age_range, gender):
+    """Construcción original (src/preprocessor.py antes del builder cacheado)"""
+    clean_text = TextPreprocessor.clean_medical_text(text)
+    text_features = prep['tfidf_vectorizer'].transform([clean_text])
+    age_encoder = prep['age_encoder']
+    gender_encoder = prep['gender_encoder']
+    age_range = age_range or "25-34"
+    gender = gender or "Unknown"
+    if age_range not in age_encoder.classes_:
+        age_range = age_encoder.classes_[0]
+    if gender not in gender_encoder.classes_:
+        gender = gender_encoder.classes_[0]
+    age_enc = age_encoder.transform([age_range])[0]
+    gender_enc = gender_encoder.transform([gender])[0]
+    return hstack([text_features, np.array([[age_enc, gender_enc]])]), clean_text
+
+def timed(fn, cases, repeat):
+    start = time.perf_counter()
+    for n in range(repeat):
+        fn(*cases[n % len(cases)])
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="v8_mejorado")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    model_data = ModelRegistry(Config.MODEL_PATH).get(args.model)
+    prep = model_data['preprocessor']
+    cases = [(text, age, gender) for text in SAMPLE_COMPLAINTS for age, gender in DEMOGRAPHICS]
+
+    for text, age, gender in cases:
+        old, _ = legacy_build(prep, text, age, gender)
+        new, _ = FeatureBuilder.for_model(model_data).build_text_features(text, age, gender)
+        assert (old.tocsr() != new).nnz == 0, f"Fila distinta para {text!r}"
+
+    legacy_us = timed(lambda *c: legacy_build(prep, *c), cases, args.repeat)
+    fresh_us = timed(lambda *c: FeatureBuilder(model_data).build_text_features(*c), cases, args.repeat)
+    cached_us = timed(lambda *c: FeatureBuilder.for_model(model_data).build_text_features(*c), cases, args.repeat)
+    tfidf_us = timed(lambda text, *_: prep['tfidf_vectorizer'].transform([TextPreprocessor.clean_medical_text(text)]),
+                     cases, args.repeat)
+
+    print(f"🧮 {args.model}: {len(cases)} casos x {args.repeat} repeticiones (filas idénticas)")
+    print(f"   {'ruta':<34} {'µs/petición':>12}")
+    print(f"   {'anterior (hstack + transform)':<34} {legacy_us:>12.1f}")
+    print(f"   {'builder nuevo por llamada':<34} {fresh_us:>12.1f}")
+    print(f"   {'builder cacheado':<34} {cached_us:>12.1f}")
+    print(f"   {'solo limpieza + TF-IDF':<34} {tfidf_us:>12.1f}")
+
+if __name__ == "__main__":
+    main()
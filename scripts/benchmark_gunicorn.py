@@ -0,0 +1,63 @@
+"""Curva de throughput de gunicorn con preload para 1/2/4 workers
+
+Arranca gunicorn con gunicorn.conf.py (GUNICORN_PRELOAD=true, caché de
+predicciones desactivada) y corre scripts/load_test.py contra cada
+configuración.
+
+Uso:
+    python scripts/benchmark_gunicorn.py [--workers 1 2 4] [--users 16] [--duration 15]
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+
+from load_test import run_load, wait_until_ready
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def measure(workers, preload, users, duration):
+    port = free_port()
+    env = dict(os.environ,
+               PORT=str(port),
+               GUNICORN_WORKERS=str(workers),
+               GUNICORN_PRELOAD="true" if preload else "false",
+               GUNICORN_MAX_REQUESTS="0",
+               PREDICTION_CACHE_SIZE="0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        url = f"http://127.0.0.1:{port}"
+        if not wait_until_ready(url, timeout=120):
+            raise RuntimeError(f"gunicorn con {workers} workers no arrancó")
+        run_load(url, users=2, duration=2)  # calentar todos los workers
+        return run_load(url, users=users, duration=duration)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--no-preload", action="store_true")
+    args = parser.parse_args()
+
+    print(f"🖥️ {os.cpu_count()} CPU | {args.users} usuarios | {args.duration:.0f} s por corrida")
+    print(f"   {'workers':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errores':>8}")
+    for workers in args.workers:
+        r = measure(workers, not args.no_preload, args.users, args.duration)
+        print(f"   {workers:>7} {r['rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['errors']:>8}")
+
+if __name__ == "__main__":
+    main()
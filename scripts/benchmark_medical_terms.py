@@ -0,0 +1,86 @@
+"""Latencia de extracción de términos médicos según el tamaño del diccionario
+
+Compara el recorrido secuencial (`término in texto` por cada sinónimo)
+con el autómata de Aho-Corasick de src/medical_terms.py. El diccionario
+base de ModeloV11Fallback se amplía con términos sintéticos hasta el
+tamaño pedido; la latencia del autómata no debería crecer con él.
+
+Uso:
+    python scripts/benchmark_medical_terms.py [--sizes 100 1000 10000 50000] [--repeat 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+
+from load_test import SAMPLE_COMPLAINTS
+from src.medical_terms import MedicalTermExtractor
+from src.model_loader_v11 import modelo_v11_global
+
+def synthetic_dict(base, size, seed=42):
+    """Diccionario base más sinónimos sintéticos hasta `size` términos"""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyzáéíóúñ"
+    medical_dict = {k: list(v) for k, v in base.items()}
+    total = sum(len(v) for v in medical_dict.values())
+    group = 0
+    while total < size:
+        words = [
+            " ".join("".join(rng.choice(letters) for _ in range(rng.randint(4, 10)))
+                     for _ in range(rng.randint(1, 3)))
+            for _ in range(50)
+        ]
+        medical_dict[f"sintetico_{group}"] = words
+        total += len(words)
+        group += 1
+    return medical_dict
+
+def sequential_extract(medical_dict, text):
+    """Versión ingenua: un recorrido del texto por cada sinónimo (texto sin puntuación)"""
+    found = []
+    for canonical, synonyms in medical_dict.items():
+        for term in synonyms:
+            if f" {term} " in f" {text} ":
+                found.append(canonical)
+                break
+    return found
+
+def time_per_call(fn, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    base = modelo_v11_global.medical_dict
+    texts = [" ".join(t.lower().split()) for t in SAMPLE_COMPLAINTS]
+
+    print(f"🩺 {len(texts)} quejas × {args.repeat} repeticiones")
+    print(f"   {'términos':>9} {'estados':>9} {'build ms':>9} {'secuencial µs':>14} {'autómata µs':>12}")
+    for size in args.sizes:
+        medical_dict = synthetic_dict(base, size)
+        start = time.perf_counter()
+        extractor = MedicalTermExtractor(medical_dict)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        for text in texts:
+            assert sorted(extractor.extract(text)) == sorted(sequential_extract(medical_dict, text)), text
+
+        sequential_us = time_per_call(lambda t: sequential_extract(medical_dict, t), texts, max(1, args.repeat // 20))
+        automaton_us = time_per_call(extractor.extract, texts, args.repeat)
+        print(f"   {extractor.terms:>9} {extractor.automaton.states:>9} {build_ms:>9.0f} "
+              f"{sequential_us:>14.1f} {automaton_us:>12.1f}")
+
+if __name__ == "__main__":
+    main()
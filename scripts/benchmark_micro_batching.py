@@ -0,0 +1,78 @@
+"""Throughput y latencia con y sin micro-batching (en proceso)
+
+Hilos concurrentes piden predicciones individuales con textos únicos
+(caché desactivada), directamente con predict_symptoms o a través de
+MicroBatcher con distintos retrasos máximos. Reporta req/s, p50/p99 e
+histograma de tamaños de lote.
+
+Uso:
+    python scripts/benchmark_micro_batching.py [--clients 32] [--duration 5] [--delays 2 5 10]
+"""
+import argparse
+import itertools
+import os
+import sys
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+os.environ["PREDICTION_CACHE_SIZE"] = "0"
+
+from load_test import SAMPLE_COMPLAINTS, percentile
+from src.micro_batcher import MicroBatcher
+from src.model_loader_v11 import modelo_v11_global
+
+def run(predict, clients, duration):
+    latencies = []
+    lock = threading.Lock()
+    counter = itertools.count()
+    stop_at = time.perf_counter() + duration
+
+    def client():
+        local = []
+        while time.perf_counter() < stop_at:
+            n = next(counter)
+            text = f"{SAMPLE_COMPLAINTS[n % len(SAMPLE_COMPLAINTS)]} caso {n}"
+            start = time.perf_counter()
+            predict(text)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return len(latencies) / wall, percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--delays", type=float, nargs="+", default=[2, 5, 10])
+    args = parser.parse_args()
+
+    modelo_v11_global.warm_up()
+    print(f"🖥️ {os.cpu_count()} CPU | {args.clients} clientes | {args.duration:.0f} s por corrida")
+    print(f"   {'modo':<22} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}  lotes")
+
+    rps, p50, p99 = run(lambda t: modelo_v11_global.predict_symptoms(t), args.clients, args.duration)
+    print(f"   {'directo':<22} {rps:>8.1f} {p50:>8.1f} {p99:>8.1f}")
+
+    for delay in args.delays:
+        batcher = MicroBatcher(modelo_v11_global.predict_symptoms_batch, args.batch_size, delay)
+        rps, p50, p99 = run(lambda t: batcher.predict({"symptoms": t}), args.clients, args.duration)
+        stats = batcher.stats()
+        print(f"   {f'micro-lote {delay:g} ms':<22} {rps:>8.1f} {p50:>8.1f} {p99:>8.1f}  "
+              f"media {stats['avg_batch_size']} | {stats['batch_size_histogram']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Escalado del backend de inferencia en procesos frente al de hilos
+
+Hilos cliente piden predicciones individuales con textos únicos (caché
+desactivada) contra el modelo en el proceso y contra pools de 1..N
+procesos. En una máquina con un solo núcleo no hay escalado posible;
+correr el script en la máquina de destino.
+
+Uso:
+    python scripts/benchmark_process_backend.py [--processes 1 2 4 8] [--clients 16] [--duration 5]
+"""
+import argparse
+import itertools
+import os
+import sys
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+os.environ["PREDICTION_CACHE_SIZE"] = "0"
+
+from load_test import SAMPLE_COMPLAINTS, percentile
+from src.model_loader_v11 import modelo_v11_global
+from src.process_backend import ProcessInferenceBackend
+
+def run(clients, duration):
+    latencies = []
+    lock = threading.Lock()
+    counter = itertools.count()
+    stop_at = time.perf_counter() + duration
+
+    def client():
+        local = []
+        while time.perf_counter() < stop_at:
+            n = next(counter)
+            start = time.perf_counter()
+            modelo_v11_global.predict_symptoms(f"{SAMPLE_COMPLAINTS[n % len(SAMPLE_COMPLAINTS)]} caso {n}")
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return len(latencies) / wall, percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5)
+    args = parser.parse_args()
+
+    modelo_v11_global.warm_up()
+    print(f"🖥️ {os.cpu_count()} CPU | {args.clients} clientes | {args.duration:.0f} s por corrida")
+    print(f"   {'backend':<14} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+
+    rps, p50, p99 = run(args.clients, args.duration)
+    print(f"   {'hilos':<14} {rps:>8.1f} {p50:>8.1f} {p99:>8.1f}")
+
+    for processes in args.processes:
+        backend = ProcessInferenceBackend(processes, fallback=modelo_v11_global._predict_classes_local)
+        backend.warm_up()
+        modelo_v11_global.inference_backend = backend
+        try:
+            rps, p50, p99 = run(args.clients, args.duration)
+        finally:
+            modelo_v11_global.inference_backend = None
+            backend.shutdown()
+        print(f"   {f'{processes} procesos':<14} {rps:>8.1f} {p50:>8.1f} {p99:>8.1f}")
+
+if __name__ == "__main__":
+    main()
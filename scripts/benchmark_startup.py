@@ -0,0 +1,70 @@
+"""Benchmark de arranque en frío: create_app() -> primera predicción servida
+
+Cada corrida se ejecuta en un proceso nuevo para medir el import real
+(incluyendo la creación de modelo_v11_global). Compara el bundle
+precomputado contra el reentrenamiento sintético (bundle inexistente).
+El import de scikit-learn (diferido hasta la primera predicción) se
+reporta aparte porque domina el tiempo y tiene mucha varianza.
+
+Uso:
+    python scripts/benchmark_startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_CODE = r"""
+import io, json, sys, time, contextlib
+t0 = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import app as app_module
+    t_app = time.perf_counter()
+    import sklearn.ensemble, sklearn.feature_extraction.text
+    t_sklearn = time.perf_counter()
+    client = app_module.app.test_client()
+    response = client.post('/api/predict-v11', json={'symptoms': 'dolor de cabeza y fiebre'})
+    t_pred = time.perf_counter()
+assert response.status_code == 200, response.get_data(as_text=True)
+print(json.dumps({
+    'create_app_ms': (t_app - t0) * 1000,
+    'sklearn_import_ms': (t_sklearn - t_app) * 1000,
+    'first_prediction_ms': (t_pred - t_sklearn) * 1000,
+    'total_ms': (t_pred - t0) * 1000
+}))
+"""
+
+def run_once(extra_env):
+    """Ejecutar un arranque en frío en un subproceso y devolver tiempos"""
+    env = dict(os.environ, **extra_env)
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def summarize(label, samples):
+    """Imprimir mediana de cada fase"""
+    print(f"\n📊 {label} ({len(samples)} corridas, mediana)")
+    for key in ("create_app_ms", "sklearn_import_ms", "first_prediction_ms", "total_ms"):
+        print(f"   {key:<22} {statistics.median(s[key] for s in samples):8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    scenarios = {
+        "Bundle precomputado": {},
+        "Reentrenamiento sintético": {"V11_BACKUP_BUNDLE": os.path.join(ROOT_DIR, "no-existe.pkl")},
+    }
+
+    for label, extra_env in scenarios.items():
+        summarize(label, [run_once(extra_env) for _ in range(args.runs)])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Micro-benchmark de extracción de edad, género y palabras clave
+
+Compara la implementación secuencial anterior (un re.search sin compilar
+por patrón y cadenas de `in`) con el extractor precompilado de
+src/text_signals.py sobre quejas realistas en español, y verifica que
+ambos den el mismo resultado.
+
+Uso:
+    python scripts/benchmark_text_signals.py [--repeat 2000]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+
+from load_test import SAMPLE_COMPLAINTS
+from src.text_signals import text_signals
+
+CORPUS = SAMPLE_COMPLAINTS + [
+    "tengo edad 5 años y mi padre 40 años tiene fiebre",
+    "Tengo 34 años y desde ayer tengo fiebre, tos con flema y dolor de garganta",
+    "soy mujer de 52 años, estoy en la menopausia y tengo sofocos y dolor de cabeza",
+    "mi hijo tiene 7 años y vomitó dos veces, le duele el estómago",
+    "soy hombre, 67 años, me operaron de la próstata y ahora tengo ardor al orinar",
+    "hace 3 años que tengo migraña, ahora con náusea y sensibilidad a la luz",
+    "estoy embarazada de 20 semanas y tengo mareo y presión baja",
+    "edad 45, diabético, me siento cansado y con mucha sed",
+    "soy de 29 y tengo ansiedad, palpitaciones y no duermo",
+    "dolor articular en manos y rodillas por las mañanas, rigidez de una hora",
+    "me salió una erupción roja en la piel después de tomar un antibiótico",
+    "tengo 150 años de edad y me duele todo",
+    "sin síntomas claros, solo cansancio general",
+]
+
+def legacy_extract_age(text):
+    for pattern in [r'tengo (\d+) años', r'(\d+) años', r'edad (\d+)', r'soy de (\d+)', r'(\d+) años de edad']:
+        match = re.search(pattern, text.lower())
+        if match:
+            age = int(match.group(1))
+            if 1 <= age <= 120:
+                return age
+    return None
+
+def legacy_detect_gender(text):
+    text_lower = text.lower()
+    female = [r'\bestoy embarazada\b', r'\bmenstruación\b', r'\bmenstrual\b', r'\bovarios\b', r'\bútero\b',
+              r'\bmenopausia\b', r'\bginecológico\b', r'\bsoy mujer\b', r'\bsoy femenina\b', r'\bestoy lactando\b']
+    male = [r'\bpróstata\b', r'\btestículos\b', r'\bsoy hombre\b', r'\bsoy masculino\b', r'\bandrológico\b']
+    for pattern in female:
+        if re.search(pattern, text_lower):
+            return "Female"
+    for pattern in male:
+        if re.search(pattern, text_lower):
+            return "Male"
+    return "Unknown"
+
+def legacy_keyword_class(text):
+    s = text.lower()
+    if any(w in s for w in ["cabeza", "migraña", "cefalea"]):
+        return 1
+    elif any(w in s for w in ["estómago", "náusea", "vómito"]):
+        return 2
+    elif any(w in s for w in ["tos", "respirar", "pecho"]):
+        return 3
+    elif any(w in s for w in ["muscular", "articular", "dolor"]):
+        return 4
+    elif any(w in s for w in ["corazón", "palpitaciones"]):
+        return 5
+    elif any(w in s for w in ["mareo", "confusión"]):
+        return 6
+    elif any(w in s for w in ["fiebre", "temperatura"]):
+        return 7
+    elif any(w in s for w in ["piel", "erupción"]):
+        return 8
+    elif any(w in s for w in ["ansiedad", "nervios"]):
+        return 9
+    return 0
+
+def legacy(text):
+    return legacy_extract_age(text), legacy_detect_gender(text), legacy_keyword_class(text)
+
+def single_pass(text):
+    signals = text_signals.extract(text)
+    return signals.age, signals.gender, text_signals.keyword_class(text)
+
+def time_per_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in CORPUS:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(CORPUS)) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    mismatches = [(t, legacy(t), single_pass(t)) for t in CORPUS if legacy(t) != single_pass(t)]
+    if mismatches:
+        raise SystemExit(f"❌ Resultados distintos: {mismatches}")
+
+    print(f"🔤 {len(CORPUS)} quejas × {args.repeat} repeticiones (edad + género + palabras clave)")
+    legacy_us = time_per_call(legacy, args.repeat)
+    # keyword_class vuelve a recorrer el texto; extract solo mide la extracción
+    extract_us = time_per_call(text_signals.extract, args.repeat)
+    print(f"   secuencial (anterior):  {legacy_us:6.1f} µs/llamada")
+    print(f"   precompilado:           {extract_us:6.1f} µs/llamada ({legacy_us / extract_us:.1f}x)")
+
+if __name__ == "__main__":
+    main()
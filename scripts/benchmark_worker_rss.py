@@ -0,0 +1,120 @@
+"""Benchmark de memoria por worker: pickles (joblib) vs arreglos mapeados (mmap)
+
+Lanza N procesos simultáneos que cargan los mismos artefactos (todos los
+TF-IDF de models/ más el bosque de backup v11) y transforman un texto de
+prueba. Con los procesos vivos a la vez se mide RSS y PSS (memoria
+proporcional: las páginas compartidas se reparten entre procesos) y
+memoria privada. Solo Linux (/proc/self/smaps_rollup).
+
+Uso:
+    python scripts/benchmark_worker_rss.py [--workers 4]
+"""
+import argparse
+import glob
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+SAMPLE_TEXT = "patient presents with severe headache nausea and chest pain"
+
+def read_memory_kb():
+    """RSS, PSS y memoria privada del proceso actual en KB"""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:", "Private_Clean:", "Private_Dirty:"):
+                values[parts[0][:-1]] = int(parts[1])
+    return {
+        "rss": values["Rss"],
+        "pss": values["Pss"],
+        "private": values["Private_Clean"] + values["Private_Dirty"]
+    }
+
+def artifact_sources():
+    """Pickles con TF-IDF incluidos en el repo + bundle de backup v11"""
+    from src.config import Config
+    sources = sorted(glob.glob(os.path.join(Config.MODEL_PATH, "preprocesadores_*.pkl")))
+    sources.append(os.path.join(Config.V11_COMPONENTS_PATH, "tfidf_vectorizer.pkl"))
+    sources.append(Config.V11_BACKUP_BUNDLE)
+    return sources
+
+def load_pickles(sources):
+    import joblib
+    loaded = []
+    for source in sources:
+        obj = joblib.load(source)
+        if isinstance(obj, dict):
+            loaded.extend(v for k, v in obj.items() if k in ("tfidf_vectorizer", "modelo"))
+        else:
+            loaded.append(obj)
+    return loaded
+
+def load_mmaps(mmap_dirs):
+    from src.mmap_artifacts import load_mmap_bundle
+    loaded = []
+    for directory in mmap_dirs:
+        loaded.extend(load_mmap_bundle(directory).values())
+    return loaded
+
+def worker(mode, payload, barrier, results):
+    import numpy as np  # noqa: F401  (baseline con librerías ya importadas)
+    import sklearn.feature_extraction.text  # noqa: F401
+    import sklearn.ensemble  # noqa: F401
+
+    baseline = read_memory_kb()
+    components = load_pickles(payload) if mode == "pickle" else load_mmaps(payload)
+
+    for component in components:
+        if hasattr(component, "transform"):
+            component.transform([SAMPLE_TEXT])
+
+    barrier.wait()  # todos los workers con los artefactos cargados
+    after = read_memory_kb()
+    results.put({key: after[key] - baseline[key] for key in after})
+    barrier.wait()
+
+def run(mode, payload, workers):
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(mode, payload, barrier, results)) for _ in range(workers)]
+    for p in processes:
+        p.start()
+    samples = [results.get() for _ in processes]
+    for p in processes:
+        p.join()
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    from src.mmap_artifacts import export_mmap_bundle
+    import joblib
+
+    sources = artifact_sources()
+    with tempfile.TemporaryDirectory() as tmp:
+        mmap_dirs = []
+        for i, source in enumerate(sources):
+            obj = joblib.load(source)
+            components = {k: v for k, v in obj.items() if k in ("tfidf_vectorizer", "modelo")} \
+                if isinstance(obj, dict) else {"tfidf_vectorizer": obj}
+            directory = os.path.join(tmp, str(i))
+            export_mmap_bundle(components, directory)
+            mmap_dirs.append(directory)
+
+        print(f"📦 {len(sources)} artefactos, {args.workers} workers simultáneos (delta tras cargar, KB)")
+        print(f"   {'formato':<8} {'RSS/worker':>11} {'PSS/worker':>11} {'privada/worker':>15}")
+        for mode, payload in (("pickle", sources), ("mmap", mmap_dirs)):
+            samples = run(mode, payload, args.workers)
+            avg = {key: sum(s[key] for s in samples) / len(samples) for key in samples[0]}
+            print(f"   {mode:<8} {avg['rss']:>11.0f} {avg['pss']:>11.0f} {avg['private']:>15.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Compactar los vocabularios TF-IDF para VOCABULARY_FORMAT=compact
+
+Guarda el vocabulario de cada TF-IDF (backup v11 y modelos de texto del
+registro) como un arreglo ordenado de términos con idf en float32, podando
+los términos que el modelo no usa en ningún split. Verifica que las
+columnas conservadas coincidan con el TF-IDF original y mide memoria y
+latencia de ambos.
+
+Con --min-importance también se podan términos poco importantes según
+feature_importances_; la salida deja de ser exacta y se informa el
+porcentaje de diagnósticos que coinciden con el original.
+
+Uso:
+    python scripts/build_compact_vocab.py [--output models/compact_vocab] [--min-importance 0.0005]
+"""
+import argparse
+import os
+import pickle
+import shutil
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+
+import joblib
+import numpy as np
+
+from load_test import SAMPLE_COMPLAINTS
+from src.compact_vocab import CompactTfidfVectorizer, build_compact_vocabulary
+from src.config import Config
+from src.model_registry import ModelRegistry
+from src.preprocessor import FeatureBuilder, TextPreprocessor
+
+TOLERANCE = 1e-6
+ITERATIONS = 500
+
+def pickled_size_in_memory(vectorizer):
+    """Bytes que ocupa el vectorizador al deserializarlo"""
+    payload = pickle.dumps(vectorizer)
+    tracemalloc.start()
+    loaded = pickle.loads(payload)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del loaded
+    return size
+
+def transform_us(vectorizer, texts):
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        vectorizer.transform([texts[i % len(texts)]])
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+def compact_and_check(name, vectorizer, model, output_dir, source_path, texts, min_importance, extra=None):
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    n_terms, pruned = build_compact_vocabulary(vectorizer, output_dir, model=model,
+                                               min_importance=min_importance, source_path=source_path)
+    compact = CompactTfidfVectorizer(output_dir)
+
+    expected = vectorizer.transform(texts)
+    actual = compact.transform(texts)
+    kept = np.ones(n_terms, dtype=bool) if compact.column_mask is None else compact.column_mask >= 0
+    diff = float(abs(expected[:, kept] - actual[:, kept]).max()) if expected.nnz else 0.0
+    if diff > TOLERANCE:
+        shutil.rmtree(output_dir)
+        raise SystemExit(f"❌ {name}: diferencia máxima {diff:.2e} > {TOLERANCE:.0e}")
+
+    # Con poda por importancia la salida es aproximada: comparar diagnósticos
+    agreement = ""
+    if model is not None:
+        pad = (lambda X: X) if extra is None else extra
+        same = model.predict(pad(expected)) == model.predict(pad(actual))
+        agreement = f" | diagnósticos iguales {same.mean() * 100:.1f}%"
+
+    original_kb = pickled_size_in_memory(vectorizer) / 1024
+    compact_kb = compact.nbytes / 1024
+    print(f"   ✅ {name}: {n_terms} términos, {pruned} podados | diferencia {diff:.1e}{agreement}")
+    print(f"      memoria {original_kb:.0f} KB -> {compact_kb:.0f} KB"
+          f" | transform {transform_us(vectorizer, texts):.0f} µs -> {transform_us(compact, texts):.0f} µs")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=Config.COMPACT_VOCAB_PATH)
+    parser.add_argument("--min-importance", type=float, default=0.0,
+                        help="Podar también términos con feature_importances_ menor (aproximado)")
+    parser.add_argument("--versions", nargs="*", help="Versiones del registro (por defecto todas las de texto)")
+    args = parser.parse_args()
+
+    print(f"🗜️ Compactando vocabularios TF-IDF en {args.output}")
+
+    bundle = joblib.load(Config.V11_BACKUP_BUNDLE)
+    texts = [text.lower() for text in SAMPLE_COMPLAINTS]
+    compact_and_check("v11_backup", bundle['tfidf_vectorizer'], bundle['modelo'],
+                      os.path.join(args.output, 'v11_backup'), Config.V11_BACKUP_BUNDLE,
+                      texts, args.min_importance)
+
+    registry = ModelRegistry(Config.MODEL_PATH)
+    texts = [TextPreprocessor.clean_medical_text(text) for text in SAMPLE_COMPLAINTS]
+    for version in args.versions or registry.versions():
+        entry = registry._entries[version]
+        try:
+            model_data = registry.get(version)
+        except Exception as e:
+            print(f"   ⚠️ {version}: no se puede cargar ({e})")
+            continue
+        if model_data['type'] != 'text':
+            continue
+        builder = FeatureBuilder.for_model(model_data)
+        # Los modelos con demografía esperan las dos columnas extra
+        extra = None
+        if builder.has_demographics:
+            from src.preprocessor import append_columns
+            from scipy.sparse import vstack
+            extra = lambda X: vstack([append_columns(X[i], (0, 0)) for i in range(X.shape[0])]).tocsr()
+        compact_and_check(version, model_data['preprocessor']['tfidf_vectorizer'], model_data['model'],
+                          os.path.join(args.output, version), entry.preprocessor_path,
+                          texts, args.min_importance, extra)
+
+if __name__ == "__main__":
+    main()
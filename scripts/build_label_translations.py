@@ -0,0 +1,264 @@
+"""Generar la tabla bilingüe de etiquetas de diagnóstico (models/label_translations.json)
+
+Fuentes, de menor a mayor prioridad:
+  1. Clases de diagnosis_encoder.pkl (traducción revisada a mano abajo)
+  2. Nombres del modelo de backup (BACKUP_DIAGNOSTIC_NAMES)
+  3. Tabla de enfermedades de migrate.py (la que ve el usuario en la BD)
+  4. Clases de los preprocesadores del registro (models/preprocesadores_*.pkl)
+     que no estén en las fuentes anteriores
+
+Una clase nueva del encoder o del registro sin traducción hace fallar el
+script para que se agregue aquí en lugar de resolverla con Google en
+producción.
+
+Uso:
+    python scripts/build_label_translations.py [directorio_componentes]
+"""
+import glob
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import joblib
+
+from src.config import Config
+from src.label_translations import LabelTable
+from src.model_loader_v11 import BACKUP_DIAGNOSTIC_NAMES
+
+ENCODER_LABELS_ES = {
+    "Acute Subdural Hematoma": "Hematoma subdural agudo",
+    "Alcohol and Drug Addiction": "Adicción al alcohol y drogas",
+    "Autism Spectrum": "Espectro autista",
+    "Blood Related": "Trastornos de la sangre",
+    "Cancer": "Cáncer",
+    "Cardiac/Circulatory": "Cardíaco/Circulatorio",
+    "Cardiovascular": "Cardiovascular",
+    "Central Nervous System/ Neuromuscular": "Sistema Nervioso Central/Neuromuscular",
+    "Chronic Pain": "Dolor crónico",
+    "Dental": "Dental",
+    "Diabetes": "Diabetes",
+    "Digestive System/ Gastrointestinal": "Sistema digestivo/Gastrointestinal",
+    "Ears, Nose, Throat": "Oído, nariz y garganta",
+    "Endocrine/ Metabolic": "Endocrino/Metabólico",
+    "Fever": "Fiebre",
+    "Foot": "Pie",
+    "Gastrointestinal": "Gastrointestinal",
+    "Genetic": "Genético",
+    "Genitourinary/ Kidney": "Genitourinario/Riñón",
+    "Hypertension": "Hipertensión",
+    "Hypotension": "Hipotensión",
+    "Immunologic": "Inmunológico",
+    "Infection": "Infección",
+    "Infectious": "Infeccioso",
+    "Intracranial Hemorrhage": "Hemorragia intracraneal",
+    "Lower Gi Bleed": "Sangrado gastrointestinal bajo",
+    "Mental": "Salud mental",
+    "Morbid Obesity": "Obesidad mórbida",
+    "Musculoskeletal": "Musculoesquelético",
+    "Not Applicable": "No aplica",
+    "OB-Gyn/ Pregnancy": "Ginecología y obstetricia/Embarazo",
+    "Organ Failure": "Falla orgánica",
+    "Orthopedic/ Musculoskeletal": "Ortopédico/Musculoesquelético",
+    "Pediatrics": "Pediatría",
+    "Pneumonia": "Neumonía",
+    "Post Surgical Complication": "Complicación posquirúrgica",
+    "Prevention/Good Health": "Prevención/Buena salud",
+    "Respiratory": "Respiratorio",
+    "Respiratory System": "Sistema respiratorio",
+    "S/p Fall": "Secuelas de caída",
+    "Skin": "Piel",
+    "Trauma/Injuries": "Traumatismos/Lesiones",
+    "Upper Gi Bleed": "Sangrado gastrointestinal alto",
+    "Vision": "Visión",
+}
+
+# Clases de los modelos del registro (v6-v10) que no cubren las otras fuentes.
+# Se conservan las erratas y los cortes ("...") de los datos de entrenamiento.
+REGISTRY_LABELS_ES = {
+    "(vertigo) Paroymsal  Positional Vertigo": "Vértigo posicional paroxístico",
+    "AIDS": "SIDA",
+    "Acne": "Acné",
+    "Alcoholic hepatitis": "Hepatitis alcohólica",
+    "Allergic Rhinitis": "Rinitis alérgica",
+    "Alzheimer's Disease": "Enfermedad de Alzheimer",
+    "Anemia": "Anemia",
+    "Anxiety Disorders": "Trastornos de ansiedad",
+    "Appendicitis": "Apendicitis",
+    "Atherosclerosis": "Aterosclerosis",
+    "Autism Spectrum Disorder (ASD)": "Trastorno del espectro autista (TEA)",
+    "Bipolar Disorder": "Trastorno bipolar",
+    "Bladder Cancer": "Cáncer de vejiga",
+    "Brain Tumor": "Tumor cerebral",
+    "Breast Cancer": "Cáncer de mama",
+    "Bronchial Asthma": "Asma bronquial",
+    "Cataracts": "Cataratas",
+    "Cerebral Palsy": "Parálisis cerebral",
+    "Cervical spondylosis": "Espondilosis cervical",
+    "Chicken pox": "Varicela",
+    "Chickenpox": "Varicela",
+    "Cholecystitis": "Colecistitis",
+    "Cholera": "Cólera",
+    "Chronic Kidney Disease": "Enfermedad renal crónica",
+    "Chronic Obstructive Pulmonary Disease (COPD)": "Enfermedad pulmonar obstructiva crónica (EPOC)",
+    "Chronic Obstructive Pulmonary...": "Enfermedad pulmonar obstructiva crónica (EPOC)",
+    "Chronic cholestasis": "Colestasis crónica",
+    "Cirrhosis": "Cirrosis",
+    "Colorectal Cancer": "Cáncer colorrectal",
+    "Common Cold": "Resfriado común",
+    "Conjunctivitis (Pink Eye)": "Conjuntivitis",
+    "Coronary Artery Disease": "Enfermedad de las arterias coronarias",
+    "Crohn's Disease": "Enfermedad de Crohn",
+    "Cystic Fibrosis": "Fibrosis quística",
+    "Dementia": "Demencia",
+    "Dengue": "Dengue",
+    "Dengue Fever": "Fiebre del dengue",
+    "Depression": "Depresión",
+    "Dimorphic hemmorhoids(piles)": "Hemorroides",
+    "Diverticulitis": "Diverticulitis",
+    "Down Syndrome": "Síndrome de Down",
+    "Drug Reaction": "Reacción a medicamentos",
+    "Eating Disorders (Anorexia,...": "Trastornos de la conducta alimentaria",
+    "Ebola Virus": "Virus del ébola",
+    "Eczema": "Eccema",
+    "Endometriosis": "Endometriosis",
+    "Epilepsy": "Epilepsia",
+    "Esophageal Cancer": "Cáncer de esófago",
+    "Fibromyalgia": "Fibromialgia",
+    "Fungal infection": "Infección por hongos",
+    "GERD": "Enfermedad por reflujo gastroesofágico",
+    "Glaucoma": "Glaucoma",
+    "Gout": "Gota",
+    "HIV/AIDS": "VIH/SIDA",
+    "Heart attack": "Infarto",
+    "Hemophilia": "Hemofilia",
+    "Hemorrhoids": "Hemorroides",
+    "Hepatitis": "Hepatitis",
+    "Hepatitis B": "Hepatitis B",
+    "Hepatitis C": "Hepatitis C",
+    "Hepatitis D": "Hepatitis D",
+    "Hepatitis E": "Hepatitis E",
+    "Hyperglycemia": "Hiperglucemia",
+    "Hypertensive Heart Disease": "Cardiopatía hipertensiva",
+    "Hyperthyroidism": "Hipertiroidismo",
+    "Hypoglycemia": "Hipoglucemia",
+    "Hypothyroidism": "Hipotiroidismo",
+    "Impetigo": "Impétigo",
+    "Influenza": "Influenza",
+    "Jaundice": "Ictericia",
+    "Kidney Cancer": "Cáncer de riñón",
+    "Kidney Disease": "Enfermedad renal",
+    "Klinefelter Syndrome": "Síndrome de Klinefelter",
+    "Liver Cancer": "Cáncer de hígado",
+    "Liver Disease": "Enfermedad hepática",
+    "Lung Cancer": "Cáncer de pulmón",
+    "Lyme Disease": "Enfermedad de Lyme",
+    "Lymphoma": "Linfoma",
+    "Malaria": "Malaria",
+    "Marfan Syndrome": "Síndrome de Marfan",
+    "Measles": "Sarampión",
+    "Melanoma": "Melanoma",
+    "Multiple Sclerosis": "Esclerosis múltiple",
+    "Mumps": "Paperas",
+    "Muscular Dystrophy": "Distrofia muscular",
+    "Myocardial Infarction (Heart...": "Infarto de miocardio",
+    "Obsessive-Compulsive Disorde...": "Trastorno obsesivo-compulsivo",
+    "Osteoarthristis": "Artrosis",
+    "Osteoarthritis": "Artrosis",
+    "Osteomyelitis": "Osteomielitis",
+    "Osteoporosis": "Osteoporosis",
+    "Otitis Media (Ear Infection)": "Otitis media",
+    "Ovarian Cancer": "Cáncer de ovario",
+    "Pancreatic Cancer": "Cáncer de páncreas",
+    "Pancreatitis": "Pancreatitis",
+    "Paralysis (brain hemorrhage)": "Parálisis (hemorragia cerebral)",
+    "Parkinson's Disease": "Enfermedad de Parkinson",
+    "Peptic ulcer diseae": "Úlcera péptica",
+    "Pneumocystis Pneumonia (PCP)": "Neumonía por Pneumocystis",
+    "Pneumothorax": "Neumotórax",
+    "Polio": "Poliomielitis",
+    "Polycystic Ovary Syndrome (PCOS)": "Síndrome de ovario poliquístico",
+    "Prader-Willi Syndrome": "Síndrome de Prader-Willi",
+    "Prostate Cancer": "Cáncer de próstata",
+    "Psoriasis": "Psoriasis",
+    "Rabies": "Rabia",
+    "Rheumatoid Arthritis": "Artritis reumatoide",
+    "Rubella": "Rubéola",
+    "Schizophrenia": "Esquizofrenia",
+    "Scoliosis": "Escoliosis",
+    "Sepsis": "Sepsis",
+    "Sickle Cell Anemia": "Anemia de células falciformes",
+    "Sinusitis": "Sinusitis",
+    "Sleep Apnea": "Apnea del sueño",
+    "Spina Bifida": "Espina bífida",
+    "Stroke": "Accidente cerebrovascular",
+    "Systemic Lupus Erythematosus...": "Lupus eritematoso sistémico",
+    "Testicular Cancer": "Cáncer testicular",
+    "Tetanus": "Tétanos",
+    "Thyroid Cancer": "Cáncer de tiroides",
+    "Tonsillitis": "Amigdalitis",
+    "Tourette Syndrome": "Síndrome de Tourette",
+    "Tuberculosis": "Tuberculosis",
+    "Turner Syndrome": "Síndrome de Turner",
+    "Typhoid": "Fiebre tifoidea",
+    "Typhoid Fever": "Fiebre tifoidea",
+    "Ulcerative Colitis": "Colitis ulcerosa",
+    "Urinary Tract Infection (UTI)": "Infección del tracto urinario",
+    "Varicose veins": "Venas varicosas",
+    "Williams Syndrome": "Síndrome de Williams",
+    "Zika Virus": "Virus del Zika",
+    "hepatitis A": "Hepatitis A",
+}
+
+def registry_labels(models_dir):
+    """Clases de diagnosis_encoder en los preprocesadores del registro"""
+    labels = set()
+    for path in sorted(glob.glob(os.path.join(models_dir, "preprocesadores_*.pkl"))):
+        encoder = joblib.load(path).get("diagnosis_encoder")
+        if encoder is not None:
+            # 'nan' son filas sin diagnóstico en los datos de entrenamiento
+            labels.update(str(c) for c in encoder.classes_ if str(c) != "nan")
+    return sorted(labels)
+
+def build_table(components_path):
+    table = LabelTable()
+    sources = []
+
+    encoder_path = os.path.join(components_path, "diagnosis_encoder.pkl")
+    if os.path.exists(encoder_path):
+        classes = [str(c) for c in joblib.load(encoder_path).classes_]
+        missing = [c for c in classes if c not in ENCODER_LABELS_ES]
+        if missing:
+            raise SystemExit(f"❌ Clases sin traducción en ENCODER_LABELS_ES: {missing}")
+        for label in classes:
+            table.add(label, ENCODER_LABELS_ES[label])
+        sources.append(f"diagnosis_encoder.pkl ({len(classes)})")
+
+    for names in BACKUP_DIAGNOSTIC_NAMES.values():
+        table.add(names["en"], names["es"])
+    sources.append(f"BACKUP_DIAGNOSTIC_NAMES ({len(BACKUP_DIAGNOSTIC_NAMES)})")
+
+    from migrate import ALL_DISEASES_DATA
+    for english, data in ALL_DISEASES_DATA.items():
+        table.add(english, data["name_es"])
+    sources.append(f"migrate.py ({len(ALL_DISEASES_DATA)})")
+
+    labels = [label for label in registry_labels(Config.MODEL_PATH) if table.to_spanish(label) is None]
+    missing = [label for label in labels if label not in REGISTRY_LABELS_ES]
+    if missing:
+        raise SystemExit(f"❌ Clases del registro sin traducción en REGISTRY_LABELS_ES: {missing}")
+    for label in labels:
+        table.add(label, REGISTRY_LABELS_ES[label])
+    sources.append(f"preprocesadores del registro ({len(labels)})")
+
+    return table, sources
+
+if __name__ == "__main__":
+    components_path = sys.argv[1] if len(sys.argv) > 1 else Config.V11_COMPONENTS_PATH
+    table, sources = build_table(components_path)
+    table.save(Config.LABEL_TRANSLATIONS_PATH, sources)
+
+    print(f"🌐 {len(table)} etiquetas escritas en {Config.LABEL_TRANSLATIONS_PATH}")
+    for source in sources:
+        print(f"   • {source}")
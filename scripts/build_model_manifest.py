@@ -0,0 +1,23 @@
+"""Generar manifest.json (checksums + versión de scikit-learn) de un bundle de modelo
+
+Ejecutar con la misma versión de scikit-learn con la que se serializaron
+los artefactos.
+
+Uso:
+    python scripts/build_model_manifest.py [directorio_componentes]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifact_loader import write_manifest
+from src.config import Config
+
+if __name__ == "__main__":
+    base_path = sys.argv[1] if len(sys.argv) > 1 else Config.V11_COMPONENTS_PATH
+    manifest = write_manifest(base_path)
+
+    print(f"📋 Manifiesto escrito en {base_path} (scikit-learn {manifest['sklearn_version']})")
+    for name, entry in manifest["components"].items():
+        print(f"   {name}: {entry['file']} {entry['sha256'][:12]}…")
@@ -0,0 +1,31 @@
+"""Precomputar el bundle de backup del modelo v11
+
+Entrena una sola vez el RandomForest + TF-IDF sintéticos y los serializa
+para que los workers los carguen en la primera predicción en lugar de
+reentrenarlos en cada import.
+
+Uso:
+    python scripts/build_v11_backup_bundle.py [ruta_salida]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+from src.config import Config
+from src.model_loader_v11 import ModeloV11Fallback
+
+def build_bundle(output_path):
+    """Entrenar los componentes de backup y guardarlos en output_path"""
+    bundle = ModeloV11Fallback()._train_backup_model()
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    joblib.dump(bundle, output_path, compress=3)
+
+    size_kb = os.path.getsize(output_path) / 1024
+    print(f"💾 Bundle guardado en {output_path} ({size_kb:.1f} KB, "
+          f"scikit-learn {bundle['sklearn_version']})")
+
+if __name__ == "__main__":
+    build_bundle(sys.argv[1] if len(sys.argv) > 1 else Config.V11_BACKUP_BUNDLE)
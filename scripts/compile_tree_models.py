@@ -0,0 +1,78 @@
+"""Compilar los modelos de árboles a arreglos de nodos para TREE_ENGINE=compiled
+
+Aplana el bosque del backup v11 (RandomForest) y los XGBoost del registro
+de modelos (models/modelo_diagnostico_*.pkl) en archivos .npy contiguos y
+verifica que el modelo compilado dé las mismas probabilidades que el
+original sobre quejas de ejemplo.
+
+Uso:
+    python scripts/compile_tree_models.py [--output models/compiled] [--versions v8_mejorado ...]
+"""
+import argparse
+import os
+import shutil
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+
+import joblib
+import numpy as np
+
+from load_test import SAMPLE_COMPLAINTS
+from src.compiled_trees import compile_model, load_compiled_model
+from src.config import Config
+from src.model_registry import ModelRegistry
+from src.preprocessor import FeatureBuilder
+
+TOLERANCE = 1e-5
+
+def compile_and_check(model, output_dir, source_path, X, arrays_dir=None):
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    kind = compile_model(model, output_dir, source_path=source_path, arrays_dir=arrays_dir)
+    compiled = load_compiled_model(output_dir)
+
+    # El lote completo y fila por fila (el motor compilado cambia de ruta según el tamaño)
+    expected = model.predict_proba(X)
+    diff = float(np.abs(expected - compiled.predict_proba(X)).max())
+    for i in range(X.shape[0]):
+        diff = max(diff, float(np.abs(expected[i] - compiled.predict_proba(X[i:i + 1])[0]).max()))
+    if diff > TOLERANCE:
+        shutil.rmtree(output_dir)
+        raise SystemExit(f"❌ {output_dir}: diferencia máxima {diff:.2e} > {TOLERANCE:.0e}")
+    print(f"   ✅ {os.path.basename(output_dir)} ({kind}): diferencia máxima {diff:.2e}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=Config.COMPILED_MODELS_PATH)
+    parser.add_argument("--versions", nargs="*", help="Versiones del registro (por defecto todas)")
+    args = parser.parse_args()
+
+    print(f"🔧 Compilando modelos de árboles en {args.output}")
+
+    bundle = joblib.load(Config.V11_BACKUP_BUNDLE)
+    X = bundle['tfidf_vectorizer'].transform([text.lower() for text in SAMPLE_COMPLAINTS])
+    # El bosque del bundle mmap ya tiene el mismo formato: se reutiliza si existe
+    mmap_forest = os.path.join(Config.V11_BACKUP_MMAP_DIR, 'modelo')
+    compile_and_check(bundle['modelo'], os.path.join(args.output, 'v11_backup'), Config.V11_BACKUP_BUNDLE, X,
+                      arrays_dir=mmap_forest if os.path.exists(os.path.join(mmap_forest, 'meta.json')) else None)
+
+    registry = ModelRegistry(Config.MODEL_PATH)
+    for version in args.versions or registry.versions():
+        model_data = registry.get(version)
+        builder = FeatureBuilder.for_model(model_data)
+        if model_data['type'] == 'binary':
+            X = np.eye(builder.expected_length, dtype=np.float32)[:10]
+        else:
+            from scipy.sparse import vstack
+            X = vstack([builder.build_text_features(text)[0] for text in SAMPLE_COMPLAINTS]).tocsr()
+        entry = registry._entries[version]
+        try:
+            compile_and_check(model_data['model'], os.path.join(args.output, version), entry.model_path, X)
+        except ValueError as e:
+            print(f"   ⚠️ {version}: no se compila ({e})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Exportar artefactos de modelo al formato mapeable en memoria
+
+Convierte TF-IDF (vocabulario ordenado + idf) y bosques de decisión
+(arreglos de nodos) a archivos .npy que los workers abren con
+mmap_mode='r', de modo que todos comparten las mismas páginas físicas.
+Se guarda el sha256 del pickle de origen: si cambia, el bundle se ignora.
+Activar en runtime con MODEL_ARTIFACT_FORMAT=mmap (solo el backup v11).
+
+Uso:
+    python scripts/export_mmap_artifacts.py [origen.pkl] [directorio_salida]
+
+Sin argumentos exporta el bundle de backup v11 a V11_BACKUP_MMAP_DIR.
+"""
+import os
+import shutil
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+from src.config import Config
+from src.mmap_artifacts import export_mmap_bundle
+
+def export(source, output_dir):
+    """Exportar un pickle (dict de componentes u objeto suelto) a output_dir"""
+    obj = joblib.load(source)
+    components = obj if isinstance(obj, dict) else {"modelo": obj}
+
+    # El backup guarda la versión de scikit-learn; no es un componente
+    components = {k: v for k, v in components.items() if k != "sklearn_version"}
+
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    index = export_mmap_bundle(components, output_dir, source_path=source)
+
+    print(f"💾 Exportado {source} -> {output_dir}")
+    for name, kind in index.items():
+        print(f"   {name}: {kind}")
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else Config.V11_BACKUP_BUNDLE
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else Config.V11_BACKUP_MMAP_DIR
+    export(source, output_dir)
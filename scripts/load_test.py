@@ -0,0 +1,106 @@
+"""Prueba de carga simple contra /api/predict-v11
+
+Usuarios concurrentes (hilos) envían quejas realistas en español durante
+un tiempo fijo y se reportan RPS y latencias p50/p99.
+
+Uso:
+    python scripts/load_test.py --url http://localhost:10000 --users 50 --duration 60
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+SAMPLE_COMPLAINTS = [
+    "tengo dolor de cabeza muy fuerte desde hace dos días",
+    "me duele el estómago y tengo náuseas después de comer",
+    "tengo tos seca y me cuesta respirar por las noches",
+    "fiebre alta con escalofríos y dolor muscular",
+    "siento palpitaciones y dolor en el pecho al subir escaleras",
+    "mareo constante y visión borrosa",
+    "tengo 45 años y me duelen las articulaciones de las rodillas",
+    "estoy embarazada y tengo vómitos por las mañanas",
+    "erupción en la piel con picazón en los brazos",
+    "me siento muy nervioso y no puedo dormir",
+]
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def wait_until_ready(url, timeout=60):
+    """Esperar a que el servidor responda en /api/health"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/api/health", timeout=2) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.2)
+    return False
+
+def run_load(url, users=10, duration=10, path="/api/predict-v11"):
+    """Ejecutar la carga y devolver métricas agregadas"""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    counter = itertools.count()
+    stop_at = time.perf_counter() + duration
+
+    def user_loop():
+        while time.perf_counter() < stop_at:
+            n = next(counter)
+            # Sufijo único para no medir la caché de predicciones
+            text = f"{SAMPLE_COMPLAINTS[n % len(SAMPLE_COMPLAINTS)]} caso {n}"
+            body = json.dumps({"symptoms": text}).encode("utf-8")
+            request = urllib.request.Request(f"{url}{path}", data=body,
+                                             headers={"Content-Type": "application/json"})
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=user_loop) for _ in range(users)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:10000")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    if not wait_until_ready(args.url):
+        raise SystemExit(f"❌ El servidor no responde en {args.url}")
+
+    result = run_load(args.url, args.users, args.duration)
+    print(f"📊 {result['requests']} requests, {result['errors']} errores | "
+          f"{result['rps']:.1f} req/s | p50 {result['p50_ms']:.1f} ms | p99 {result['p99_ms']:.1f} ms")
+
+if __name__ == "__main__":
+    main()
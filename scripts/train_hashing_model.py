@@ -0,0 +1,73 @@
+"""Entrenar el pipeline de feature hashing para FEATURE_PIPELINE=hashing
+
+Lee un flujo de textos etiquetados sin cargarlo entero en memoria (JSONL
+con un objeto por línea, o CSV con encabezado) y entrena en dos pasadas:
+frecuencias de documento para el idf y un SGDClassifier con partial_fit.
+Los textos se limpian igual que en el modelo v11 (--cleaner symptoms) o
+que en los modelos v6-v10 (--cleaner medical).
+
+Sin archivo de entrada se entrena con los ejemplos sintéticos del backup
+v11, útil para probar el pipeline de punta a punta.
+
+Uso:
+    python scripts/train_hashing_model.py [datos.jsonl|datos.csv] [--text-field symptoms] [--label-field label]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.config import Config
+from src.hashing_features import HashingTfidfVectorizer, train_streaming
+
+def stream_file(path, text_field, label_field):
+    """(texto, etiqueta) línea a línea"""
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = csv.DictReader(f) if path.endswith(".csv") else (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            if row.get(text_field) and row.get(label_field) not in (None, ""):
+                yield row[text_field], row[label_field]
+
+def stream_synthetic():
+    from src.model_loader_v11 import BACKUP_TRAINING_DATA
+    for _ in range(50):
+        yield from BACKUP_TRAINING_DATA
+
+def directory_size_kb(directory):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(directory) for name in names) / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", nargs="?", help="JSONL o CSV con texto y etiqueta")
+    parser.add_argument("--text-field", default="symptoms")
+    parser.add_argument("--label-field", default="label")
+    parser.add_argument("--output", default=Config.HASHING_MODEL_PATH)
+    parser.add_argument("--n-features", type=int, default=2 ** 18)
+    parser.add_argument("--cleaner", choices=("symptoms", "medical"), default="symptoms")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.input:
+        make_stream = lambda: stream_file(args.input, args.text_field, args.label_field)
+    else:
+        print("⚠️ Sin archivo de entrada: se usan los ejemplos sintéticos del backup v11")
+        make_stream = stream_synthetic
+
+    vectorizer = HashingTfidfVectorizer(n_features=args.n_features, cleaner=args.cleaner)
+    start = time.perf_counter()
+    vectorizer, classifier = train_streaming(make_stream, args.output, batch_size=args.batch_size,
+                                             vectorizer=vectorizer)
+    elapsed = time.perf_counter() - start
+
+    print(f"💾 Pipeline hashing guardado en {args.output} ({directory_size_kb(args.output):.0f} KB)")
+    print(f"   📋 {vectorizer.n_documents} textos | {len(classifier.classes_)} clases | "
+          f"{vectorizer.n_features} columnas | {vectorizer.n_documents * 2 / elapsed:.0f} textos/s (2 pasadas)")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
 from flask import Blueprint, request, jsonify
+import hmac
 import logging
+import sys
 import pandas as pd
+from src.config import Config
+from src.prediction_logger import log_prediction_async, prediction_logger
+from src.micro_batcher import prediction_batcher
+from src.translator import translator_manager
 
 api_bp = Blueprint('api', __name__)
 
@@ -19,9 +25,12 @@ def home():
     return jsonify({
         "message": "SaludIA API - Sistema de Diagnóstico Médico",
         "version": "3.0 - Optimizado para Render",
-        "available_models": ["v11_backup"] if MODELO_V11_DISPONIBLE else [],
+        "available_models": [modelo_v11_global.model_version] if MODELO_V11_DISPONIBLE else [],
         "endpoints": {
             "predict-v11": "POST /api/predict-v11",
+            "predict-v11-batch": "POST /api/predict-v11/batch",
+            "model-v11-info": "GET /api/model-v11-info",
+            "models": "GET /api/models",
             "health": "GET /api/health"
         },
         "status": "✅ RUNNING"
@@ -30,50 +39,197 @@ def home():
 @api_bp.route('/predict-v11', methods=['POST'])
 def predict_v11():
     """Predicción v11 optimizada para memoria limitada"""
+    payload, status = predict_v11_response(request.get_json(silent=True))
+    return jsonify(payload), status
+
+def predict_v11_response(data):
+    """Lógica de /predict-v11 sin Flask: devuelve (payload, status)
+    
+    La comparten el blueprint y la app ASGI (asgi.py).
+    """
     try:
         if not MODELO_V11_DISPONIBLE:
-            return jsonify({
+            return {
                 "error": "Modelo v11 no disponible",
                 "message": "El modelo no está cargado"
-            }), 503
-        
-        data = request.get_json()
+            }, 503
         
         if not data:
-            return jsonify({"error": "No se enviaron datos"}), 400
+            return {"error": "No se enviaron datos"}, 400
         
         symptoms = data.get('symptoms', '')
         age = data.get('age')
         gender = data.get('gender')
+        requested_model = data.get('model')
         
         if not symptoms:
-            return jsonify({"error": "Campo 'symptoms' es requerido"}), 400
+            return {"error": "Campo 'symptoms' es requerido"}, 400
+        
+        # Modelos del registro (v6-v10): se cargan al primer uso
+        if requested_model and requested_model not in ('v11', modelo_v11_global.model_version):
+            return _predict_registry_response(requested_model, symptoms, age, gender)
         
         # Usar modelo v11 global
         if not modelo_v11_global.modelo_cargado:
-            return jsonify({"error": "Modelo v11 no está cargado correctamente"}), 500
+            return {"error": "Modelo v11 no está cargado correctamente"}, 500
         
-        # Realizar predicción
-        result = modelo_v11_global.predict_symptoms(symptoms, age, gender)
+        # Realizar predicción (agrupada con otras peticiones si hay micro-batching)
+        if Config.MICRO_BATCH_ENABLED:
+            result = prediction_batcher.predict({"symptoms": symptoms, "age": age, "gender": gender})
+        else:
+            result = modelo_v11_global.predict_symptoms(symptoms, age, gender)
         
         if "error" in result:
-            return jsonify({
+            return {
                 "error": result["error"],
                 "message": "Error en predicción"
-            }), 500
+            }, 500
         
-        return jsonify({
+        _log_prediction(symptoms, result, age, gender)
+        
+        return {
             "success": True,
             "result": result,
             "metadata": {
-                "version": "v11_backup",
+                "version": modelo_v11_global.model_version,
                 "optimizado_para": "Render Free 512MB",
                 "timestamp": pd.Timestamp.now().isoformat()
             }
-        })
+        }, 200
         
     except Exception as e:
         logging.error(f"Error en /predict-v11: {e}")
+        return {
+            "error": str(e),
+            "message": "Error interno del servidor"
+        }, 500
+
+def _predict_registry_response(version, symptoms, age, gender):
+    """Predicción con un modelo del registro: devuelve (payload, status)"""
+    from src.predictor import model_manager
+    
+    if version not in model_manager.models:
+        return {
+            "error": f"Modelo {version} no disponible",
+            "available_models": [modelo_v11_global.model_version] + model_manager.get_available_models()
+        }, 404
+    
+    if model_manager.model_type(version) == 'binary':
+        # v9: lista de nombres de síntomas, de índices o arreglo denso de 0/1
+        feature_count = model_manager.feature_count(version)
+        accepted = (f"El modelo {version} espera 'symptoms' como lista de nombres de síntomas, "
+                    f"de índices enteros (0-{feature_count - 1}) o de {feature_count} valores 0/1")
+        if not isinstance(symptoms, list):
+            return {"error": accepted}, 400
+        if all(isinstance(item, str) for item in symptoms):
+            result = model_manager.predict_binary(names=symptoms, model_version=version)
+        elif not all(isinstance(item, int) and not isinstance(item, bool) for item in symptoms):
+            return {"error": accepted}, 400
+        elif len(symptoms) == feature_count and set(symptoms) <= {0, 1}:
+            result = model_manager.predict_binary(symptoms, version)
+        elif all(0 <= item < feature_count for item in symptoms):
+            result = model_manager.predict_binary(indices=symptoms, model_version=version)
+        else:
+            return {"error": accepted}, 400
+        symptoms = ', '.join(map(str, symptoms))
+    else:
+        result = model_manager.predict_text(symptoms, version, age_range=age, gender=gender)
+    
+    if "error" in result:
+        return {
+            "error": result["error"],
+            "message": "Error en predicción"
+        }, 500
+    
+    result = {
+        "diagnostico": translator_manager.translate_to_spanish(result["diagnosis"]),
+        "diagnostico_original": result["diagnosis"],
+        "confianza": round(result["confidence"], 1),
+        "confianza_pct": f"{result['confidence']:.1f}%",
+        "modelo_usado": version,
+        "top_diagnosticos": [
+            {
+                "diagnostico": translator_manager.translate_to_spanish(item["diagnosis"]),
+                "confianza": round(item["confidence"], 1)
+            }
+            for item in result["top_diagnoses"]
+        ]
+    }
+    _log_prediction(symptoms, result, age, gender)
+    
+    return {
+        "success": True,
+        "result": result,
+        "metadata": {
+            "version": version,
+            "timestamp": pd.Timestamp.now().isoformat()
+        }
+    }, 200
+
+@api_bp.route('/predict-v11/batch', methods=['POST'])
+def predict_v11_batch():
+    """Predicción v11 por lotes (una sola vectorización para todo el lote)"""
+    try:
+        if not MODELO_V11_DISPONIBLE:
+            return jsonify({
+                "error": "Modelo v11 no disponible",
+                "message": "El modelo no está cargado"
+            }), 503
+        
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({"error": "No se enviaron datos"}), 400
+        
+        items = data.get('items')
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "Campo 'items' es requerido y debe ser una lista"}), 400
+        
+        if len(items) > Config.MAX_BATCH_SIZE:
+            return jsonify({
+                "error": "Lote demasiado grande",
+                "message": f"Máximo {Config.MAX_BATCH_SIZE} items por solicitud"
+            }), 413
+        
+        if not modelo_v11_global.modelo_cargado:
+            return jsonify({"error": "Modelo v11 no está cargado correctamente"}), 500
+        
+        # Realizar predicción del lote completo
+        predictions = modelo_v11_global.predict_symptoms_batch(items)
+        
+        results = []
+        for index, prediction in enumerate(predictions):
+            if "error" not in prediction and isinstance(items[index], dict):
+                _log_prediction(items[index].get('symptoms'), prediction,
+                                items[index].get('age'), items[index].get('gender'))
+            
+            if "error" in prediction:
+                results.append({
+                    "index": index,
+                    "success": False,
+                    "error": prediction["error"]
+                })
+            else:
+                results.append({
+                    "index": index,
+                    "success": True,
+                    "result": prediction
+                })
+        
+        return jsonify({
+            "success": True,
+            "results": results,
+            "metadata": {
+                "version": modelo_v11_global.model_version,
+                "total": len(results),
+                "errores": sum(1 for r in results if not r["success"]),
+                "timestamp": pd.Timestamp.now().isoformat()
+            }
+        })
+        
+    except Exception as e:
+        logging.error(f"Error en /predict-v11/batch: {e}")
         return jsonify({
             "error": str(e),
             "message": "Error interno del servidor"
@@ -82,41 +238,149 @@ def predict_v11():
 @api_bp.route('/health', methods=['GET'])
 def health_check():
     """Verificar estado de la API"""
+    payload, status = health_response()
+    return jsonify(payload), status
+
+def health_response():
+    """Lógica de /health sin Flask: devuelve (payload, status)"""
     modelo_v11_status = False
+    cache_stats = None
     if MODELO_V11_DISPONIBLE:
         try:
             modelo_v11_status = modelo_v11_global.modelo_cargado
+            cache_stats = modelo_v11_global.prediction_cache.stats()
         except:
             pass
     
-    return jsonify({
+    try:
+        logging_stats = prediction_logger.stats()
+    except:
+        logging_stats = None
+    
+    try:
+        batching_stats = prediction_batcher.stats()
+    except:
+        batching_stats = None
+    
+    backend = modelo_v11_global.inference_backend if MODELO_V11_DISPONIBLE else None
+    backend_stats = backend.stats() if backend is not None else {"backend": "thread"}
+    
+    # Solo si la BD ya se usó: /health no debe abrir conexiones
+    database = sys.modules.get('src.database')
+    recommendations_stats = database.db_manager.recommendations_index.stats() if database else None
+    
+    return {
         "status": "healthy",
         "modelo_v11": "loaded" if modelo_v11_status else "unavailable",
         "modelo_disponible": MODELO_V11_DISPONIBLE,
-        "memoria_optimizada": True
+        "memoria_optimizada": True,
+        "cache_predicciones": cache_stats,
+        "logging_predicciones": logging_stats,
+        "micro_batching": batching_stats,
+        "backend_inferencia": backend_stats,
+        "indice_recomendaciones": recommendations_stats
+    }, 200
+
+@api_bp.route('/models', methods=['GET'])
+def list_models():
+    """Modelos disponibles, residencia en memoria y tiempos de carga"""
+    payload, status = models_response()
+    return jsonify(payload), status
+
+def models_response():
+    """Lógica de /models sin Flask: devuelve (payload, status)"""
+    from src.predictor import model_manager
+    
+    registry = model_manager.describe()
+    if MODELO_V11_DISPONIBLE:
+        registry["models"].insert(0, {
+            "version": modelo_v11_global.model_version,
+            "type": "text",
+            "resident": modelo_v11_global.modelo_cargado,
+            "default": True
+        })
+    return {"success": True, **registry}, 200
+
+@api_bp.route('/model-v11-info', methods=['GET'])
+def model_v11_info():
+    """Origen (real/fallback) de cada componente del modelo v11"""
+    if not MODELO_V11_DISPONIBLE:
+        return jsonify({
+            "success": False,
+            "error": "Modelo v11 no disponible"
+        }), 503
+    
+    return jsonify({
+        "success": True,
+        "model_info": modelo_v11_global.get_model_info()
     })
 
 @api_bp.route('/test-model', methods=['GET'])
 def test_model():
     """Endpoint para probar el modelo"""
+    payload, status = test_model_response()
+    return jsonify(payload), status
+
+def test_model_response():
+    """Lógica de /test-model sin Flask: devuelve (payload, status)"""
     try:
         if not MODELO_V11_DISPONIBLE or not modelo_v11_global.modelo_cargado:
-            return jsonify({
+            return {
                 "status": "error",
                 "message": "Modelo no disponible"
-            })
+            }, 200
         
         # Prueba básica
         test_result = modelo_v11_global.predict_symptoms("dolor de cabeza", 30, "Male")
         
-        return jsonify({
+        return {
             "status": "success",
             "test_result": test_result,
             "modelo_funcionando": True
-        })
+        }, 200
         
     except Exception as e:
-        return jsonify({
+        return {
             "status": "error",
             "error": str(e)
-        }), 500
\ No newline at end of file
+        }, 500
+
+@api_bp.route('/admin/recommendations/refresh', methods=['POST'])
+def refresh_recommendations():
+    """Recargar el índice de recomendaciones (p. ej. después de migrate.py)"""
+    token = request.headers.get('X-Admin-Token', '')
+    if not Config.ADMIN_TOKEN or not hmac.compare_digest(token, Config.ADMIN_TOKEN):
+        return jsonify({
+            "success": False,
+            "error": "No autorizado"
+        }), 403
+    
+    from src.database import db_manager
+    try:
+        total = db_manager.recommendations_index.refresh()
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "message": "No se pudo recargar el índice de recomendaciones"
+        }), 503
+    
+    return jsonify({
+        "success": True,
+        "diagnosticos_indexados": total,
+        "indice": db_manager.recommendations_index.stats()
+    })
+
+def _log_prediction(symptoms, result, age=None, gender=None):
+    """Registrar la predicción en BD de forma asíncrona (nunca falla la petición)"""
+    try:
+        log_prediction_async(
+            symptoms=symptoms,
+            diagnosis=result.get("diagnostico"),
+            confidence=result.get("confianza"),
+            model_version=result.get("modelo_usado"),
+            age_detected=age,
+            gender=gender
+        )
+    except Exception as e:
+        logging.warning(f"No se pudo encolar la predicción: {e}")
@@ -29,11 +29,15 @@ def predict_v11():
                 "message": "Por favor describe tus síntomas con más detalle"
             }), 400
         
-        # Procesar edad y género
+        # Procesar edad y género (patrones precompilados)
         try:
-            extracted_age = translator_manager.extract_age_from_text(symptoms)
-            if extracted_age:
-                age = extracted_age
+            signals = translator_manager.analyze_text(symptoms)
+        except:
+            signals = None
+        
+        try:
+            if signals and signals.age:
+                age = signals.age
             age_range = translator_manager.categorize_age(age)
         except:
             age_range = "25-34"
@@ -41,10 +45,7 @@ def predict_v11():
         if gender_input:
             gender = validate_gender(gender_input)
         else:
-            try:
-                gender = translator_manager.detect_gender(symptoms)
-            except:
-                gender = "Unknown"
+            gender = signals.gender if signals else "Unknown"
         
         # Realizar predicción con modelo v11
         result = predecir_v11(symptoms, age_range, gender)
@@ -112,7 +113,7 @@ def health_check():
     """Health check del modelo v11"""
     try:
         modelo = cargar_modelo_v11()
-        status = modelo.modelo_xgb is not None
+        status = modelo.modelo_cargado
         
         return jsonify({
             "status": "healthy" if status else "error",
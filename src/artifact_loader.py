@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from importlib import metadata
+
+import joblib
+
+MANIFEST_NAME = "manifest.json"
+
+# Componentes v11 y nombres de archivo aceptados (nuevos y legados "_v11")
+V11_COMPONENT_FILES = {
+    "modelo": ["modelo_diagnostico_v11.pkl", "modelo_diagnostico.pkl"],
+    "tfidf_vectorizer": ["tfidf_vectorizer.pkl", "tfidf_vectorizer_v11.pkl"],
+    "age_encoder": ["age_encoder.pkl", "age_encoder_v11.pkl"],
+    "gender_encoder": ["gender_encoder.pkl", "gender_encoder_v11.pkl"],
+    "diagnosis_encoder": ["diagnosis_encoder.pkl", "diagnosis_encoder_v11.pkl"],
+    "metadata": ["metadata.pkl", "metadata_v11.pkl"],
+    "preprocesador_data": ["preprocesador_data.pkl", "preprocesador_data_v11.pkl"],
+    "medical_dict": ["medical_dict_v11.pkl", "medical_dict.pkl"],
+    "diagnostic_names": ["diagnostic_names_v11.pkl", "diagnostic_names.pkl"],
+}
+
+# Componentes que solo sirven juntos: el clasificador espera exactamente
+# las columnas del vectorizador con el que fue entrenado
+V11_PIPELINE = ("modelo", "tfidf_vectorizer", "diagnosis_encoder")
+
+def installed_sklearn_version():
+    """Versión instalada de scikit-learn sin importar el paquete"""
+    try:
+        return metadata.version("scikit-learn")
+    except metadata.PackageNotFoundError:
+        return None
+
+def file_sha256(path, chunk_size=1 << 16):
+    """SHA-256 de un archivo leído por bloques"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def is_unverified(expected_sha256, source_path):
+    """True si source_path no existe o no tiene el sha256 registrado al exportar
+
+    Lo usan los formatos derivados de un pickle (mmap, compilado, vocabulario
+    compacto): sin el original o sin el sha256 guardado no se puede saber si
+    el derivado corresponde, así que tampoco se usa.
+    """
+    if not expected_sha256 or not source_path or not os.path.exists(source_path):
+        return True
+    return file_sha256(source_path) != expected_sha256
+
+def _same_minor_version(a, b):
+    """Comparar versiones a nivel major.minor (los pickles cambian entre minors)"""
+    if not a or not b:
+        return False
+    return a.split(".")[:2] == b.split(".")[:2]
+
+def write_manifest(base_path, version="v11"):
+    """Generar manifest.json con checksums de los componentes presentes"""
+    components = {}
+    for name, candidates in V11_COMPONENT_FILES.items():
+        for filename in candidates:
+            path = os.path.join(base_path, filename)
+            if os.path.exists(path):
+                components[name] = {"file": filename, "sha256": file_sha256(path)}
+                break
+
+    manifest = {
+        "version": version,
+        "sklearn_version": installed_sklearn_version(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "components": components
+    }
+
+    with open(os.path.join(base_path, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    return manifest
+
+class ArtifactBundle:
+    """Resultado de cargar un directorio de artefactos"""
+
+    def __init__(self, base_path, manifest=None):
+        self.base_path = base_path
+        self.manifest = manifest
+        self.components = {}
+        self.report = {}
+
+    @property
+    def pipeline_ready(self):
+        """True si clasificador, vectorizador y encoder de diagnósticos son reales"""
+        return all(name in self.components for name in V11_PIPELINE)
+
+    def get(self, name, default=None):
+        return self.components.get(name, default)
+
+    def mark(self, name, source, reason=None, file=None):
+        """Registrar de dónde sale un componente (real / fallback)"""
+        entry = {"source": source}
+        if file:
+            entry["file"] = file
+        if reason:
+            entry["reason"] = reason
+        self.report[name] = entry
+
+def load_artifact_bundle(base_path, strict_sklearn=True):
+    """Cargar todos los componentes de un directorio en una sola pasada
+
+    Si existe manifest.json se verifican checksums y la versión de
+    scikit-learn con la que se serializaron; si no, se buscan los nombres
+    de archivo conocidos sin verificación. Cada componente queda marcado
+    como 'real' o 'fallback' en bundle.report con el motivo.
+    """
+    manifest = None
+    manifest_path = os.path.join(base_path, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    bundle = ArtifactBundle(base_path, manifest)
+
+    # Verificación de versión de scikit-learn (una vez para todo el bundle)
+    version_error = None
+    if manifest is not None:
+        expected = manifest.get("sklearn_version")
+        installed = installed_sklearn_version()
+        if expected and not _same_minor_version(expected, installed):
+            version_error = f"scikit-learn {expected} en manifiesto, instalado {installed}"
+
+    for name, candidates in V11_COMPONENT_FILES.items():
+        if manifest is not None:
+            entry = manifest.get("components", {}).get(name)
+            if entry is None:
+                bundle.mark(name, "fallback", "no listado en manifiesto")
+                continue
+            filename, expected_sha = entry["file"], entry.get("sha256")
+        else:
+            filename = next((c for c in candidates if os.path.exists(os.path.join(base_path, c))), None)
+            expected_sha = None
+            if filename is None:
+                bundle.mark(name, "fallback", "archivo no encontrado")
+                continue
+
+        path = os.path.join(base_path, filename)
+        if not os.path.exists(path):
+            bundle.mark(name, "fallback", "archivo no encontrado", filename)
+            continue
+
+        if expected_sha and file_sha256(path) != expected_sha:
+            bundle.mark(name, "fallback", "checksum no coincide", filename)
+            continue
+
+        if version_error and strict_sklearn:
+            bundle.mark(name, "fallback", version_error, filename)
+            continue
+
+        try:
+            bundle.components[name] = joblib.load(path)
+            bundle.mark(name, "real", version_error, filename)
+        except Exception as e:
+            bundle.mark(name, "fallback", f"error cargando: {e}", filename)
+
+    # El pipeline de predicción es atómico: si falta una pieza se descarta
+    # entero para no mezclar un vectorizador real con el clasificador backup
+    if not bundle.pipeline_ready:
+        missing = [name for name in V11_PIPELINE if name not in bundle.components]
+        for name in V11_PIPELINE:
+            if name in bundle.components and name != "diagnosis_encoder":
+                del bundle.components[name]
+                bundle.mark(name, "fallback", f"pipeline incompleto (falta {', '.join(missing)})",
+                            bundle.report[name].get("file"))
+    else:
+        expected_features = getattr(bundle.components["modelo"], "n_features_in_", None)
+        vocabulary = getattr(bundle.components["tfidf_vectorizer"], "vocabulary_", None)
+        if expected_features is not None and vocabulary is not None and expected_features != len(vocabulary):
+            reason = f"dimensiones incompatibles ({len(vocabulary)} vs {expected_features})"
+            for name in ("modelo", "tfidf_vectorizer"):
+                del bundle.components[name]
+                bundle.mark(name, "fallback", reason, bundle.report[name].get("file"))
+
+    return bundle
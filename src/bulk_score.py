@@ -0,0 +1,292 @@
+"""Re-puntuar en lote un archivo JSONL de quejas registradas
+
+Cada línea es un objeto JSON con el texto de la queja (campo symptoms,
+sintomas, text o texto, o el indicado con --text-field) y opcionalmente
+age y gender. La salida repite cada registro con su predicción:
+
+    {"symptoms": "...", "prediccion": {"diagnostico": ..., "confianza": ..., "top_diagnosticos": [...]}}
+
+El archivo se procesa como un flujo de generadores (leer -> parsear ->
+agrupar en lotes -> limpiar + vectorizar + predict_proba en un pool de
+procesos -> escribir en orden) con un número acotado de lotes en vuelo,
+así que la memoria no depende del tamaño del archivo. Después de cada
+lote escrito se guarda un checkpoint con el offset en bytes de la
+entrada y de la salida; --resume continúa desde ahí.
+
+Uso:
+    python -m src.bulk_score entrada.jsonl salida.jsonl [--model v11] [--batch-size 256]
+                             [--processes N] [--resume]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+
+from src.config import Config
+
+TEXT_FIELDS = ("symptoms", "sintomas", "text", "texto")
+
+# Modelo del proceso actual (uno por worker del pool)
+_scorer = None
+
+class _V11Scorer:
+    """Modelo v11 (real o backup), con la limpieza de _clean_symptoms"""
+
+    def __init__(self):
+        from src.model_loader_v11 import modelo_v11_global
+        self.model = modelo_v11_global
+        self.model.inference_backend = None  # este proceso predice localmente
+        self.model.load_components()
+        self.model._ensure_backup_loaded()
+
+    def score(self, texts, ages, genders):
+        clean = [self.model._clean_symptoms(text) for text in texts]
+        _, _, top = self.model._predict_classes_local(clean)
+        return [[(self.model._label(diagnosis_class), confidence) for diagnosis_class, confidence in row]
+                for row in top]
+
+class _RegistryScorer:
+    """Modelo de texto del registro (v6-v10), con clean_medical_text"""
+
+    def __init__(self, version):
+        from src.predictor import ModelManager
+        model_data, error = ModelManager()._get_model_data(version)
+        if error:
+            raise ValueError(error["error"])
+        if model_data['type'] != 'text':
+            raise ValueError(f"El modelo {version} no es de texto")
+        self.model_data = model_data
+
+    def score(self, texts, ages, genders):
+        from src.predictor import age_range_for
+        from src.preprocessor import FeatureBuilder, PredictionDecoder
+
+        prep = self.model_data['preprocessor']
+        if 'age_encoder' in prep:
+            ages = [age_range_for(age, prep['age_encoder'].classes_) for age in ages]
+        X, _ = FeatureBuilder.for_model(self.model_data).build_text_features_batch(texts, ages, genders)
+        probabilities = self.model_data['model'].predict_proba(X)
+        top = PredictionDecoder.decode_top(probabilities, PredictionDecoder.labels_for(self.model_data),
+                                           Config.TOP_K_DIAGNOSES)
+        return [[(item["diagnosis"], item["confidence"]) for item in row] for row in top]
+
+def _init_worker(model):
+    global _scorer
+    _scorer = _V11Scorer() if model == 'v11' else _RegistryScorer(model)
+
+def _score_batch(texts, ages, genders):
+    """[(diagnóstico, confianza), ...] top-k por texto, en el proceso actual"""
+    return _scorer.score(texts, ages, genders)
+
+class _Done:
+    """Resultado ya calculado con la misma interfaz que un Future"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
+
+class _DoneError(_Done):
+    """Error ya ocurrido con la misma interfaz que un Future"""
+
+    def result(self):
+        raise self.value
+
+def read_lines(path, offset=0):
+    """(offset al terminar la línea, offset al empezar, bytes) desde offset"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            start, offset = offset, offset + len(line)
+            yield offset, start, line
+
+def parse_records(lines, text_field=None):
+    """(offset final, registro, texto, error) por línea no vacía"""
+    fields = (text_field,) if text_field else TEXT_FIELDS
+    for offset, start, line in lines:
+        if not line.strip():
+            yield offset, None, None, None
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield offset, {"offset": start}, None, f"JSON inválido: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield offset, {"offset": start}, None, "Cada línea debe ser un objeto JSON"
+            continue
+        text = next((record[field] for field in fields if record.get(field)), None)
+        if not isinstance(text, str):
+            yield offset, record, None, f"Falta el texto ({' / '.join(fields)})"
+            continue
+        yield offset, record, text, None
+
+def batched(items, batch_size):
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def _output_line(record, prediction=None, error=None):
+    if error is not None:
+        output = dict(record, error=error)
+    else:
+        output = dict(record, prediccion={
+            "diagnostico": prediction[0][0],
+            "confianza": round(float(prediction[0][1]), 1),
+            "top_diagnosticos": [
+                {"diagnostico": diagnosis, "confianza": round(float(confidence), 1)}
+                for diagnosis, confidence in prediction
+            ]
+        })
+    return (json.dumps(output, ensure_ascii=False) + "\n").encode("utf-8")
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_checkpoint(path, checkpoint):
+    """Escritura atómica (archivo temporal + os.replace)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+def bulk_score(input_path, output_path, model='v11', batch_size=256, processes=1, resume=False,
+               checkpoint_path=None, text_field=None, progress_every=5.0, log=print):
+    """Puntuar input_path en output_path; devuelve el resumen de la corrida"""
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+    checkpoint = load_checkpoint(checkpoint_path) if resume else None
+    if checkpoint and (checkpoint["input"] != os.path.abspath(input_path) or checkpoint["model"] != model):
+        raise ValueError("El checkpoint corresponde a otra entrada u otro modelo")
+    checkpoint = checkpoint or {"input": os.path.abspath(input_path), "model": model,
+                                "offset": 0, "output_offset": 0, "records": 0, "errors": 0}
+    if checkpoint["output_offset"] and not os.path.exists(output_path):
+        raise ValueError(f"No existe la salida a reanudar: {output_path}")
+    if checkpoint["offset"]:
+        log(f"⏩ Reanudando desde el byte {checkpoint['offset']} ({checkpoint['records']} registros ya escritos)")
+
+    executor = None
+    if processes > 1:
+        context = multiprocessing.get_context(Config.INFERENCE_START_METHOD)
+        executor = ProcessPoolExecutor(max_workers=processes, mp_context=context,
+                                       initializer=_init_worker, initargs=(model,))
+    else:
+        _init_worker(model)
+
+    # Lo escrito después del último checkpoint se descarta (no hay duplicados al reanudar)
+    mode = 'r+b' if checkpoint["output_offset"] else 'wb'
+    previous_records, previous_errors = checkpoint["records"], checkpoint["errors"]
+    records = errors = 0
+    start = last_report = time.perf_counter()
+    in_flight = deque()
+    max_in_flight = max(2, processes * 2)
+
+    with open(output_path, mode) as out:
+        out.truncate(checkpoint["output_offset"])
+        out.seek(checkpoint["output_offset"])
+
+        def write_next():
+            nonlocal records, errors, last_report
+            batch, future = in_flight.popleft()
+            try:
+                predictions = iter(future.result())
+                batch_error = None
+            except BrokenProcessPool:
+                raise  # abortar: --resume continúa desde el último lote escrito
+            except Exception as e:
+                predictions, batch_error = None, f"Error en predicción: {e}"
+
+            for _, record, _, error in batch:
+                if record is None:
+                    continue
+                if error is None and batch_error is not None:
+                    error = batch_error
+                if error is None:
+                    out.write(_output_line(record, next(predictions)))
+                else:
+                    out.write(_output_line(record, error=error))
+                    errors += 1
+                records += 1
+            out.flush()
+
+            checkpoint.update(offset=batch[-1][0], output_offset=out.tell(),
+                              records=previous_records + records, errors=previous_errors + errors)
+            save_checkpoint(checkpoint_path, checkpoint)
+
+            now = time.perf_counter()
+            if progress_every and now - last_report >= progress_every:
+                last_report = now
+                log(f"📈 {records} registros | {records / (now - start):.0f} reg/s")
+
+        try:
+            lines = read_lines(input_path, checkpoint["offset"])
+            for batch in batched(parse_records(lines, text_field), batch_size):
+                valid = [(record, text) for _, record, text, error in batch if record is not None and error is None]
+                texts = [text for _, text in valid]
+                ages = [record.get("age") for record, _ in valid]
+                genders = [record.get("gender") for record, _ in valid]
+                if not texts:
+                    future = _Done([])
+                elif executor is not None:
+                    future = executor.submit(_score_batch, texts, ages, genders)
+                else:
+                    try:
+                        future = _Done(_score_batch(texts, ages, genders))
+                    except Exception as e:
+                        future = _DoneError(e)
+                in_flight.append((batch, future))
+                if len(in_flight) >= max_in_flight:
+                    write_next()
+            while in_flight:
+                write_next()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "records": records,
+        "errors": errors,
+        "seconds": round(elapsed, 2),
+        "records_per_second": round(records / elapsed, 1) if elapsed else 0.0,
+        "total_records": checkpoint["records"]
+    }
+    log(f"✅ {records} registros en {elapsed:.1f} s ({summary['records_per_second']:.0f} reg/s), "
+        f"{errors} con error -> {output_path}")
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="JSONL de entrada")
+    parser.add_argument("output", help="JSONL de salida")
+    parser.add_argument("--model", default="v11", help="v11 o una versión de texto del registro (p. ej. v8_mejorado)")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--processes", type=int, default=Config.INFERENCE_PROCESSES or os.cpu_count() or 1)
+    parser.add_argument("--resume", action="store_true", help="Continuar desde el checkpoint")
+    parser.add_argument("--checkpoint", help="Ruta del checkpoint (por defecto <salida>.checkpoint)")
+    parser.add_argument("--text-field", help="Campo con el texto de la queja")
+    args = parser.parse_args(argv)
+
+    log = lambda message: print(message, file=sys.stderr, flush=True)
+    try:
+        bulk_score(args.input, args.output, model=args.model, batch_size=args.batch_size,
+                   processes=max(1, args.processes), resume=args.resume, checkpoint_path=args.checkpoint,
+                   text_field=args.text_field, log=log)
+    except (OSError, ValueError) as e:
+        log(f"❌ {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+
+from src.artifact_loader import file_sha256, is_unverified
+from src.mmap_artifacts import MmapTfidfVectorizer, export_tfidf
+
+def used_features(model):
+    """Columnas que el modelo de árboles usa en algún split (None si no se sabe)"""
+    if hasattr(model, "get_booster"):
+        scores = model.get_booster().get_score(importance_type="weight")
+        return np.array(sorted(int(name.lstrip("f")) for name in scores), dtype=np.int64)
+
+    estimators = getattr(model, "estimators_", [model])
+    if all(hasattr(estimator, "tree_") for estimator in estimators):
+        features = np.concatenate([estimator.tree_.feature for estimator in estimators])
+        return np.unique(features[features >= 0])
+    return None
+
+def build_compact_vocabulary(vectorizer, directory, model=None, min_importance=0.0, source_path=None):
+    """Guardar el vocabulario de un TfidfVectorizer en el formato mmap, con poda
+
+    Es el mismo formato que export_tfidf (términos ordenados para búsqueda
+    binaria, sin dict) con el idf en float32. Si se pasa el modelo, las
+    columnas que no usa (o con importancia menor a min_importance) quedan
+    en -1 en column_mask: no se emiten, pero siguen contando en la norma
+    l2, así que las demás columnas no cambian. Devuelve (términos, términos
+    podados).
+    """
+    n_features = len(vectorizer.vocabulary_)
+    keep = np.ones(n_features, dtype=bool)
+    if model is not None:
+        used = used_features(model)
+        if used is not None:
+            keep[:] = False
+            keep[used[used < n_features]] = True
+        if min_importance > 0 and hasattr(model, "feature_importances_"):
+            keep &= np.asarray(model.feature_importances_[:n_features]) >= min_importance
+
+    pruned = int((~keep).sum())
+    export_tfidf(vectorizer, directory, idf_dtype=np.float32,
+                 column_mask=np.where(keep, np.arange(n_features), -1) if pruned else None,
+                 metadata={
+                     "pruned": pruned,
+                     "min_importance": min_importance,
+                     "source_sha256": file_sha256(source_path) if source_path else None
+                 })
+    return n_features, pruned
+
+def load_compact_vocabulary(directory, source_path):
+    """CompactTfidfVectorizer del directorio, o None si no existe o está desactualizado
+
+    Se compara el sha256 guardado con el del pickle de origen (source_path);
+    si falta cualquiera de los dos no se puede verificar y tampoco se usa.
+    """
+    params_path = os.path.join(directory, "params.json")
+    if not os.path.exists(params_path):
+        return None
+    vectorizer = CompactTfidfVectorizer(directory)
+    if is_unverified(vectorizer.params.get("source_sha256"), source_path):
+        return None
+    return vectorizer
+
+class CompactTfidfVectorizer(MmapTfidfVectorizer):
+    """MmapTfidfVectorizer de un vocabulario compactado (columnas podadas)
+
+    Mismo orden y ancho de columnas que el vectorizador original, así que
+    los modelos existentes lo usan sin cambios.
+    """
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.pruned = self.params.get("pruned", 0)
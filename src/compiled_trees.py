@@ -0,0 +1,238 @@
+import json
+import os
+
+import numpy as np
+
+from src.artifact_loader import file_sha256, is_unverified
+from src.mmap_artifacts import MmapForestClassifier, _load_array, _save_array, export_forest
+
+ENGINE_INDEX = "engine.json"
+
+def _xgboost_base_margin(learner_model_param, n_classes):
+    """base_score del modelo JSON ('5E-1' o '[5E-1,...]') como margen por clase"""
+    raw = learner_model_param["base_score"].strip("[]")
+    values = np.array([float(v) for v in raw.split(",")], dtype=np.float64)
+    return np.broadcast_to(values, (n_classes,)).copy()
+
+def export_xgboost(model, directory):
+    """Aplanar un XGBClassifier (gbtree, multi:softprob) en arreglos de nodos contiguos
+
+    Se leen los árboles del modelo JSON de XGBoost: umbrales en float32 sin
+    pérdida de precisión y dirección por defecto para valores ausentes.
+    """
+    booster = model.get_booster()
+    dump = json.loads(booster.save_raw("json"))
+    learner = dump["learner"]
+    objective = learner["objective"]["name"]
+    if objective != "multi:softprob":
+        raise ValueError(f"Objetivo no soportado: {objective}")
+    if learner["gradient_booster"]["name"] != "gbtree":
+        raise ValueError("Solo se soportan boosters gbtree")
+
+    trees_model = learner["gradient_booster"]["model"]
+    n_classes = int(learner["learner_model_param"]["num_class"])
+    os.makedirs(directory, exist_ok=True)
+
+    left, right, feature, threshold, default_left, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for tree in trees_model["trees"]:
+        if any(tree["split_type"]):
+            raise ValueError("No se soportan splits categóricos")
+        tree_left = np.asarray(tree["left_children"], dtype=np.int64)
+        is_leaf = tree_left == -1
+
+        # Las hojas apuntan a sí mismas: el recorrido no necesita máscara de hojas
+        own = np.arange(len(tree_left)) + offset
+        left.append(np.where(is_leaf, own, tree_left + offset))
+        right.append(np.where(is_leaf, own, np.asarray(tree["right_children"], dtype=np.int64) + offset))
+        feature.append(np.where(is_leaf, 0, tree["split_indices"]))
+        # En las hojas split_conditions guarda el valor de la hoja
+        threshold.append(np.asarray(tree["split_conditions"], dtype=np.float32))
+        default_left.append(np.asarray(tree["default_left"], dtype=bool))
+
+        roots.append(offset)
+        offset += len(tree_left)
+        max_depth = max(max_depth, _tree_depth(tree_left, tree["right_children"]))
+
+    _save_array(directory, "left", np.concatenate(left).astype(np.int32))
+    _save_array(directory, "right", np.concatenate(right).astype(np.int32))
+    _save_array(directory, "feature", np.concatenate(feature).astype(np.int32))
+    _save_array(directory, "threshold", np.concatenate(threshold))
+    _save_array(directory, "default_left", np.concatenate(default_left))
+    _save_array(directory, "roots", np.array(roots, dtype=np.int32))
+    _save_array(directory, "tree_class", np.asarray(trees_model["tree_info"], dtype=np.int32))
+    _save_array(directory, "base_margin", _xgboost_base_margin(learner["learner_model_param"], n_classes))
+    _save_array(directory, "classes", np.asarray(getattr(model, "classes_", np.arange(n_classes))))
+    # Booster nativo (sin el wrapper de sklearn) para los lotes grandes
+    booster.save_model(os.path.join(directory, "booster.ubj"))
+
+    with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "n_features_in": int(learner["learner_model_param"]["num_feature"]),
+            "n_classes": n_classes,
+            "max_depth": int(max_depth)
+        }, f, indent=2)
+
+def _tree_depth(left, right):
+    depth, frontier = 0, [0]
+    while frontier:
+        frontier = [child for node in frontier for child in (left[node], right[node]) if child != -1]
+        depth += 1 if frontier else 0
+    return depth
+
+class CompiledBoosterClassifier:
+    """XGBClassifier (multi:softprob) de solo predicción sobre arreglos de nodos
+
+    Para una fila recorre todos los árboles a la vez con NumPy, suma los
+    márgenes por clase y aplica softmax. Igual que XGBoost con una matriz
+    dispersa, las entradas no almacenadas cuentan como ausentes y siguen la
+    dirección por defecto del nodo. Desde vectorized_max_rows + 1 filas el
+    recorrido en C++ de XGBoost es más rápido, así que los lotes van a
+    Booster.inplace_predict (sin DMatrix ni wrapper de sklearn).
+    """
+
+    def __init__(self, directory, vectorized_max_rows=1):
+        self.directory = directory
+        self.vectorized_max_rows = vectorized_max_rows
+        self._booster = None
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+
+        # np.asarray quita la subclase memmap (más rápida al indexar) sin copiar
+        self.left = np.asarray(_load_array(directory, "left"))
+        self.right = np.asarray(_load_array(directory, "right"))
+        self.feature = np.asarray(_load_array(directory, "feature"))
+        self.threshold = np.asarray(_load_array(directory, "threshold"))
+        self.default_left = np.asarray(_load_array(directory, "default_left"))
+        self.roots = np.asarray(_load_array(directory, "roots"), dtype=np.int64)
+        self.tree_class = np.asarray(_load_array(directory, "tree_class"))
+        self.base_margin = np.asarray(_load_array(directory, "base_margin"))
+        self.classes_ = np.asarray(_load_array(directory, "classes"))
+        self.n_features_in_ = meta["n_features_in"]
+        self.n_classes = meta["n_classes"]
+        self.max_depth = meta["max_depth"]
+        # Árboles intercalados por clase (lo habitual): la suma es un reshape
+        n_rounds = len(self.roots) // max(self.n_classes, 1)
+        self._interleaved = np.array_equal(self.tree_class, np.tile(np.arange(self.n_classes), n_rounds))
+
+    def _dense_with_missing(self, X):
+        """Matriz float32 con NaN donde la entrada dispersa no tiene valor"""
+        if hasattr(X, "tocsr"):
+            X = X.tocsr()
+            dense = np.full(X.shape, np.nan, dtype=np.float32)
+            rows = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+            dense[rows, X.indices] = X.data
+            return dense
+        return np.asarray(X, dtype=np.float32)
+
+    def predict_margin(self, X):
+        X = self._dense_with_missing(X)
+        n_rows, n_trees = X.shape[0], len(self.roots)
+
+        # Árbol por árbol para todas las filas a la vez (índices planos en X)
+        nodes = np.repeat(self.roots, n_rows)
+        row_offsets = np.tile(np.arange(n_rows) * X.shape[1], n_trees)
+        X_flat = X.ravel()
+        for _ in range(self.max_depth):
+            values = X_flat[row_offsets + self.feature[nodes]]
+            # XGBoost: izquierda si x < umbral; ausente (NaN) -> dirección por defecto
+            go_left = (values < self.threshold[nodes]) | (np.isnan(values) & self.default_left[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        leaves = self.threshold[nodes].reshape(n_trees, n_rows).astype(np.float64)
+        if self._interleaved:
+            per_class = leaves.reshape(-1, self.n_classes, n_rows).sum(axis=0).T
+        else:
+            per_class = np.zeros((n_rows, self.n_classes))
+            np.add.at(per_class.T, self.tree_class, leaves)
+        return per_class + self.base_margin
+
+    def _get_booster(self):
+        if self._booster is None:
+            booster_path = os.path.join(self.directory, "booster.ubj")
+            try:
+                import xgboost
+            except ImportError:
+                return None
+            if not os.path.exists(booster_path):
+                return None
+            booster = xgboost.Booster()
+            booster.load_model(booster_path)
+            self._booster = booster
+        return self._booster
+
+    def predict_proba(self, X):
+        if X.shape[0] > self.vectorized_max_rows:
+            booster = self._get_booster()
+            if booster is not None:
+                return booster.inplace_predict(X).reshape(X.shape[0], -1).astype(np.float64)
+        margin = self.predict_margin(X)
+        margin -= margin.max(axis=1, keepdims=True)
+        np.exp(margin, out=margin)
+        margin /= margin.sum(axis=1, keepdims=True)
+        return margin
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+def compile_model(model, directory, source_path=None, arrays_dir=None):
+    """Compilar un clasificador de árboles (RandomForest/ExtraTrees/DecisionTree o XGBoost)
+
+    Si se indica source_path se guarda su sha256 para detectar compilados
+    desactualizados (ver is_stale). Con arrays_dir, un bosque ya exportado
+    con export_forest (p. ej. el del bundle mmap) se reutiliza en lugar de
+    escribir otra copia de los mismos arreglos.
+    """
+    from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+    from sklearn.tree import DecisionTreeClassifier
+
+    os.makedirs(directory, exist_ok=True)
+    index = {}
+    if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier, DecisionTreeClassifier)):
+        if arrays_dir is None:
+            export_forest(model, directory)
+        else:
+            index["arrays"] = os.path.relpath(arrays_dir, directory)
+        kind = "forest"
+    elif type(model).__name__ == "XGBClassifier":
+        export_xgboost(model, directory)
+        kind = "xgboost"
+    else:
+        raise ValueError(f"Modelo no soportado para compilar: {type(model).__name__}")
+
+    with open(os.path.join(directory, ENGINE_INDEX), "w", encoding="utf-8") as f:
+        json.dump(dict({
+            "kind": kind,
+            "model_class": type(model).__name__,
+            "source": os.path.basename(source_path) if source_path else None,
+            "source_sha256": file_sha256(source_path) if source_path else None
+        }, **index), f, indent=2)
+    return kind
+
+def is_stale(directory, source_path):
+    """True si el compilado no se puede verificar contra el archivo de modelo actual
+
+    Sin el archivo original o sin su sha256 registrado no hay forma de saber
+    si los árboles corresponden al modelo, así que también cuenta como
+    desactualizado.
+    """
+    with open(os.path.join(directory, ENGINE_INDEX), encoding="utf-8") as f:
+        index = json.load(f)
+    return is_unverified(index.get("source_sha256"), source_path)
+
+def load_compiled_model(directory):
+    """Cargar un modelo compilado con compile_model (None si no existe)"""
+    index_path = os.path.join(directory, ENGINE_INDEX)
+    if not os.path.exists(index_path):
+        return None
+
+    with open(index_path, encoding="utf-8") as f:
+        index = json.load(f)
+    kind = index["kind"]
+    if kind == "forest":
+        # "arrays": bosque exportado en otro directorio (relativo a este)
+        return MmapForestClassifier(os.path.normpath(os.path.join(directory, index.get("arrays", "."))))
+    if kind == "xgboost":
+        return CompiledBoosterClassifier(directory)
+    raise ValueError(f"Motor compilado desconocido: {kind}")
@@ -5,6 +5,8 @@ from dotenv import load_dotenv
 if os.getenv('FLASK_ENV') != 'production':
     load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class Config:
     """Configuración para desarrollo y producción"""
     
@@ -19,6 +21,94 @@ class Config:
     DB_NAME = os.environ.get('DB_NAME', 'saludiadb')
     DB_PORT = int(os.environ.get('DB_PORT', 3306))
     
+    # Pool de conexiones (reutilizado entre peticiones e hilos)
+    DB_POOL_ENABLED = os.environ.get('DB_POOL_ENABLED', 'true').lower() == 'true'
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_POOL_MAX_LIFETIME = int(os.environ.get('DB_POOL_MAX_LIFETIME', 1800))
+    DB_POOL_HEALTH_CHECK = os.environ.get('DB_POOL_HEALTH_CHECK', 'true').lower() == 'true'
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 5.0))
+    
+    # Índice de recomendaciones en memoria (0 = sin recarga periódica)
+    RECOMMENDATIONS_REFRESH_INTERVAL = int(os.environ.get('RECOMMENDATIONS_REFRESH_INTERVAL', 600))
+    RECOMMENDATIONS_WARM_UP = os.environ.get('RECOMMENDATIONS_WARM_UP', 'false').lower() == 'true'
+    # Nombres desconocidos recordados hasta la próxima recarga (LRU)
+    RECOMMENDATIONS_MAX_MISSES = int(os.environ.get('RECOMMENDATIONS_MAX_MISSES', 1024))
+    
+    # Token para endpoints de administración (vacío = deshabilitados)
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+    
+    # Modelos (MODEL_PATH relativo se resuelve contra la raíz del proyecto)
+    MODEL_PATH = os.path.join(BASE_DIR, os.environ.get('MODEL_PATH', 'models'))
+    V11_COMPONENTS_PATH = os.environ.get('V11_COMPONENTS_PATH', os.path.join(MODEL_PATH, 'v11_components'))
+    MODEL_STRICT_SKLEARN = os.environ.get('MODEL_STRICT_SKLEARN', 'true').lower() == 'true'
+    V11_BACKUP_BUNDLE = os.environ.get(
+        'V11_BACKUP_BUNDLE', os.path.join(MODEL_PATH, 'v11_backup', 'backup_components.pkl')
+    )
+    # Backup v11: 'pickle' (joblib) o 'mmap' (arreglos compartidos entre workers)
+    MODEL_ARTIFACT_FORMAT = os.environ.get('MODEL_ARTIFACT_FORMAT', 'pickle').lower()
+    V11_BACKUP_MMAP_DIR = os.environ.get('V11_BACKUP_MMAP_DIR', os.path.join(MODEL_PATH, 'v11_backup', 'mmap'))
+    
+    # Registro de modelos v6-v10: máximo residentes y presupuesto de memoria (0 = sin límite)
+    MODEL_REGISTRY_MAX_MODELS = int(os.environ.get('MODEL_REGISTRY_MAX_MODELS', 2))
+    MODEL_REGISTRY_MEMORY_MB = float(os.environ.get('MODEL_REGISTRY_MEMORY_MB', 0))
+    
+    # Motor de árboles: 'native' (sklearn/XGBoost) o 'compiled' (scripts/compile_tree_models.py)
+    TREE_ENGINE = os.environ.get('TREE_ENGINE', 'native').lower()
+    COMPILED_MODELS_PATH = os.environ.get('COMPILED_MODELS_PATH', os.path.join(MODEL_PATH, 'compiled'))
+    
+    # Vocabulario TF-IDF: 'sklearn' (pickle) o 'compact' (scripts/build_compact_vocab.py)
+    VOCABULARY_FORMAT = os.environ.get('VOCABULARY_FORMAT', 'sklearn').lower()
+    COMPACT_VOCAB_PATH = os.environ.get('COMPACT_VOCAB_PATH', os.path.join(MODEL_PATH, 'compact_vocab'))
+    
+    # Características del backup v11: 'tfidf' (vocabulario) o 'hashing' (scripts/train_hashing_model.py)
+    FEATURE_PIPELINE = os.environ.get('FEATURE_PIPELINE', 'tfidf').lower()
+    HASHING_MODEL_PATH = os.environ.get('HASHING_MODEL_PATH', os.path.join(MODEL_PATH, 'hashing', 'v11'))
+    
+    # Traducción: tabla bilingüe de etiquetas + LRU para textos arbitrarios
+    LABEL_TRANSLATIONS_PATH = os.environ.get(
+        'LABEL_TRANSLATIONS_PATH', os.path.join(MODEL_PATH, 'label_translations.json')
+    )
+    TRANSLATION_CACHE_SIZE = int(os.environ.get('TRANSLATION_CACHE_SIZE', 2048))
+    # true = consultar Google Translate ante un texto fuera de la tabla y la LRU (llamada de red
+    # en la ruta de la petición); por defecto se devuelve el texto original
+    TRANSLATION_ONLINE_FALLBACK = os.environ.get('TRANSLATION_ONLINE_FALLBACK', 'false').lower() == 'true'
+    
+    # Servidor ASGI (asgi.py): hilos de inferencia (0 = núcleos) y cola máxima
+    ASGI_INFERENCE_WORKERS = int(os.environ.get('ASGI_INFERENCE_WORKERS', 0))
+    ASGI_MAX_PENDING = int(os.environ.get('ASGI_MAX_PENDING', 64))
+    
+    # Diagnósticos alternativos devueltos en top_diagnosticos
+    TOP_K_DIAGNOSES = int(os.environ.get('TOP_K_DIAGNOSES', 3))
+    
+    # Predicción por lotes
+    MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 256))
+    
+    # Backend de inferencia: 'thread' (en el proceso) o 'process' (pool de procesos)
+    INFERENCE_BACKEND = os.environ.get('INFERENCE_BACKEND', 'thread').lower()
+    INFERENCE_PROCESSES = int(os.environ.get('INFERENCE_PROCESSES', 0))  # 0 = núcleos
+    INFERENCE_START_METHOD = os.environ.get('INFERENCE_START_METHOD', 'forkserver')
+    
+    # Micro-batching de predicciones individuales concurrentes
+    MICRO_BATCH_ENABLED = os.environ.get('MICRO_BATCH_ENABLED', 'false').lower() == 'true'
+    MICRO_BATCH_MAX_SIZE = int(os.environ.get('MICRO_BATCH_MAX_SIZE', 32))
+    MICRO_BATCH_MAX_DELAY_MS = float(os.environ.get('MICRO_BATCH_MAX_DELAY_MS', 5.0))
+    
+    # Caché de predicciones (0 desactiva la caché)
+    PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', 1024))
+    PREDICTION_CACHE_TTL = int(os.environ.get('PREDICTION_CACHE_TTL', 3600))
+    
+    # Registro asíncrono de predicciones en BD
+    PREDICTION_LOG_ENABLED = os.environ.get('PREDICTION_LOG_ENABLED', 'false').lower() == 'true'
+    PREDICTION_LOG_QUEUE_SIZE = int(os.environ.get('PREDICTION_LOG_QUEUE_SIZE', 1000))
+    PREDICTION_LOG_BATCH_SIZE = int(os.environ.get('PREDICTION_LOG_BATCH_SIZE', 50))
+    PREDICTION_LOG_FLUSH_INTERVAL = float(os.environ.get('PREDICTION_LOG_FLUSH_INTERVAL', 2.0))
+    PREDICTION_LOG_DROP_POLICY = os.environ.get('PREDICTION_LOG_DROP_POLICY', 'drop_new')
+    
+    # Exportación de predictions (python -m src.prediction_export)
+    EXPORT_PATH = os.environ.get('EXPORT_PATH', os.path.join(BASE_DIR, 'exports'))
+    EXPORT_FORMAT = os.environ.get('EXPORT_FORMAT', 'parquet').lower()
+    EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 50000))
+    
     # Environment detection
     IS_PRODUCTION = os.environ.get('FLASK_ENV') == 'production'
     
@@ -1,18 +1,74 @@
 import mysql.connector
 from mysql.connector import Error
 from src.config import Config
+from src.db_pool import ConnectionPool
+from src.recommendations_index import RecommendationsIndex
+from contextlib import contextmanager
+import threading
 import logging
 from datetime import datetime
 import numpy as np
 
+PREDICTION_INSERT_QUERY = """
+    INSERT INTO predictions 
+    (symptoms, diagnosis, confidence, model_version, age_detected, 
+     age_range, gender, gender_origin, symptoms_processed, timestamp)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
 class DatabaseManager:
     """Gestor mejorado de base de datos para Aiven"""
     
     def __init__(self):
         self.connection = None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self.recommendations_index = RecommendationsIndex(
+            self.load_all_recommendations,
+            fallback=lambda name: self.fetch_recommendations(name, raise_errors=True),
+            refresh_interval=Config.RECOMMENDATIONS_REFRESH_INTERVAL,
+            max_misses=Config.RECOMMENDATIONS_MAX_MISSES
+        )
         # Imprimir configuración al inicializar
         Config.print_config()
     
+    @property
+    def pool(self):
+        """Pool de conexiones compartido (se crea en el primer uso)"""
+        if not Config.DB_POOL_ENABLED:
+            return None
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(
+                        lambda: mysql.connector.connect(**Config.get_db_config()),
+                        max_size=Config.DB_POOL_SIZE,
+                        max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+                        health_check=self._ping if Config.DB_POOL_HEALTH_CHECK else None,
+                        borrow_timeout=Config.DB_POOL_TIMEOUT
+                    )
+        return self._pool
+    
+    @staticmethod
+    def _ping(connection):
+        connection.ping(reconnect=False)
+    
+    @contextmanager
+    def session(self):
+        """Conexión para una operación: del pool si está activo, si no una nueva"""
+        pool = self.pool
+        if pool is not None:
+            with pool.connection() as connection:
+                yield connection
+            return
+        
+        if not self.connect():
+            raise ConnectionError("No se pudo conectar a BD")
+        try:
+            yield self.connection
+        finally:
+            self.disconnect()
+    
     def connect(self):
         """Conectar a la base de datos con manejo de SSL"""
         try:
@@ -47,19 +103,19 @@ class DatabaseManager:
     def test_connection(self):
         """Probar conexión a la base de datos"""
         try:
-            if self.connect():
-                cursor = self.connection.cursor()
+            with self.session() as connection:
+                cursor = connection.cursor()
                 cursor.execute("SELECT VERSION() as version, NOW() as current_time")
                 result = cursor.fetchone()
                 cursor.close()
-                self.disconnect()
-                
-                return {
-                    "status": "success", 
-                    "message": "Conexión exitosa", 
-                    "mysql_version": result[0],
-                    "current_time": result[1].isoformat() if result[1] else None
-                }
+            
+            return {
+                "status": "success", 
+                "message": "Conexión exitosa", 
+                "mysql_version": result[0],
+                "current_time": result[1].isoformat() if result[1] else None,
+                "pool": self.pool.stats() if self.pool is not None else None
+            }
         except Exception as e:
             return {
                 "status": "error", 
@@ -98,62 +154,93 @@ class DatabaseManager:
         # Para cualquier otro tipo, convertir a string
         return str(value)
     
+    def build_prediction_row(self, symptoms, diagnosis, confidence, model_version,
+                             age_detected=None, age_range=None, gender=None,
+                             gender_origin=None, symptoms_processed=None, timestamp=None):
+        """Construir la fila de predictions con tipos compatibles con MySQL"""
+        return (
+            self._convert_to_mysql_type(symptoms),
+            self._convert_to_mysql_type(diagnosis),
+            self._convert_to_mysql_type(confidence),
+            self._convert_to_mysql_type(model_version),
+            self._convert_to_mysql_type(age_detected),
+            self._convert_to_mysql_type(age_range),
+            self._convert_to_mysql_type(gender),
+            self._convert_to_mysql_type(gender_origin),
+            self._convert_to_mysql_type(symptoms_processed),
+            timestamp or datetime.now()
+        )
+    
     def log_prediction(self, symptoms, diagnosis, confidence, model_version, 
                       age_detected=None, age_range=None, gender=None, 
                       gender_origin=None, symptoms_processed=None):
         """Registrar predicción en BD con conversión de tipos"""
-        if not self.connect():
-            print("⚠️ No se pudo conectar a BD para logging")
-            return False
-        
         try:
-            cursor = self.connection.cursor()
-            
             # Convertir TODOS los valores a tipos compatibles con MySQL
-            symptoms_clean = self._convert_to_mysql_type(symptoms)
-            diagnosis_clean = self._convert_to_mysql_type(diagnosis)
-            confidence_clean = self._convert_to_mysql_type(confidence)
-            model_version_clean = self._convert_to_mysql_type(model_version)
-            age_detected_clean = self._convert_to_mysql_type(age_detected)
-            age_range_clean = self._convert_to_mysql_type(age_range)
-            gender_clean = self._convert_to_mysql_type(gender)
-            gender_origin_clean = self._convert_to_mysql_type(gender_origin)
-            symptoms_processed_clean = self._convert_to_mysql_type(symptoms_processed)
-            
-            query = """
-                INSERT INTO predictions 
-                (symptoms, diagnosis, confidence, model_version, age_detected, 
-                 age_range, gender, gender_origin, symptoms_processed, timestamp)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            values = (
-                symptoms_clean, diagnosis_clean, confidence_clean, model_version_clean,
-                age_detected_clean, age_range_clean, gender_clean, gender_origin_clean,
-                symptoms_processed_clean, datetime.now()
+            values = self.build_prediction_row(
+                symptoms, diagnosis, confidence, model_version, age_detected,
+                age_range, gender, gender_origin, symptoms_processed
             )
             
-            cursor.execute(query, values)
-            self.connection.commit()
-            cursor.close()
-            print(f"✅ Predicción guardada: {diagnosis_clean} ({confidence_clean}%)")
+            with self.session() as connection:
+                cursor = connection.cursor()
+                cursor.execute(PREDICTION_INSERT_QUERY, values)
+                connection.commit()
+                cursor.close()
+            print(f"✅ Predicción guardada: {values[1]} ({values[2]}%)")
             return True
             
-        except Error as e:
+        except (Error, ConnectionError) as e:
             logging.error(f"Error guardando predicción: {e}")
             print(f"❌ Error guardando predicción: {e}")
             return False
-        finally:
-            self.disconnect()
+    
+    def log_predictions_batch(self, rows):
+        """Registrar un lote de filas (de build_prediction_row) con executemany
+        
+        Lanza la excepción si falla para que el llamador decida si reintentar.
+        """
+        if not rows:
+            return True
+        
+        with self.session() as connection:
+            cursor = connection.cursor()
+            cursor.executemany(PREDICTION_INSERT_QUERY, rows)
+            connection.commit()
+            cursor.close()
+        return True
     
     def get_recommendations(self, diagnosis_name):
-        """Obtener recomendaciones de la BD por diagnóstico"""
-        if not self.connect():
-            print("⚠️ No se pudo conectar a BD para recomendaciones")
-            return []
+        """Obtener recomendaciones por diagnóstico desde el índice en memoria"""
+        return self.recommendations_index.get(diagnosis_name)
+    
+    def load_all_recommendations(self):
+        """Leer todas las recomendaciones activas para el índice en memoria
+        
+        Devuelve filas (name_en, name_es, texto) en orden de prioridad.
+        """
+        query = """
+            SELECT d.name_en, d.name_es, r.recommendation_text
+            FROM recommendations r
+            JOIN diagnoses d ON r.diagnosis_id = d.id
+            WHERE r.is_active = TRUE
+            ORDER BY d.id ASC, r.priority ASC, r.id ASC
+        """
+        with self.session() as connection:
+            cursor = connection.cursor()
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            cursor.close()
         
+        return [tuple(self._convert_to_mysql_type(value) for value in row) for row in rows]
+    
+    def fetch_recommendations(self, diagnosis_name, raise_errors=False):
+        """Obtener recomendaciones de la BD por diagnóstico (fallo del índice)
+        
+        Con raise_errors el error de la BD se propaga en lugar de devolver [],
+        así el índice distingue un fallo de un diagnóstico sin recomendaciones.
+        """
         try:
-            cursor = self.connection.cursor()
-            
             # Limpiar y convertir el nombre del diagnóstico
             diagnosis_clean = self._convert_to_mysql_type(diagnosis_name)
             print(f"🔍 Buscando recomendaciones para: '{diagnosis_clean}'")
@@ -166,21 +253,23 @@ class DatabaseManager:
                 AND r.is_active = TRUE
                 ORDER BY r.priority ASC, r.id ASC
             """
-            cursor.execute(query, (diagnosis_clean, diagnosis_clean))
-            recommendations = cursor.fetchall()
-            cursor.close()
+            with self.session() as connection:
+                cursor = connection.cursor()
+                cursor.execute(query, (diagnosis_clean, diagnosis_clean))
+                recommendations = cursor.fetchall()
+                cursor.close()
             
             # Convertir a lista de strings
             result = [self._convert_to_mysql_type(rec[0]) for rec in recommendations]
             print(f"✅ Encontradas {len(result)} recomendaciones para '{diagnosis_clean}'")
             return result
             
-        except Error as e:
+        except (Error, ConnectionError) as e:
             logging.error(f"Error obteniendo recomendaciones: {e}")
             print(f"❌ Error obteniendo recomendaciones: {e}")
+            if raise_errors:
+                raise
             return []
-        finally:
-            self.disconnect()
 
 # Instancia global
 db_manager = DatabaseManager()
\ No newline at end of file
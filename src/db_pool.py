@@ -0,0 +1,171 @@
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+class PoolExhausted(ConnectionError):
+    """No hay conexiones libres dentro del tiempo de espera
+
+    Subclase de ConnectionError para que los manejadores de errores de BD
+    existentes (except (Error, ConnectionError)) también la atrapen.
+    """
+
+class _PooledEntry:
+    __slots__ = ("connection", "created_at")
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+
+def default_health_check(connection):
+    """Verificar la conexión antes de prestarla (ping o SELECT 1)"""
+    if hasattr(connection, "ping"):
+        connection.ping(reconnect=False)
+        return True
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    finally:
+        cursor.close()
+    return True
+
+class ConnectionPool:
+    """Pool de conexiones DB-API reutilizable entre peticiones e hilos
+
+    Las conexiones se crean con factory() bajo demanda hasta max_size, se
+    validan al prestarse (health_check) y se reemplazan al superar
+    max_lifetime segundos. Una conexión que falla dentro del bloque se
+    cierra en lugar de devolverse al pool.
+    """
+
+    def __init__(self, factory, max_size=5, max_lifetime=1800, health_check=default_health_check,
+                 borrow_timeout=5.0):
+        self.factory = factory
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.health_check = health_check
+        self.borrow_timeout = borrow_timeout
+
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._pid = os.getpid()
+        self.borrowed = 0
+        self.opened = 0
+        self.recycled = 0
+        self.failed_checks = 0
+
+    def _check_fork(self):
+        # Las conexiones (sockets TLS) no se pueden compartir entre procesos
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+
+    def _open(self):
+        connection = self.factory()
+        with self._lock:
+            self.opened += 1
+        return _PooledEntry(connection)
+
+    def _discard(self, entry):
+        with self._lock:
+            self._created -= 1
+        try:
+            entry.connection.close()
+        except Exception:
+            pass
+
+    def _expired(self, entry):
+        return self.max_lifetime and time.monotonic() - entry.created_at > self.max_lifetime
+
+    def _borrow(self):
+        self._check_fork()
+        deadline = time.monotonic() + self.borrow_timeout
+
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                entry = None
+
+            if entry is None:
+                with self._lock:
+                    can_create = self._created < self.max_size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        return self._open()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolExhausted(f"Sin conexiones libres tras {self.borrow_timeout}s")
+                try:
+                    entry = self._idle.get(timeout=remaining)
+                except queue.Empty:
+                    raise PoolExhausted(f"Sin conexiones libres tras {self.borrow_timeout}s")
+
+            if self._expired(entry):
+                with self._lock:
+                    self.recycled += 1
+                self._discard(entry)
+                continue
+
+            if self.health_check is not None:
+                try:
+                    self.health_check(entry.connection)
+                except Exception as e:
+                    logging.warning(f"Conexión del pool no pasó el health check: {e}")
+                    with self._lock:
+                        self.failed_checks += 1
+                    self._discard(entry)
+                    continue
+
+            return entry
+
+    @contextmanager
+    def connection(self):
+        """Prestar una conexión: with pool.connection() as conn: ..."""
+        entry = self._borrow()
+        with self._lock:
+            self.borrowed += 1
+        try:
+            yield entry.connection
+        except Exception:
+            self._discard(entry)
+            raise
+        else:
+            if self._pid == os.getpid():
+                self._idle.put(entry)
+
+    def close_all(self):
+        """Cerrar las conexiones libres (p. ej. al apagar el worker)"""
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(entry)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "open": self._created,
+                "idle": self._idle.qsize(),
+                "borrowed_total": self.borrowed,
+                "opened_total": self.opened,
+                "recycled_total": self.recycled,
+                "failed_health_checks": self.failed_checks
+            }
@@ -0,0 +1,159 @@
+import json
+import os
+from itertools import islice
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from src.mmap_artifacts import _load_array, _save_array
+from src.preprocessor import TextPreprocessor
+
+# Normalizaciones disponibles: la misma que usa cada familia de modelos
+CLEANERS = {
+    'symptoms': TextPreprocessor.clean_symptoms,      # modelo v11
+    'medical': TextPreprocessor.clean_medical_text,   # modelos v6-v10
+}
+
+HASHING_PARAMS = ("n_features", "ngram_range", "stop_words", "sublinear_tf", "norm", "cleaner")
+
+def iter_batches(iterable, batch_size):
+    """Listas de hasta batch_size elementos de un iterable (sin materializarlo)"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+class HashingTfidfVectorizer:
+    """TF-IDF sobre feature hashing: sin vocabulario y con ajuste incremental
+
+    Cada término va a la columna hash(término) % n_features, así que no hay
+    diccionario que guardar ni que cargar. El idf se calcula con las
+    frecuencias de documento acumuladas por partial_fit, lote a lote, sobre
+    un flujo de textos de cualquier tamaño. transform recibe textos ya
+    limpios con el limpiador indicado (clean_text), igual que el TF-IDF de
+    los modelos actuales.
+    """
+
+    def __init__(self, n_features=2 ** 18, ngram_range=(1, 2), stop_words=None, sublinear_tf=True,
+                 norm='l2', cleaner='symptoms'):
+        if cleaner not in CLEANERS:
+            raise ValueError(f"Limpiador desconocido: {cleaner}")
+        self.n_features = int(n_features)
+        self.ngram_range = tuple(ngram_range)
+        self.stop_words = stop_words
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.cleaner = cleaner
+        self.document_frequency = np.zeros(self.n_features, dtype=np.int64)
+        self.n_documents = 0
+        self._idf = None
+        self._hasher = HashingVectorizer(
+            n_features=self.n_features, ngram_range=self.ngram_range, stop_words=self.stop_words,
+            alternate_sign=False, norm=None, dtype=np.float64
+        )
+
+    def clean_text(self, text):
+        return CLEANERS[self.cleaner](text)
+
+    def partial_fit(self, texts):
+        """Acumular frecuencias de documento de un lote de textos limpios"""
+        counts = self._hasher.transform(texts)
+        # Cada columna aparece una sola vez por fila: bincount de los índices = df
+        if counts.nnz:
+            # Suma sin += porque el arreglo cargado puede estar mapeado en solo lectura
+            self.document_frequency = self.document_frequency + np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents += counts.shape[0]
+        self._idf = None
+        return self
+
+    @property
+    def idf_(self):
+        """idf suavizado (mismo cálculo que TfidfVectorizer) en float32"""
+        if self._idf is None:
+            df = np.asarray(self.document_frequency, dtype=np.float64)
+            self._idf = (np.log((1.0 + self.n_documents) / (1.0 + df)) + 1.0).astype(np.float32)
+        return self._idf
+
+    def transform(self, texts):
+        X = self._hasher.transform(texts)
+        if self.sublinear_tf:
+            np.log(X.data, out=X.data)
+            X.data += 1.0
+        X.data *= self.idf_[X.indices]
+        if self.norm:
+            X = normalize(X, norm=self.norm, copy=False)
+        return X
+
+    def fit_transform(self, texts):
+        return self.partial_fit(texts).transform(texts)
+
+    def save(self, directory):
+        """Guardar parámetros, frecuencias de documento e idf (.npy mapeables)"""
+        os.makedirs(directory, exist_ok=True)
+        _save_array(directory, "document_frequency", self.document_frequency)
+        _save_array(directory, "idf", self.idf_)
+        params = {name: getattr(self, name) for name in HASHING_PARAMS}
+        params["ngram_range"] = list(self.ngram_range)
+        params["n_documents"] = self.n_documents
+        with open(os.path.join(directory, "params.json"), "w", encoding="utf-8") as f:
+            json.dump(params, f, indent=2, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, "params.json"), encoding="utf-8") as f:
+            params = json.load(f)
+        vectorizer = cls(**{name: params[name] for name in HASHING_PARAMS})
+        vectorizer.n_documents = params["n_documents"]
+        # Mapeados en memoria (ver partial_fit)
+        vectorizer.document_frequency = _load_array(directory, "document_frequency")
+        vectorizer._idf = np.asarray(_load_array(directory, "idf"))
+        return vectorizer
+
+def train_streaming(make_stream, directory=None, classes=None, batch_size=1000, vectorizer=None, classifier=None):
+    """Entrenar vectorizador + clasificador lineal fuera de memoria
+
+    make_stream() debe devolver un iterable nuevo de (texto, etiqueta) en
+    cada llamada (p. ej. leer un archivo línea a línea): una pasada ajusta el
+    idf y otra entrena el clasificador con partial_fit, en lotes de
+    batch_size. Los textos se limpian con vectorizer.clean_text. Si se
+    indica directory, se guarda el bundle (ver load_hashing_bundle).
+    """
+    from sklearn.linear_model import SGDClassifier
+
+    vectorizer = vectorizer or HashingTfidfVectorizer()
+    classifier = classifier or SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
+
+    # 1. Frecuencias de documento (y clases, si no se dieron)
+    seen_classes = set()
+    for batch in iter_batches(make_stream(), batch_size):
+        vectorizer.partial_fit([vectorizer.clean_text(text) for text, _ in batch])
+        if classes is None:
+            seen_classes.update(label for _, label in batch)
+    classes = np.asarray(sorted(seen_classes) if classes is None else classes)
+
+    # 2. Clasificador con el idf ya fijo
+    for batch in iter_batches(make_stream(), batch_size):
+        X = vectorizer.transform([vectorizer.clean_text(text) for text, _ in batch])
+        classifier.partial_fit(X, np.asarray([label for _, label in batch]), classes=classes)
+
+    if directory:
+        save_hashing_bundle(vectorizer, classifier, directory)
+    return vectorizer, classifier
+
+def save_hashing_bundle(vectorizer, classifier, directory):
+    vectorizer.save(os.path.join(directory, "vectorizer"))
+    joblib.dump(classifier, os.path.join(directory, "modelo.pkl"))
+
+def load_hashing_bundle(directory):
+    """{'modelo', 'tfidf_vectorizer'} del directorio, o None si no existe"""
+    model_path = os.path.join(directory, "modelo.pkl")
+    if not os.path.exists(model_path):
+        return None
+    return {
+        'modelo': joblib.load(model_path),
+        'tfidf_vectorizer': HashingTfidfVectorizer.load(os.path.join(directory, "vectorizer"))
+    }
@@ -0,0 +1,52 @@
+import json
+import os
+
+def normalize_label(text):
+    """Clave de la tabla: minúsculas y espacios normalizados"""
+    return " ".join(str(text).lower().split())
+
+class LabelTable:
+    """Tabla bilingüe de etiquetas de diagnóstico (en <-> es)
+
+    Se precalcula con scripts/build_label_translations.py y se guarda en
+    JSON, así traducir una etiqueta conocida es una búsqueda en un dict.
+    """
+
+    def __init__(self, en_to_es=None):
+        self.en_to_es = {}
+        self._to_es = {}
+        self._to_en = {}
+        for english, spanish in (en_to_es or {}).items():
+            self.add(english, spanish)
+
+    def add(self, english, spanish):
+        self.en_to_es[english] = spanish
+        self._to_es[normalize_label(english)] = spanish
+        # Una etiqueta ya en español se devuelve tal cual
+        self._to_es.setdefault(normalize_label(spanish), spanish)
+        self._to_en.setdefault(normalize_label(spanish), english)
+        self._to_en.setdefault(normalize_label(english), english)
+
+    def to_spanish(self, text):
+        return self._to_es.get(normalize_label(text))
+
+    def to_english(self, text):
+        return self._to_en.get(normalize_label(text))
+
+    def __len__(self):
+        return len(self.en_to_es)
+
+    def save(self, path, sources=None):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"sources": sources or [], "en_to_es": self.en_to_es},
+                      f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path):
+        """Cargar la tabla; vacía si el archivo no existe"""
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f).get("en_to_es", {}))
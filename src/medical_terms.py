@@ -0,0 +1,104 @@
+from collections import deque
+
+def _normalize(text):
+    return " ".join(str(text).lower().split())
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+class AhoCorasick:
+    """Autómata de Aho-Corasick para buscar muchos patrones a la vez
+
+    El recorrido es lineal en el largo del texto más el número de
+    coincidencias, sin importar cuántos patrones tenga el diccionario.
+    """
+
+    def __init__(self, patterns):
+        # patterns: iterable de (texto, valor)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for pattern, value in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] = self._out[state] + ((len(pattern), value),)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # Las salidas del estado de fallo también terminan aquí
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    @property
+    def states(self):
+        return len(self._goto)
+
+    def iter_matches(self, text):
+        """Generar (inicio, fin, valor) de cada coincidencia en el texto"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in out[state]:
+                yield i + 1 - length, i + 1, value
+
+class MedicalTermExtractor:
+    """Extrae síntomas canónicos del texto usando medical_dict
+
+    Cada sinónimo (y la propia clave canónica con espacios en vez de
+    guiones bajos) se agrega al autómata; solo cuentan coincidencias de
+    palabras completas, así "tos" no aparece dentro de "gastos".
+    """
+
+    def __init__(self, medical_dict):
+        patterns = {}
+        for canonical, synonyms in (medical_dict or {}).items():
+            for term in [canonical.replace("_", " "), *synonyms]:
+                term = _normalize(term)
+                if term:
+                    patterns.setdefault(term, canonical)
+
+        self.terms = len(patterns)
+        self.automaton = AhoCorasick(patterns.items())
+
+    def extract(self, text):
+        """Lista de síntomas canónicos en orden de aparición (sin repetir)"""
+        if not text:
+            return []
+
+        text = _normalize(text)
+        found = []
+        seen = set()
+        for start, end, canonical in self.automaton.iter_matches(text):
+            if canonical in seen:
+                continue
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if end < len(text) and _is_word_char(text[end]):
+                continue
+            seen.add(canonical)
+            found.append(canonical)
+        return found
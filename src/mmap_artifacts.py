@@ -0,0 +1,297 @@
+import json
+import os
+
+import joblib
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from src.artifact_loader import file_sha256, is_unverified
+
+BUNDLE_INDEX = "bundle.json"
+
+# Parámetros de TfidfVectorizer necesarios para reconstruir el analizador
+TFIDF_PARAMS = (
+    "analyzer", "lowercase", "strip_accents", "token_pattern", "ngram_range",
+    "stop_words", "binary", "norm", "use_idf", "smooth_idf", "sublinear_tf"
+)
+
+def _save_array(directory, name, array):
+    np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(array), allow_pickle=False)
+
+def _load_array(directory, name):
+    """Cargar un .npy mapeado en memoria de solo lectura (páginas compartidas)"""
+    return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+
+def export_tfidf(vectorizer, directory, idf_dtype=np.float64, column_mask=None, metadata=None):
+    """Exportar vocabulario ordenado + idf de un TfidfVectorizer ajustado
+
+    column_mask (opcional, largo n_features) marca con -1 las columnas que
+    no se emiten: siguen contando en la norma, así que las demás columnas
+    tienen el mismo valor que con el vectorizador original (ver
+    src/compact_vocab.py). metadata se agrega a params.json.
+    """
+    params = vectorizer.get_params()
+    if params.get("tokenizer") is not None or params.get("preprocessor") is not None or callable(params.get("analyzer")):
+        raise ValueError("No se puede exportar un vectorizador con funciones personalizadas")
+
+    os.makedirs(directory, exist_ok=True)
+
+    # Tabla de términos ordenada (bytes UTF-8) para búsqueda binaria sin dict
+    terms = sorted(vectorizer.vocabulary_.items(), key=lambda item: item[0].encode("utf-8"))
+    _save_array(directory, "terms", np.array([t.encode("utf-8") for t, _ in terms], dtype=np.bytes_))
+    _save_array(directory, "columns", np.array([c for _, c in terms], dtype=np.int32))
+    _save_array(directory, "idf", np.asarray(vectorizer.idf_, dtype=idf_dtype))
+    if column_mask is not None:
+        _save_array(directory, "column_mask", np.asarray(column_mask, dtype=np.int32))
+
+    exported = {name: params[name] for name in TFIDF_PARAMS}
+    exported["ngram_range"] = list(exported["ngram_range"])
+    if exported["stop_words"] is not None and not isinstance(exported["stop_words"], str):
+        exported["stop_words"] = sorted(exported["stop_words"])
+    exported["dtype"] = np.dtype(params["dtype"]).name
+    exported["n_features"] = len(terms)
+    exported.update(metadata or {})
+
+    with open(os.path.join(directory, "params.json"), "w", encoding="utf-8") as f:
+        json.dump(exported, f, indent=2, ensure_ascii=False)
+    return exported
+
+def export_forest(forest, directory):
+    """Exportar un bosque (o árbol) de clasificación como arreglos de nodos contiguos"""
+    estimators = getattr(forest, "estimators_", [forest])
+    if getattr(forest, "n_outputs_", 1) != 1:
+        raise ValueError("Solo se soportan clasificadores de una salida")
+
+    os.makedirs(directory, exist_ok=True)
+
+    left, right, feature, threshold, value, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in estimators:
+        tree = estimator.tree_
+        is_leaf = tree.children_left == -1
+
+        left.append(np.where(is_leaf, -1, tree.children_left + offset))
+        right.append(np.where(is_leaf, -1, tree.children_right + offset))
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+
+        # Probabilidades por hoja normalizadas como en DecisionTreeClassifier.predict_proba
+        proba = tree.value[:, 0, :].astype(np.float64)
+        normalizer = proba.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        value.append(proba / normalizer)
+
+        roots.append(offset)
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    _save_array(directory, "left", np.concatenate(left).astype(np.int32))
+    _save_array(directory, "right", np.concatenate(right).astype(np.int32))
+    _save_array(directory, "feature", np.concatenate(feature).astype(np.int32))
+    _save_array(directory, "threshold", np.concatenate(threshold).astype(np.float64))
+    _save_array(directory, "value", np.concatenate(value))
+    _save_array(directory, "roots", np.array(roots, dtype=np.int32))
+    _save_array(directory, "classes", np.asarray(forest.classes_))
+
+    with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"n_features_in": int(forest.n_features_in_), "max_depth": int(max_depth)}, f, indent=2)
+
+class MmapTfidfVectorizer:
+    """TfidfVectorizer de solo transformación sobre arreglos mapeados en memoria
+
+    Produce la misma matriz CSR (columnas, pesos y normalización) que el
+    TfidfVectorizer original, pero el vocabulario vive en un arreglo
+    ordenado compartido entre procesos en lugar de un dict por worker.
+    Los tokens se buscan con np.searchsorted y la CSR se arma directamente
+    con (data, indices, indptr).
+    """
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, "params.json"), encoding="utf-8") as f:
+            self.params = json.load(f)
+
+        # np.asarray quita la subclase memmap sin copiar (indexado más rápido)
+        self.terms = np.asarray(_load_array(directory, "terms"))
+        self.columns = np.asarray(_load_array(directory, "columns"))
+        self.idf_ = np.asarray(_load_array(directory, "idf"))
+        mask_path = os.path.join(directory, "column_mask.npy")
+        self.column_mask = np.asarray(_load_array(directory, "column_mask")) if os.path.exists(mask_path) else None
+        self.n_features = self.params["n_features"]
+        self.dtype = np.dtype(self.params["dtype"])
+        self._analyzer = None
+
+    @property
+    def nbytes(self):
+        arrays = (self.terms, self.columns, self.idf_, self.column_mask)
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def build_analyzer(self):
+        """Analizador idéntico al del vectorizador original (tokens + n-gramas)"""
+        if self._analyzer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            params = {name: self.params[name] for name in TFIDF_PARAMS}
+            params["ngram_range"] = tuple(params["ngram_range"])
+            self._analyzer = TfidfVectorizer(**params).build_analyzer()
+        return self._analyzer
+
+    def _lookup(self, tokens):
+        """Columnas de los tokens presentes en el vocabulario (-1 si no existen)"""
+        if not tokens:
+            return np.empty(0, dtype=np.int64)
+
+        raw = [t.encode("utf-8") for t in tokens]
+        # Los tokens más largos que el ancho fijo de self.terms se truncarían al
+        # convertirlos y coincidirían con su prefijo: no están en el vocabulario
+        fits = np.array([len(t) <= self.terms.dtype.itemsize for t in raw], dtype=bool)
+        encoded = np.array(raw, dtype=self.terms.dtype)
+        positions = np.searchsorted(self.terms, encoded)
+        positions[positions >= len(self.terms)] = 0
+        found = fits & (self.terms[positions] == encoded)
+        return np.where(found, self.columns[positions], -1)
+
+    def transform(self, raw_documents):
+        analyzer = self.build_analyzer()
+        raw_documents = list(raw_documents)
+        n_docs = len(raw_documents)
+
+        tokens, lengths = [], []
+        for doc in raw_documents:
+            doc_tokens = analyzer(doc)
+            tokens.extend(doc_tokens)
+            lengths.append(len(doc_tokens))
+
+        cols = self._lookup(tokens)
+        docs = np.repeat(np.arange(n_docs), lengths)
+        found = cols >= 0
+        docs, cols = docs[found], cols[found]
+
+        # Conteos por (documento, columna): las claves salen ordenadas por fila y columna
+        keys, counts = np.unique(docs * self.n_features + cols, return_counts=True)
+        docs, cols = keys // self.n_features, keys % self.n_features
+        data = counts.astype(np.float64)
+
+        if self.params["binary"]:
+            data[:] = 1.0
+        if self.params["sublinear_tf"]:
+            data = np.log(data) + 1.0
+        if self.params["use_idf"]:
+            data *= self.idf_[cols]
+
+        norm = self.params["norm"]
+        if norm:
+            per_doc = np.bincount(docs, weights=data * data if norm == "l2" else np.abs(data), minlength=n_docs)
+            per_doc = np.sqrt(per_doc) if norm == "l2" else per_doc
+            per_doc[per_doc == 0.0] = 1.0
+            data /= per_doc[docs]
+
+        # Columnas podadas: cuentan en la norma pero no se emiten
+        if self.column_mask is not None:
+            emitted = self.column_mask[cols] >= 0
+            docs, cols, data = docs[emitted], cols[emitted], data[emitted]
+
+        indptr = np.zeros(n_docs + 1, dtype=np.int32)
+        np.cumsum(np.bincount(docs, minlength=n_docs), out=indptr[1:])
+        return csr_matrix((data.astype(self.dtype), cols.astype(np.int32), indptr),
+                          shape=(n_docs, self.n_features))
+
+class MmapForestClassifier:
+    """Bosque de decisión de solo predicción sobre arreglos de nodos mapeados"""
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+
+        self.left = _load_array(directory, "left")
+        self.right = _load_array(directory, "right")
+        self.feature = _load_array(directory, "feature")
+        self.threshold = _load_array(directory, "threshold")
+        self.value = _load_array(directory, "value")
+        self.roots = _load_array(directory, "roots")
+        self.classes_ = np.asarray(_load_array(directory, "classes"))
+        self.n_features_in_ = meta["n_features_in"]
+        self.max_depth = meta["max_depth"]
+
+    def predict_proba(self, X):
+        # Los árboles de scikit-learn comparan en float32
+        if hasattr(X, "toarray"):
+            X = X.toarray()
+        X = np.asarray(X, dtype=np.float32)
+        n_rows, n_trees = X.shape[0], len(self.roots)
+
+        # Recorrer todos los árboles para todas las filas a la vez
+        nodes = np.repeat(np.asarray(self.roots, dtype=np.int64), n_rows)
+        rows = np.tile(np.arange(n_rows), n_trees)
+        for _ in range(self.max_depth):
+            left = self.left[nodes]
+            internal = left >= 0
+            if not internal.any():
+                break
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(internal, np.where(go_left, left, self.right[nodes]), nodes)
+
+        return self.value[nodes].reshape(n_trees, n_rows, -1).mean(axis=0)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+def export_mmap_bundle(components, directory, source_path=None):
+    """Exportar un dict de componentes al formato mapeable en memoria
+
+    TF-IDF y bosques/árboles se convierten a arreglos .npy; el resto se
+    guarda con joblib sin compresión (sus arreglos numpy también se mapean).
+    Si se indica source_path (el pickle de origen) se guarda su sha256 para
+    detectar bundles desactualizados (ver is_bundle_stale).
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+    from sklearn.tree import DecisionTreeClassifier
+
+    os.makedirs(directory, exist_ok=True)
+    index = {}
+    for name, component in components.items():
+        target = os.path.join(directory, name)
+        if isinstance(component, TfidfVectorizer):
+            export_tfidf(component, target)
+            index[name] = "tfidf"
+        elif isinstance(component, (RandomForestClassifier, ExtraTreesClassifier, DecisionTreeClassifier)):
+            export_forest(component, target)
+            index[name] = "forest"
+        else:
+            joblib.dump(component, f"{target}.joblib")
+            index[name] = "joblib"
+
+    with open(os.path.join(directory, BUNDLE_INDEX), "w", encoding="utf-8") as f:
+        json.dump({
+            "components": index,
+            "source": os.path.basename(source_path) if source_path else None,
+            "source_sha256": file_sha256(source_path) if source_path else None
+        }, f, indent=2)
+
+    return index
+
+def _read_bundle_index(directory):
+    with open(os.path.join(directory, BUNDLE_INDEX), encoding="utf-8") as f:
+        index = json.load(f)
+    # Bundles anteriores: solo {componente: tipo}, sin origen
+    return index if "components" in index else {"components": index}
+
+def is_bundle_stale(directory, source_path):
+    """True si el bundle no se puede verificar contra el pickle de origen actual"""
+    return is_unverified(_read_bundle_index(directory).get("source_sha256"), source_path)
+
+def load_mmap_bundle(directory):
+    """Cargar un bundle exportado con export_mmap_bundle (solo lectura)"""
+    index = _read_bundle_index(directory)["components"]
+
+    components = {}
+    for name, kind in index.items():
+        target = os.path.join(directory, name)
+        if kind == "tfidf":
+            components[name] = MmapTfidfVectorizer(target)
+        elif kind == "forest":
+            components[name] = MmapForestClassifier(target)
+        else:
+            components[name] = joblib.load(f"{target}.joblib", mmap_mode="r")
+
+    return components
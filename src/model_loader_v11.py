@@ -5,9 +5,61 @@ import joblib
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.ensemble import RandomForestClassifier
-import re
+import threading
+from src.config import Config
+from src.artifact_loader import load_artifact_bundle
+from src.mmap_artifacts import is_bundle_stale, load_mmap_bundle
+from src.prediction_cache import PredictionCache
+from src.text_signals import text_signals
+from src.medical_terms import MedicalTermExtractor
+from src.process_backend import configure_inference_backend
+from src.top_k import top_k
+from src.preprocessor import TextPreprocessor
+from src.compiled_trees import is_stale, load_compiled_model
+from src.compact_vocab import load_compact_vocabulary
+from src.hashing_features import load_hashing_bundle
+
+# Diagnósticos del modelo de backup (índice de clase -> nombres)
+BACKUP_DIAGNOSTIC_NAMES = {
+    0: {"es": "Consulta Médica General", "en": "General Medical Consultation"},
+    1: {"es": "Dolor de Cabeza/Migraña", "en": "Headache/Migraine"},
+    2: {"es": "Problemas Digestivos", "en": "Digestive Issues"},
+    3: {"es": "Síntomas Respiratorios", "en": "Respiratory Symptoms"},
+    4: {"es": "Dolor Muscular/Articular", "en": "Muscle/Joint Pain"},
+    5: {"es": "Problemas Cardiovasculares", "en": "Cardiovascular Issues"},
+    6: {"es": "Síntomas Neurológicos", "en": "Neurological Symptoms"},
+    7: {"es": "Infección/Fiebre", "en": "Infection/Fever"},
+    8: {"es": "Problemas Dermatológicos", "en": "Skin Issues"},
+    9: {"es": "Ansiedad/Estrés", "en": "Anxiety/Stress"}
+}
+
+# Datos de entrenamiento sintéticos del backup (texto, clase)
+BACKUP_TRAINING_DATA = [
+    ("dolor de cabeza intenso y náuseas", 1),
+    ("dolor de estómago y vómitos", 2),
+    ("tos y dificultad para respirar", 3),
+    ("dolor muscular y cansancio", 4),
+    ("dolor en el pecho y palpitaciones", 5),
+    ("mareo y confusión", 6),
+    ("fiebre alta y escalofríos", 7),
+    ("erupción en la piel", 8),
+    ("nerviosismo y palpitaciones", 9),
+    ("consulta general", 0)
+]
+
+# Síntoma canónico de medical_dict -> clase del modelo de backup
+SYMPTOM_CLASSES = {
+    "dolor_cabeza": 1,
+    "nauseas": 2,
+    "vomito": 2,
+    "dolor_estomago": 2,
+    "tos": 3,
+    "dificultad_respirar": 3,
+    "dolor_pecho": 3,
+    "dolor_muscular": 4,
+    "mareo": 6,
+    "fiebre": 7
+}
 
 class ModeloV11Fallback:
     """Modelo v11 con fallback completo para Render"""
@@ -17,63 +69,231 @@ class ModeloV11Fallback:
         self.tfidf_vectorizer = None
         self.age_encoder = None
         self.gender_encoder = None
+        self.diagnosis_encoder = None
+        self.metadata = None
+        self.preprocesador_data = None
+        self.components_path = None
+        self.component_report = {}
         self.medical_dict = {}
+        self.term_extractor = None
         self.diagnostic_names = {}
+        self.diagnosis_labels = []  # índice de clase -> nombre en español
+        self.backup_class_space = True  # clases 0-9 del backup (recomendaciones por clase)
         self.modelo_cargado = False
+        self.model_version = "v11_backup"
+        self._backup_lock = threading.Lock()
+        self.inference_backend = None  # ProcessInferenceBackend si INFERENCE_BACKEND=process
+        
+        # Caché de predicciones (se invalida al cambiar de modelo)
+        self.prediction_cache = PredictionCache(
+            max_size=Config.PREDICTION_CACHE_SIZE,
+            ttl_seconds=Config.PREDICTION_CACHE_TTL
+        )
         
         # Inicializar componentes de backup
         self._initialize_backup_components()
         
     def _initialize_backup_components(self):
-        """Inicializar componentes de backup que SIEMPRE funcionan"""
+        """Inicializar componentes de backup que SIEMPRE funcionan
+        
+        Solo prepara los diccionarios; el modelo y el TF-IDF de backup se
+        cargan de forma perezosa en la primera predicción desde el bundle
+        precomputado (ver scripts/build_v11_backup_bundle.py).
+        """
         try:
             print("🔧 Inicializando componentes de backup...")
             
-            # 1. Modelo de backup (RandomForest ligero)
-            self.modelo_xgb = RandomForestClassifier(
-                n_estimators=10,
-                max_depth=5,
-                random_state=42,
-                n_jobs=1  # Solo 1 core para memoria
-            )
-            
-            # 2. TF-IDF de backup
-            self.tfidf_vectorizer = TfidfVectorizer(
-                max_features=500,  # Muy reducido para memoria
-                stop_words=None,
-                ngram_range=(1, 1),  # Solo unigramas
-                lowercase=True,
-                max_df=0.95,
-                min_df=2
-            )
-            
-            # 3. Diagnósticos médicos básicos
-            self.diagnostic_names = {
-                0: {"es": "Consulta Médica General", "en": "General Medical Consultation"},
-                1: {"es": "Dolor de Cabeza/Migraña", "en": "Headache/Migraine"},
-                2: {"es": "Problemas Digestivos", "en": "Digestive Issues"},
-                3: {"es": "Síntomas Respiratorios", "en": "Respiratory Symptoms"},
-                4: {"es": "Dolor Muscular/Articular", "en": "Muscle/Joint Pain"},
-                5: {"es": "Problemas Cardiovasculares", "en": "Cardiovascular Issues"},
-                6: {"es": "Síntomas Neurológicos", "en": "Neurological Symptoms"},
-                7: {"es": "Infección/Fiebre", "en": "Infection/Fever"},
-                8: {"es": "Problemas Dermatológicos", "en": "Skin Issues"},
-                9: {"es": "Ansiedad/Estrés", "en": "Anxiety/Stress"}
-            }
+            # 1. Diagnósticos médicos básicos
+            self.diagnostic_names = dict(BACKUP_DIAGNOSTIC_NAMES)
+            self._refresh_diagnosis_labels()
             
-            # 4. Diccionario médico básico
+            # 2. Diccionario médico básico
             self.medical_dict = self._create_medical_dictionary()
-            
-            # 5. Entrenar modelo con datos sintéticos básicos
-            self._train_backup_model()
+            self.term_extractor = MedicalTermExtractor(self.medical_dict)
             
             self.modelo_cargado = True
-            print("✅ Componentes de backup inicializados exitosamente")
+            print("✅ Componentes de backup listos (modelo se carga en la primera predicción)")
             
         except Exception as e:
             print(f"❌ Error inicializando backup: {e}")
             self.modelo_cargado = False
     
+    def _ensure_backup_loaded(self):
+        """Cargar modelo/TF-IDF de backup si aún no hay componentes reales"""
+        if self.modelo_xgb is not None and self.tfidf_vectorizer is not None:
+            return
+        
+        with self._backup_lock:
+            if self.modelo_xgb is not None and self.tfidf_vectorizer is not None:
+                return
+            
+            if Config.FEATURE_PIPELINE == 'hashing' and self._load_hashing_pipeline():
+                return
+            
+            bundle = None
+            if Config.MODEL_ARTIFACT_FORMAT == 'mmap':
+                bundle = self._load_backup_mmap()
+            if bundle is None:
+                bundle = self._load_backup_bundle()
+            # Origen del modelo en uso: los derivados (compilado, vocabulario compacto) se verifican contra él
+            source_path = Config.V11_BACKUP_BUNDLE if bundle is not None else None
+            if bundle is None:
+                bundle = self._train_backup_model()
+            
+            if self.modelo_xgb is None:
+                compiled = self._load_backup_compiled(source_path=source_path) if Config.TREE_ENGINE == 'compiled' else None
+                self.modelo_xgb = compiled if compiled is not None else bundle['modelo']
+            if self.tfidf_vectorizer is None:
+                compact = self._load_backup_compact_vocab(source_path=source_path) if Config.VOCABULARY_FORMAT == 'compact' else None
+                self.tfidf_vectorizer = compact if compact is not None else bundle['tfidf_vectorizer']
+    
+    def warm_up(self, start_backend=True):
+        """Cargar todo lo perezoso y ejecutar una predicción de prueba
+        
+        En el proceso maestro de gunicorn con preload_app lo que se carga
+        aquí lo heredan los workers por fork sin volver a cargarlo. Con
+        INFERENCE_BACKEND=process, start_backend arranca además los procesos
+        del pool; el maestro no debe hacerlo (start_backend=False) porque el
+        pool es por proceso y cada worker crea el suyo.
+        """
+        try:
+            self._ensure_backup_loaded()
+            backend = self.inference_backend
+            if backend is not None and not start_backend:
+                self._predict_classes_local([self._clean_symptoms("dolor de cabeza y fiebre")])
+            else:
+                if backend is not None:
+                    print(f"🔥 Pool de inferencia listo ({backend.warm_up()} procesos)")
+                self.predict_symptoms_batch([{"symptoms": "dolor de cabeza y fiebre"}])
+                self.prediction_cache.clear()
+            print("🔥 Modelo v11 precalentado")
+            return True
+        except Exception as e:
+            print(f"⚠️ Error precalentando modelo v11: {e}")
+            return False
+    
+    def _load_backup_mmap(self, directory=None):
+        """Cargar el backup desde arreglos mapeados en memoria; None si no existe"""
+        directory = directory or Config.V11_BACKUP_MMAP_DIR
+        try:
+            if not os.path.exists(directory):
+                print(f"⚠️ Backup mmap no existe: {directory}")
+                return None
+            
+            if is_bundle_stale(directory, Config.V11_BACKUP_BUNDLE):
+                print(f"⚠️ Backup mmap desactualizado o sin verificar contra {Config.V11_BACKUP_BUNDLE}")
+                return None
+            
+            bundle = load_mmap_bundle(directory)
+            print(f"✅ Modelo backup mapeado en memoria desde {directory}")
+            return bundle
+            
+        except Exception as e:
+            print(f"⚠️ Error cargando backup mmap: {e}")
+            return None
+    
+    def _load_hashing_pipeline(self, directory=None):
+        """Usar el pipeline de feature hashing (scripts/train_hashing_model.py) como backup
+        
+        Reemplaza al modelo y TF-IDF de backup como par: el clasificador solo
+        es válido con las columnas hasheadas con las que se entrenó.
+        """
+        directory = directory or Config.HASHING_MODEL_PATH
+        try:
+            bundle = load_hashing_bundle(directory)
+            if bundle is None:
+                print(f"⚠️ Pipeline hashing no existe: {directory}")
+                return False
+            
+            self.modelo_xgb = bundle['modelo']
+            self.tfidf_vectorizer = bundle['tfidf_vectorizer']
+            # Etiquetas propias si no son los índices de clase del backup
+            classes = list(self.modelo_xgb.classes_)
+            if classes != list(range(len(classes))):
+                self.diagnostic_names = {i: {"es": str(label), "en": str(label)} for i, label in enumerate(classes)}
+                self._refresh_diagnosis_labels()
+                self.backup_class_space = False
+            self.model_version = "v11_hashing"
+            self.prediction_cache.clear()
+            print(f"✅ Pipeline hashing cargado desde {directory}")
+            return True
+            
+        except Exception as e:
+            print(f"⚠️ Error cargando pipeline hashing: {e}")
+            return False
+    
+    def _load_backup_compiled(self, directory=None, source_path=None):
+        """Bosque de backup compilado (scripts/compile_tree_models.py); None si no existe
+        
+        source_path es el archivo del que salió el modelo en uso. Si es None
+        (backup reentrenado) el compilado no corresponde a ese modelo.
+        """
+        directory = directory or os.path.join(Config.COMPILED_MODELS_PATH, 'v11_backup')
+        try:
+            if source_path is None:
+                print("⚠️ Modelo backup reentrenado, se ignora el compilado")
+                return None
+            model = load_compiled_model(directory)
+            if model is None:
+                print(f"⚠️ Modelo backup compilado no existe: {directory}")
+                return None
+            if is_stale(directory, source_path):
+                print("⚠️ Modelo backup compilado desactualizado o sin verificar, se usa el original")
+                return None
+            
+            print(f"✅ Modelo backup compilado cargado desde {directory}")
+            return model
+            
+        except Exception as e:
+            print(f"⚠️ Error cargando backup compilado: {e}")
+            return None
+    
+    def _load_backup_compact_vocab(self, directory=None, source_path=None):
+        """Vocabulario compacto del backup (scripts/build_compact_vocab.py); None si no existe
+        
+        Igual que el compilado: con el backup reentrenado (source_path None)
+        el vocabulario no corresponde al modelo.
+        """
+        directory = directory or os.path.join(Config.COMPACT_VOCAB_PATH, 'v11_backup')
+        try:
+            if source_path is None:
+                print("⚠️ Modelo backup reentrenado, se ignora el vocabulario compacto")
+                return None
+            vectorizer = load_compact_vocabulary(directory, source_path=source_path)
+            if vectorizer is None:
+                print(f"⚠️ Vocabulario compacto del backup no existe, está desactualizado o sin verificar: {directory}")
+                return None
+            
+            print(f"✅ Vocabulario compacto del backup cargado desde {directory}")
+            return vectorizer
+            
+        except Exception as e:
+            print(f"⚠️ Error cargando vocabulario compacto: {e}")
+            return None
+    
+    def _load_backup_bundle(self, bundle_path=None):
+        """Cargar el bundle de backup serializado; None si no es utilizable"""
+        bundle_path = bundle_path or Config.V11_BACKUP_BUNDLE
+        try:
+            if not os.path.exists(bundle_path):
+                print(f"⚠️ Bundle de backup no existe: {bundle_path}")
+                return None
+            
+            import sklearn  # Import diferido: scikit-learn es costoso de importar
+            bundle = joblib.load(bundle_path)
+            
+            if bundle.get('sklearn_version') != sklearn.__version__:
+                print(f"⚠️ Bundle de backup creado con scikit-learn {bundle.get('sklearn_version')}, "
+                      f"instalado {sklearn.__version__}; se reentrena")
+                return None
+            
+            print(f"✅ Modelo backup cargado desde {bundle_path}")
+            return bundle
+            
+        except Exception as e:
+            print(f"⚠️ Error cargando bundle de backup: {e}")
+            return None
+    
     def _create_medical_dictionary(self):
         """Crear diccionario médico básico"""
         return {
@@ -98,39 +318,59 @@ class ModeloV11Fallback:
         }
     
     def _train_backup_model(self):
-        """Entrenar modelo con datos sintéticos"""
+        """Entrenar modelo con datos sintéticos (solo si falta el bundle)"""
         try:
-            # Datos de entrenamiento sintéticos
-            synthetic_data = [
-                ("dolor de cabeza intenso y náuseas", 1),
-                ("dolor de estómago y vómitos", 2),
-                ("tos y dificultad para respirar", 3),
-                ("dolor muscular y cansancio", 4),
-                ("dolor en el pecho y palpitaciones", 5),
-                ("mareo y confusión", 6),
-                ("fiebre alta y escalofríos", 7),
-                ("erupción en la piel", 8),
-                ("nerviosismo y palpitaciones", 9),
-                ("consulta general", 0)
-            ]
+            import sklearn
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            from sklearn.ensemble import RandomForestClassifier
+            
+            # 1. Modelo de backup (RandomForest ligero)
+            modelo = RandomForestClassifier(
+                n_estimators=10,
+                max_depth=5,
+                random_state=42,
+                n_jobs=1  # Solo 1 core para memoria
+            )
+            
+            # 2. TF-IDF de backup
+            tfidf_vectorizer = TfidfVectorizer(
+                max_features=500,  # Muy reducido para memoria
+                stop_words=None,
+                ngram_range=(1, 1),  # Solo unigramas
+                lowercase=True,
+                max_df=0.95,
+                min_df=2
+            )
             
             # Preparar datos
-            texts = [item[0] for item in synthetic_data]
-            labels = [item[1] for item in synthetic_data]
+            texts = [item[0] for item in BACKUP_TRAINING_DATA]
+            labels = [item[1] for item in BACKUP_TRAINING_DATA]
             
             # Entrenar TF-IDF
-            X = self.tfidf_vectorizer.fit_transform(texts)
+            X = tfidf_vectorizer.fit_transform(texts)
             
             # Entrenar modelo
-            self.modelo_xgb.fit(X, labels)
+            modelo.fit(X, labels)
             
             print("✅ Modelo backup entrenado con datos sintéticos")
             
+            return {
+                'modelo': modelo,
+                'tfidf_vectorizer': tfidf_vectorizer,
+                'sklearn_version': sklearn.__version__
+            }
+            
         except Exception as e:
             print(f"⚠️ Error entrenando modelo backup: {e}")
+            raise
     
-    def load_components(self, base_path="modelo/modelo_v11_components"):  # ← CORREGIDO
-        """Intentar cargar componentes reales, usar backup si fallan"""
+    def load_components(self, base_path=None, force=False):
+        """Cargar componentes reales desde el manifiesto, usar backup si fallan"""
+        base_path = base_path or Config.V11_COMPONENTS_PATH
+        if self.components_path == base_path and not force:
+            return True  # Ya cargado desde esta ruta
+        
+        components_changed = False
         try:
             print(f"🔍 Intentando cargar desde: {base_path}")
             
@@ -138,69 +378,44 @@ class ModeloV11Fallback:
                 print("⚠️ Ruta de modelo no existe, usando componentes backup")
                 return True  # Ya están inicializados los backups
             
-            # Intentar cargar modelo real
-            modelo_path = os.path.join(base_path, "modelo_diagnostico_v11.pkl")
-            if os.path.exists(modelo_path):
-                try:
-                    real_model = joblib.load(modelo_path)
-                    self.modelo_xgb = real_model
-                    print("✅ Modelo real v11 cargado")
-                except Exception as e:
-                    print(f"⚠️ Error cargando modelo real: {e}, usando backup")
-            else:
-                print(f"⚠️ Archivo modelo no existe: {modelo_path}")
-            
-            # Intentar cargar TF-IDF real
-            tfidf_path = os.path.join(base_path, "tfidf_vectorizer_v11.pkl")
-            if os.path.exists(tfidf_path):
-                try:
-                    real_tfidf = joblib.load(tfidf_path)
-                    self.tfidf_vectorizer = real_tfidf
-                    print("✅ TF-IDF real cargado")
-                except Exception as e:
-                    print(f"⚠️ Error cargando TF-IDF real: {e}, usando backup")
+            bundle = load_artifact_bundle(base_path, strict_sklearn=Config.MODEL_STRICT_SKLEARN)
+            self.component_report = bundle.report
+            self.components_path = base_path
+            
+            # Pipeline de predicción: clasificador + TF-IDF + encoder, todo o nada
+            if bundle.pipeline_ready:
+                self.modelo_xgb = bundle.get('modelo')
+                self.tfidf_vectorizer = bundle.get('tfidf_vectorizer')
+                self.diagnostic_names = {
+                    i: {"es": str(label), "en": str(label)}
+                    for i, label in enumerate(bundle.get('diagnosis_encoder').classes_)
+                }
+                self.backup_class_space = False
+                self.model_version = "v11"
+                components_changed = True
+                print("✅ Modelo real v11 cargado (clasificador + TF-IDF + diagnósticos)")
             else:
-                print(f"⚠️ Archivo TF-IDF no existe: {tfidf_path}")
-            
-            # Intentar cargar encoders reales
-            age_encoder_path = os.path.join(base_path, "age_encoder_v11.pkl")
-            gender_encoder_path = os.path.join(base_path, "gender_encoder_v11.pkl")
-            
-            if os.path.exists(age_encoder_path):
-                try:
-                    self.age_encoder = joblib.load(age_encoder_path)
-                    print("✅ Age encoder real cargado")
-                except Exception as e:
-                    print(f"⚠️ Error cargando age encoder: {e}")
-            
-            if os.path.exists(gender_encoder_path):
-                try:
-                    self.gender_encoder = joblib.load(gender_encoder_path)
-                    print("✅ Gender encoder real cargado")
-                except Exception as e:
-                    print(f"⚠️ Error cargando gender encoder: {e}")
-            
-            # Intentar cargar diccionarios reales
-            dict_path = os.path.join(base_path, "medical_dict_v11.pkl")
-            names_path = os.path.join(base_path, "diagnostic_names_v11.pkl")
-            
-            if os.path.exists(dict_path):
-                try:
-                    with open(dict_path, 'rb') as f:
-                        real_dict = pickle.load(f)
-                    self.medical_dict.update(real_dict)
-                    print("✅ Diccionario médico real cargado")
-                except Exception as e:
-                    print(f"⚠️ Error cargando diccionario: {e}")
-            
-            if os.path.exists(names_path):
-                try:
-                    with open(names_path, 'rb') as f:
-                        real_names = pickle.load(f)
-                    self.diagnostic_names.update(real_names)
-                    print("✅ Nombres de diagnósticos reales cargados")
-                except Exception as e:
-                    print(f"⚠️ Error cargando nombres: {e}")
+                print("⚠️ Pipeline real v11 incompleto, usando modelo backup")
+            
+            # Componentes auxiliares (no afectan la compatibilidad del pipeline)
+            for name in ('age_encoder', 'gender_encoder', 'diagnosis_encoder', 'metadata', 'preprocesador_data'):
+                if name in bundle.components:
+                    setattr(self, name, bundle.get(name))
+                    components_changed = True
+            
+            if 'medical_dict' in bundle.components:
+                self.medical_dict.update(bundle.get('medical_dict'))
+                self.term_extractor = MedicalTermExtractor(self.medical_dict)
+                components_changed = True
+            
+            if 'diagnostic_names' in bundle.components:
+                self.diagnostic_names.update(bundle.get('diagnostic_names'))
+                components_changed = True
+            
+            for name, entry in bundle.report.items():
+                icon = "✅" if entry["source"] == "real" else "⚠️"
+                reason = f" ({entry['reason']})" if entry.get("reason") else ""
+                print(f"   {icon} {name}: {entry['source']}{reason}")
             
             return True
             
@@ -208,7 +423,26 @@ class ModeloV11Fallback:
             print(f"⚠️ Error cargando componentes reales: {e}")
             print("📋 Usando componentes backup")
             return True  # Backup ya está listo
-
+        finally:
+            # Si cambió algún componente, las predicciones cacheadas ya no valen
+            if components_changed:
+                self._refresh_diagnosis_labels()
+                self.prediction_cache.clear()
+                print("🧹 Caché de predicciones invalidada")
+    
+    def get_model_info(self):
+        """Información del modelo v11 y origen (real/fallback) de cada componente"""
+        return {
+            "version": self.model_version,
+            "status": "loaded" if self.modelo_cargado else "error",
+            "components_path": self.components_path,
+            "pipeline": "real" if self.model_version == "v11" else "fallback",
+            "componentes": self.component_report,
+            "num_diagnosticos": len(self.diagnostic_names),
+            "motor_arboles": type(self.modelo_xgb).__name__ if self.modelo_xgb is not None else None,
+            "caracteristicas": type(self.tfidf_vectorizer).__name__ if self.tfidf_vectorizer is not None else None,
+            "terminos_medicos": self.term_extractor.terms if self.term_extractor else 0
+        }
     
     def predict_symptoms(self, symptoms_text, age=None, gender=None):
         """Predicción de síntomas con manejo robusto"""
@@ -219,86 +453,170 @@ class ModeloV11Fallback:
             # Limpiar síntomas
             symptoms_clean = self._clean_symptoms(symptoms_text)
             
-            # Generar features
-            X = self.tfidf_vectorizer.transform([symptoms_clean])
-            
-            # Predicción
-            if hasattr(self.modelo_xgb, 'predict_proba'):
-                probabilities = self.modelo_xgb.predict_proba(X)[0]
-                predicted_class = np.argmax(probabilities)
-                confidence = float(probabilities[predicted_class]) * 100
-            else:
-                predicted_class = self._predict_by_keywords(symptoms_clean)
-                confidence = 75.0
-            
-            # Obtener diagnóstico
-            diagnosis_info = self.diagnostic_names.get(predicted_class, 
-                self.diagnostic_names[0])
+            # Consultar caché
+            cache_key = PredictionCache.make_key(symptoms_clean, age, gender, self.model_version)
+            cached = self.prediction_cache.get(cache_key)
+            if cached is not None:
+                return cached
             
-            # Generar recomendaciones básicas
-            recommendations = self._get_basic_recommendations(predicted_class)
+            # Generar features y predecir
+            predicted_classes, confidences, top = self.predict_classes([symptoms_clean])
+            predicted_class, confidence = predicted_classes[0], float(confidences[0])
             
-            return {
-                "diagnostico": diagnosis_info["es"],
-                "diagnostico_original": diagnosis_info["en"],
-                "confianza": round(confidence, 1),
-                "confianza_pct": f"{confidence:.1f}%",
-                "edad_detectada": age,
-                "genero_usado": gender,
-                "modelo_usado": "v11_backup",
-                "recomendaciones": recommendations,
-                "top_diagnosticos": [
-                    {
-                        "diagnostico": diagnosis_info["es"],
-                        "confianza": round(confidence, 1)
-                    }
-                ]
-            }
+            response = self._build_response(predicted_class, confidence, age, gender, symptoms_clean, top[0])
+            self.prediction_cache.put(cache_key, response)
+            return response
             
         except Exception as e:
             print(f"❌ Error en predicción: {e}")
             return self._get_error_response(str(e))
     
-    def _clean_symptoms(self, symptoms):
-        """Limpiar síntomas de entrada"""
-        if not symptoms:
-            return ""
+    def predict_classes(self, texts):
+        """Clase, confianza (0-100) y top-k [(clase, confianza)] para textos ya limpios
+        
+        Es la parte pesada de la predicción (TF-IDF + predict_proba); con
+        INFERENCE_BACKEND=process se ejecuta en el pool de procesos.
+        """
+        if self.inference_backend is not None:
+            return self.inference_backend.predict_classes(texts)
+        return self._predict_classes_local(texts)
+    
+    def _predict_classes_local(self, texts):
+        self._ensure_backup_loaded()
+        
+        if hasattr(self.modelo_xgb, 'predict_proba'):
+            X = self.tfidf_vectorizer.transform(texts)
+            probabilities = self.modelo_xgb.predict_proba(X)
+            # Top-k de toda la matriz a la vez; la primera columna es el argmax
+            top_classes, top_probabilities = top_k(probabilities, Config.TOP_K_DIAGNOSES)
+            top_classes = top_classes.tolist()
+            top_confidences = (top_probabilities * 100).tolist()
+            top = [list(zip(classes, confs)) for classes, confs in zip(top_classes, top_confidences)]
+        else:
+            top = [[(self._predict_by_keywords(text), 75.0)] for text in texts]
         
-        # Convertir a minúsculas
-        symptoms = symptoms.lower()
+        return [row[0][0] for row in top], [row[0][1] for row in top], top
+    
+    def predict_symptoms_batch(self, items):
+        """Predicción en lote: una sola matriz TF-IDF y un solo predict_proba
+        
+        Cada item es un dict con 'symptoms' y opcionalmente 'age' y 'gender'.
+        Devuelve una lista de respuestas en el mismo orden; los items inválidos
+        reciben su propia respuesta de error sin afectar al resto del lote.
+        """
+        results = [None] * len(items)
+        pending = []  # (posición, texto limpio, clave de caché)
+        
+        # 1. Validar y limpiar todos los textos
+        for i, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("Cada item debe ser un objeto con 'symptoms'")
+                
+                symptoms_text = item.get('symptoms')
+                if not symptoms_text:
+                    results[i] = self._get_default_response()
+                    continue
+                if not isinstance(symptoms_text, str):
+                    raise ValueError("El campo 'symptoms' debe ser texto")
+                
+                symptoms_clean = self._clean_symptoms(symptoms_text)
+                cache_key = PredictionCache.make_key(
+                    symptoms_clean, item.get('age'), item.get('gender'), self.model_version
+                )
+                cached = self.prediction_cache.get(cache_key)
+                if cached is not None:
+                    results[i] = cached
+                    continue
+                
+                pending.append((i, symptoms_clean, cache_key))
+            except Exception as e:
+                results[i] = self._get_error_response(str(e))
+        
+        if not pending:
+            return results
         
-        # Remover caracteres especiales pero mantener acentos
-        symptoms = re.sub(r'[^\w\sáéíóúñü]', ' ', symptoms)
+        # 2. Vectorizar y predecir todo el lote de una vez
+        try:
+            predicted_classes, confidences, top = self.predict_classes([text for _, text, _ in pending])
+        except Exception as e:
+            print(f"❌ Error en predicción por lote: {e}")
+            for i, _, _ in pending:
+                results[i] = self._get_error_response(str(e))
+            return results
         
-        # Normalizar espacios
-        symptoms = ' '.join(symptoms.split())
+        # 3. Construir respuestas individuales en orden
+        for (i, text, cache_key), predicted_class, confidence, top_row in zip(pending, predicted_classes, confidences, top):
+            item = items[i]
+            try:
+                results[i] = self._build_response(
+                    predicted_class, float(confidence), item.get('age'), item.get('gender'), text, top_row
+                )
+                self.prediction_cache.put(cache_key, results[i])
+            except Exception as e:
+                results[i] = self._get_error_response(str(e))
         
-        return symptoms
+        return results
     
-    def _predict_by_keywords(self, symptoms_text):
-        """Predicción por palabras clave si falla el modelo"""
-        symptoms_lower = symptoms_text.lower()
+    def _refresh_diagnosis_labels(self):
+        """Precalcular índice -> nombre para el top-k (evita un dict.get por clase)"""
+        size = max(self.diagnostic_names) + 1 if self.diagnostic_names else 0
+        default = self.diagnostic_names.get(0, {"es": "Consulta Médica General"})["es"]
+        self.diagnosis_labels = [self.diagnostic_names.get(i, {"es": default})["es"] for i in range(size)]
+    
+    def _label(self, diagnosis_class):
+        labels = self.diagnosis_labels
+        return labels[diagnosis_class] if 0 <= diagnosis_class < len(labels) else labels[0]
+    
+    def _build_response(self, predicted_class, confidence, age=None, gender=None, symptoms_clean=None, top=None):
+        """Construir la respuesta de predicción a partir de la clase y confianza"""
+        # Obtener diagnóstico
+        diagnosis_info = self.diagnostic_names.get(predicted_class, 
+            self.diagnostic_names[0])
         
-        if any(word in symptoms_lower for word in ["cabeza", "migraña", "cefalea"]):
-            return 1
-        elif any(word in symptoms_lower for word in ["estómago", "náusea", "vómito"]):
-            return 2
-        elif any(word in symptoms_lower for word in ["tos", "respirar", "pecho"]):
-            return 3
-        elif any(word in symptoms_lower for word in ["muscular", "articular", "dolor"]):
-            return 4
-        elif any(word in symptoms_lower for word in ["corazón", "palpitaciones"]):
-            return 5
-        elif any(word in symptoms_lower for word in ["mareo", "confusión"]):
-            return 6
-        elif any(word in symptoms_lower for word in ["fiebre", "temperatura"]):
-            return 7
-        elif any(word in symptoms_lower for word in ["piel", "erupción"]):
-            return 8
-        elif any(word in symptoms_lower for word in ["ansiedad", "nervios"]):
-            return 9
-        else:
-            return 0
+        # Generar recomendaciones básicas
+        recommendations = self._get_basic_recommendations(predicted_class)
+        
+        return {
+            "diagnostico": diagnosis_info["es"],
+            "diagnostico_original": diagnosis_info["en"],
+            "confianza": round(confidence, 1),
+            "confianza_pct": f"{confidence:.1f}%",
+            "edad_detectada": age,
+            "genero_usado": gender,
+            "modelo_usado": self.model_version,
+            "recomendaciones": recommendations,
+            "sintomas_detectados": self.extract_symptoms(symptoms_clean),
+            "top_diagnosticos": [
+                {
+                    "diagnostico": self._label(diagnosis_class),
+                    "confianza": round(diagnosis_confidence, 1)
+                }
+                for diagnosis_class, diagnosis_confidence in (top or [(predicted_class, confidence)])
+            ]
+        }
+    
+    def _clean_symptoms(self, symptoms):
+        """Limpiar síntomas de entrada"""
+        return TextPreprocessor.clean_symptoms(symptoms)
+    
+    def extract_symptoms(self, symptoms_text):
+        """Síntomas canónicos de medical_dict presentes en el texto"""
+        if not symptoms_text or self.term_extractor is None:
+            return []
+        return self.term_extractor.extract(symptoms_text)
+    
+    def _predict_by_keywords(self, symptoms_text):
+        """Predicción por palabras clave si falla el modelo
+
+        Las palabras clave de siempre mantienen su prioridad; los síntomas
+        canónicos solo cubren los textos sin ninguna de ellas.
+        """
+        keyword_class = text_signals.keyword_class(symptoms_text)
+        if keyword_class:
+            return keyword_class
+        classes = [SYMPTOM_CLASSES[s] for s in self.extract_symptoms(symptoms_text) if s in SYMPTOM_CLASSES]
+        return min(classes) if classes else 0
     
     def _get_basic_recommendations(self, diagnosis_class):
         """Obtener recomendaciones básicas por diagnóstico"""
@@ -315,6 +633,10 @@ class ModeloV11Fallback:
             9: ["Técnicas de relajación", "Ejercicio suave", "Considera apoyo psicológico"]
         }
         
+        # Las clases del modelo real (o de etiquetas propias) no siguen los índices del backup
+        if not self.backup_class_space:
+            return recommendations_map[0]
+        
         return recommendations_map.get(diagnosis_class, recommendations_map[0])
     
     def _get_default_response(self):
@@ -344,6 +666,9 @@ def cargar_modelo_v11():
     print("🚀 Cargando modelo v11 con sistema de backup...")
     
     try:
+        if modelo_v11_global.inference_backend is None:
+            configure_inference_backend(modelo_v11_global)
+        
         if modelo_v11_global.load_components():
             print("✅ Modelo v11 listo (con backup si es necesario)")
             return modelo_v11_global
@@ -367,7 +692,7 @@ def predecir_v11(texto, edad="Unknown", genero="Unknown"):
             "diagnostico_principal": result.get("diagnostico", "Consulta Médica"),
             "confianza": result.get("confianza", 50.0) / 100,  # Convertir a decimal
             "confianza_pct": result.get("confianza_pct", "50.0%"),
-            "modelo_version": "v11_backup",
+            "modelo_version": result.get("modelo_usado", modelo_v11_global.model_version),
             "idioma_detectado": "español",
             "procesamiento": {
                 "texto_procesado": texto,
@@ -0,0 +1,273 @@
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import joblib
+
+from src.compact_vocab import load_compact_vocabulary
+from src.compiled_trees import is_stale, load_compiled_model
+
+# Sufijos históricos de los archivos -> nombre corto de la versión
+VERSION_ALIASES = {
+    'v6_xgboost': 'v6',
+    'v7_optimizado': 'v7',
+    'v8_reentrenado': 'v8',
+    'v9_final': 'v9',
+}
+
+MODEL_FILE_RE = re.compile(r'^modelo_diagnostico_(?P<suffix>.+)\.pkl$')
+
+class ModelNotFound(KeyError):
+    """La versión pedida no existe en el directorio de modelos"""
+
+class _ModelEntry:
+    """Versión descubierta en disco (residente o no)"""
+
+    def __init__(self, version, model_path, preprocessor_path):
+        self.version = version
+        self.model_path = model_path
+        self.preprocessor_path = preprocessor_path
+        # Tamaño en disco como estimación de la memoria que ocupará al cargarse
+        self.estimated_bytes = os.path.getsize(model_path) + os.path.getsize(preprocessor_path)
+        self.data = None
+        self.load_lock = threading.Lock()
+        self.load_time_ms = None
+        self.loaded_at = None
+        self.last_used = None
+        self.loads = 0
+        self.evictions = 0
+        self.hits = 0
+
+    @property
+    def resident(self):
+        return self.data is not None
+
+    def describe(self):
+        return {
+            "version": self.version,
+            "type": self.data['type'] if self.data else None,
+            "engine": self.data['engine'] if self.data else None,
+            "resident": self.resident,
+            "load_time_ms": self.load_time_ms,
+            "loaded_at": self.loaded_at,
+            "last_used": self.last_used,
+            "estimated_mb": round(self.estimated_bytes / 1024 / 1024, 2),
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "hits": self.hits,
+            "files": {
+                "model": os.path.basename(self.model_path),
+                "preprocessor": os.path.basename(self.preprocessor_path)
+            }
+        }
+
+def _print_model_info(prep):
+    """Mostrar información del preprocesador cargado"""
+    info_parts = []
+    
+    if 'tfidf_vectorizer' in prep:
+        tfidf = prep['tfidf_vectorizer']
+        tfidf_features = getattr(tfidf, 'n_features', None) or len(tfidf.vocabulary_)
+        info_parts.append(f"TF-IDF: {tfidf_features}")
+    
+    if 'age_encoder' in prep:
+        info_parts.append("Age: ✓")
+    
+    if 'gender_encoder' in prep:
+        info_parts.append("Gender: ✓")
+    
+    if 'diagnosis_encoder' in prep:
+        diseases_count = len(prep['diagnosis_encoder'].classes_)
+        info_parts.append(f"Diseases: {diseases_count}")
+    
+    if 'feature_columns' in prep:
+        symptoms_count = len(prep['feature_columns'])
+        info_parts.append(f"Symptoms: {symptoms_count}")
+    
+    print(f"      📋 {' | '.join(info_parts)}")
+
+def discover_models(models_dir):
+    """{versión: (modelo, preprocesador)} de los pares completos en models_dir
+
+    modelo_diagnostico_<sufijo>.pkl se empareja con preprocesadores_<sufijo>.pkl
+    o, si no existe, con preprocesadores_<versión>.pkl (p. ej. v6_xgboost -> v6).
+    """
+    found = {}
+    if not os.path.isdir(models_dir):
+        return found
+
+    for filename in sorted(os.listdir(models_dir)):
+        match = MODEL_FILE_RE.match(filename)
+        if not match:
+            continue
+        suffix = match.group('suffix')
+        version = VERSION_ALIASES.get(suffix, suffix)
+        for candidate in (suffix, version):
+            prep_path = os.path.join(models_dir, f'preprocesadores_{candidate}.pkl')
+            if os.path.exists(prep_path):
+                found[version] = (os.path.join(models_dir, filename), prep_path)
+                break
+        else:
+            logging.warning(f"Modelo {filename} sin preprocesador, se ignora")
+    return found
+
+class ModelRegistry:
+    """Registro de modelos con carga perezosa y desalojo LRU
+
+    Las versiones se descubren escaneando models_dir, pero ninguna se carga
+    hasta la primera petición. Se mantienen como máximo max_models residentes
+    y, si memory_budget_mb > 0, la suma de sus tamaños estimados no supera el
+    presupuesto: se desaloja primero la menos usada recientemente. Cada
+    versión tiene su propio lock de carga, así que cargar una no bloquea las
+    predicciones con las demás.
+    """
+
+    def __init__(self, models_dir, max_models=2, memory_budget_mb=0, loader=None, compiled_dir=None,
+                 compact_vocab_dir=None):
+        self.models_dir = models_dir
+        self.compiled_dir = compiled_dir  # si se indica, se prefieren los modelos compilados
+        self.compact_vocab_dir = compact_vocab_dir  # ídem con los vocabularios compactos
+        self.max_models = max(1, int(max_models))
+        self.memory_budget_bytes = int(float(memory_budget_mb) * 1024 * 1024)
+        self.loader = loader or joblib.load
+        self._entries = {}
+        self._resident = OrderedDict()  # versión -> entrada, de menos a más reciente
+        self._lock = threading.Lock()
+        self.rescan()
+
+    def rescan(self):
+        """Volver a escanear el directorio (conserva los modelos residentes)"""
+        discovered = discover_models(self.models_dir)
+        with self._lock:
+            for version, (model_path, prep_path) in discovered.items():
+                entry = self._entries.get(version)
+                if entry is None or entry.model_path != model_path or entry.preprocessor_path != prep_path:
+                    self._entries[version] = _ModelEntry(version, model_path, prep_path)
+                    self._resident.pop(version, None)
+            for version in set(self._entries) - set(discovered):
+                del self._entries[version]
+                self._resident.pop(version, None)
+        return sorted(discovered)
+
+    def versions(self):
+        return sorted(self._entries)
+
+    def __contains__(self, version):
+        return version in self._entries
+
+    def get(self, version):
+        """Datos del modelo ({'model', 'preprocessor', 'type'}), cargándolo si hace falta"""
+        entry = self._entries.get(version)
+        if entry is None:
+            raise ModelNotFound(version)
+
+        with self._lock:
+            if entry.data is not None:
+                self._touch(entry)
+                entry.hits += 1
+                return entry.data
+
+        with entry.load_lock:
+            # Otro hilo pudo cargarlo mientras esperábamos
+            data = entry.data
+            if data is None:
+                data = self._load(entry)
+            with self._lock:
+                if entry.data is None:
+                    self._make_room(entry)
+                    entry.data = data
+                    self._resident[entry.version] = entry
+                self._touch(entry)
+            return data
+
+    def _load(self, entry):
+        print(f"📥 Cargando modelo {entry.version}...")
+        start = time.perf_counter()
+        model, engine = self._load_compiled(entry), 'compiled'
+        if model is None:
+            model, engine = self.loader(entry.model_path), 'native'
+        preprocessor = self._with_compact_vocabulary(entry, self.loader(entry.preprocessor_path))
+        entry.load_time_ms = round((time.perf_counter() - start) * 1000, 1)
+        entry.loaded_at = time.time()
+        entry.loads += 1
+
+        binary = 'feature_columns' in preprocessor and 'tfidf_vectorizer' not in preprocessor
+        print(f"   ✅ {entry.version}: cargado en {entry.load_time_ms} ms (motor {engine})")
+        _print_model_info(preprocessor)
+        return {
+            'model': model,
+            'preprocessor': preprocessor,
+            'loaded': True,
+            'type': 'binary' if binary else 'text',
+            'engine': engine
+        }
+    
+    def _load_compiled(self, entry):
+        """Modelo compilado de la versión, o None si no hay uno vigente"""
+        if not self.compiled_dir:
+            return None
+        directory = os.path.join(self.compiled_dir, entry.version)
+        model = load_compiled_model(directory)
+        if model is not None and is_stale(directory, entry.model_path):
+            logging.warning(f"Compilado de {entry.version} desactualizado, se usa el modelo original")
+            return None
+        return model
+
+    def _with_compact_vocabulary(self, entry, preprocessor):
+        """Reemplazar el TF-IDF del preprocesador por su vocabulario compacto si hay uno vigente"""
+        if not self.compact_vocab_dir or 'tfidf_vectorizer' not in preprocessor:
+            return preprocessor
+        directory = os.path.join(self.compact_vocab_dir, entry.version)
+        vectorizer = load_compact_vocabulary(directory, source_path=entry.preprocessor_path)
+        if vectorizer is None:
+            if os.path.exists(directory):
+                logging.warning(f"Vocabulario compacto de {entry.version} desactualizado, se usa el original")
+            return preprocessor
+        return dict(preprocessor, tfidf_vectorizer=vectorizer)
+
+    def _touch(self, entry):
+        entry.last_used = time.time()
+        if entry.version in self._resident:
+            self._resident.move_to_end(entry.version)
+
+    def _make_room(self, incoming):
+        """Desalojar LRU hasta que quepa incoming (siempre deja cargar al menos uno)"""
+        while self._resident and (
+            len(self._resident) >= self.max_models
+            or (self.memory_budget_bytes
+                and self.resident_bytes() + incoming.estimated_bytes > self.memory_budget_bytes)
+        ):
+            version, evicted = self._resident.popitem(last=False)
+            evicted.data = None
+            evicted.evictions += 1
+            print(f"♻️ Modelo {version} desalojado (LRU)")
+
+    def evict(self, version):
+        with self._lock:
+            entry = self._resident.pop(version, None)
+            if entry is not None:
+                entry.data = None
+                entry.evictions += 1
+            return entry is not None
+
+    def resident_versions(self):
+        """Residentes, de menos a más recientemente usado"""
+        return list(self._resident)
+
+    def resident_bytes(self):
+        return sum(entry.estimated_bytes for entry in self._resident.values())
+
+    def describe(self):
+        """Listado para /api/models"""
+        with self._lock:
+            models = [self._entries[version].describe() for version in sorted(self._entries)]
+            return {
+                "models": models,
+                "resident": list(self._resident),
+                "max_models": self.max_models,
+                "memory_budget_mb": round(self.memory_budget_bytes / 1024 / 1024, 2),
+                "resident_mb": round(self.resident_bytes() / 1024 / 1024, 2)
+            }
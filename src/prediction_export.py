@@ -0,0 +1,286 @@
+"""Exportar la tabla predictions a archivos columnares, de forma incremental
+
+Las filas se leen con un cursor sin buffer (el servidor las envía a medida
+que se piden) en bloques de chunk_size, y cada bloque se escribe como un
+archivo Parquet/Arrow independiente, así que la memoria no depende del
+tamaño de la tabla. El estado (último id y timestamp exportados, criterio
+incremental y agregados acumulados) se guarda después de cada bloque con
+una sola escritura atómica: la siguiente corrida solo lee lo nuevo.
+
+Con cada bloque se actualizan también los agregados para los dashboards:
+
+- diagnosis_daily: predicciones por día y diagnóstico
+- confidence_by_model: distribución de la confianza (tramos de 10 puntos) por model_version
+
+Uso:
+    python -m src.prediction_export [--output exports] [--since id|timestamp] [--format parquet] [--full]
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.config import Config
+
+EXPORT_COLUMNS = (
+    "id", "symptoms", "diagnosis", "confidence", "model_version", "age_detected",
+    "age_range", "gender", "gender_origin", "symptoms_processed", "timestamp"
+)
+
+FILE_EXTENSIONS = {"parquet": ".parquet", "feather": ".arrow", "csv": ".csv.gz"}
+
+CONFIDENCE_BUCKET = 10  # ancho de los tramos de confianza (0-100)
+
+STATE_FILE = "state.json"
+
+def resolve_format(file_format):
+    """Parquet y Arrow necesitan pyarrow; sin él se usa CSV comprimido"""
+    if file_format not in FILE_EXTENSIONS:
+        raise ValueError(f"Formato de exportación desconocido: {file_format}")
+    if file_format in ("parquet", "feather"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            logging.warning(f"pyarrow no está instalado, se exporta en CSV en lugar de {file_format}")
+            return "csv"
+    return file_format
+
+def write_table(df, path, file_format):
+    if file_format == "parquet":
+        df.to_parquet(path, index=False)
+    elif file_format == "feather":
+        df.reset_index(drop=True).to_feather(path)
+    else:
+        df.to_csv(path, index=False, compression="gzip")
+
+def read_table(path, file_format):
+    if file_format == "parquet":
+        return pd.read_parquet(path)
+    if file_format == "feather":
+        return pd.read_feather(path)
+    return pd.read_csv(path, compression="gzip")
+
+def server_side_cursor(connection):
+    """Cursor sin buffer: mysql-connector no trae todo el resultado a memoria"""
+    try:
+        return connection.cursor(buffered=False)
+    except TypeError:
+        # Conectores DB-API sin el parámetro (p. ej. sqlite3) ya son perezosos
+        return connection.cursor()
+
+def chunk_aggregates(df):
+    """(conteos por día y diagnóstico, conteos por modelo y tramo de confianza) de un bloque"""
+    days = pd.to_datetime(df["timestamp"]).dt.strftime("%Y-%m-%d")
+    daily = df.assign(day=days).groupby(["day", "diagnosis"], dropna=False).size().rename("count")
+
+    confidence = pd.to_numeric(df["confidence"], errors="coerce")
+    buckets = (np.clip(confidence, 0, 100) // CONFIDENCE_BUCKET * CONFIDENCE_BUCKET).clip(upper=100 - CONFIDENCE_BUCKET)
+    by_model = (
+        df.assign(bucket=buckets, confidence=confidence)
+        .dropna(subset=["bucket"])
+        .astype({"bucket": int})
+        .groupby(["model_version", "bucket"], dropna=False)["confidence"]
+        .agg(count="size", confidence_sum="sum")
+    )
+    return daily, by_model
+
+class PredictionExporter:
+    """Exportación incremental de predictions a output_dir
+
+    connect() devuelve una conexión DB-API nueva (la exportación la ocupa
+    mientras dura, así que no se toma del pool). placeholder es el marcador
+    de parámetros del conector ('%s' en MySQL).
+    """
+
+    def __init__(self, connect, output_dir, chunk_size=50000, file_format="parquet", placeholder="%s",
+                 table="predictions"):
+        self.connect = connect
+        self.output_dir = output_dir
+        self.chunk_size = chunk_size
+        self.file_format = resolve_format(file_format)
+        self.placeholder = placeholder
+        self.table = table
+        self.parts_dir = os.path.join(output_dir, table)
+        self.state_path = os.path.join(output_dir, STATE_FILE)
+
+    def load_state(self):
+        if not os.path.exists(self.state_path):
+            return {"last_id": None, "last_timestamp": None, "since": None, "rows": 0, "parts": 0}
+        with open(self.state_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self, state):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def _aggregate_path(self, name):
+        return os.path.join(self.output_dir, name + FILE_EXTENSIONS[self.file_format])
+
+    def load_aggregates(self):
+        """(diagnosis_daily, confidence_by_model) ya exportados, o None si aún no hay"""
+        tables = []
+        for name, index in (("diagnosis_daily", ["day", "diagnosis"]),
+                            ("confidence_by_model", ["model_version", "bucket"])):
+            path = self._aggregate_path(name)
+            tables.append(read_table(path, self.file_format).set_index(index) if os.path.exists(path) else None)
+        return tuple(tables)
+
+    @staticmethod
+    def _aggregates_to_state(aggregates):
+        """Agregados acumulados como registros JSON (se guardan dentro de state.json)"""
+        return {
+            name: json.loads(table.reset_index().to_json(orient="records", force_ascii=False))
+            for name, table in zip(("diagnosis_daily", "confidence_by_model"), aggregates)
+        }
+
+    def _aggregates_from_state(self, state):
+        """(diagnosis_daily, confidence_by_model) acumulados según el estado confirmado"""
+        stored = state.get("aggregates")
+        if stored is None:
+            # Estado anterior a guardar los agregados: se parte de los archivos ya escritos
+            daily, by_model = self.load_aggregates()
+            return daily, by_model.drop(columns="confidence_mean") if by_model is not None else None
+        daily = pd.DataFrame.from_records(stored["diagnosis_daily"], columns=["day", "diagnosis", "count"])
+        by_model = pd.DataFrame.from_records(stored["confidence_by_model"],
+                                             columns=["model_version", "bucket", "count", "confidence_sum"])
+        return (daily.set_index(["day", "diagnosis"]).astype({"count": int}),
+                by_model.set_index(["model_version", "bucket"]).astype({"count": int}))
+
+    def _merge_aggregates(self, current, chunk):
+        daily, by_model = current
+        chunk_daily, chunk_by_model = chunk
+        daily = chunk_daily.to_frame() if daily is None else daily.add(chunk_daily.to_frame(), fill_value=0)
+        by_model = chunk_by_model if by_model is None else by_model.add(chunk_by_model, fill_value=0)
+        return daily.astype({"count": int}), by_model.astype({"count": int})
+
+    def _write_aggregates(self, aggregates):
+        daily, by_model = aggregates
+        write_table(daily.reset_index().sort_values(["day", "diagnosis"]),
+                    self._aggregate_path("diagnosis_daily"), self.file_format)
+        by_model = by_model.reset_index().sort_values(["model_version", "bucket"])
+        by_model["confidence_mean"] = by_model["confidence_sum"] / by_model["count"]
+        write_table(by_model, self._aggregate_path("confidence_by_model"), self.file_format)
+
+    def _query(self, state, since):
+        columns = ", ".join(EXPORT_COLUMNS)
+        query = f"SELECT {columns} FROM {self.table}"
+        p = self.placeholder
+        if since == "id":
+            params = () if state["last_id"] is None else (state["last_id"],)
+            where = f" WHERE id > {p}" if params else ""
+            return query + where + " ORDER BY id", params
+        if since == "timestamp":
+            if state["last_timestamp"] is None:
+                return query + " ORDER BY timestamp, id", ()
+            # (timestamp, id) posteriores al último exportado: sin perder filas con el mismo timestamp
+            where = f" WHERE timestamp > {p} OR (timestamp = {p} AND id > {p})"
+            return query + where + " ORDER BY timestamp, id", \
+                (state["last_timestamp"], state["last_timestamp"], state["last_id"])
+        raise ValueError(f"Criterio incremental desconocido: {since}")
+
+    def _clear(self):
+        """Borrar solo lo que escribe la exportación (output_dir puede tener otros archivos)"""
+        if os.path.exists(self.parts_dir):
+            shutil.rmtree(self.parts_dir)
+        aggregates = [os.path.join(self.output_dir, name + extension)
+                      for name in ("diagnosis_daily", "confidence_by_model")
+                      for extension in FILE_EXTENSIONS.values()]
+        for path in aggregates + [self.state_path, f"{self.state_path}.tmp"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def export(self, since="id", full=False, log=print):
+        """Exportar las filas nuevas; devuelve el resumen de la corrida
+
+        state.json es el único punto de confirmación: guarda la posición y
+        los agregados acumulados juntos, y los archivos de agregados se
+        regeneran a partir de él. Si la corrida se corta entre ambos pasos,
+        la siguiente vuelve a leer el bloque sin contarlo dos veces.
+        """
+        if full:
+            self._clear()
+        os.makedirs(self.parts_dir, exist_ok=True)
+
+        state = self.load_state()
+        previous = state.get("since")
+        if previous and previous != since:
+            raise ValueError(f"La exportación en {self.output_dir} continúa por {previous}, no por {since}; "
+                             f"usa --full para empezar de cero")
+        state["since"] = since
+        aggregates = self._aggregates_from_state(state)
+        if aggregates[0] is not None:
+            self._write_aggregates(aggregates)
+        query, params = self._query(state, since)
+        rows = parts = 0
+        start = time.perf_counter()
+
+        connection = self.connect()
+        try:
+            cursor = server_side_cursor(connection)
+            cursor.execute(query, params)
+            columns = [description[0] for description in cursor.description]
+            while True:
+                chunk = cursor.fetchmany(self.chunk_size)
+                if not chunk:
+                    break
+                df = pd.DataFrame.from_records(chunk, columns=columns)
+
+                # Número de bloque del estado: los ids no son monótonos con --since timestamp.
+                # Si la corrida se corta antes de confirmar, el mismo bloque reescribe el mismo archivo.
+                part_name = f"part-{state['parts'] + 1:06d}{FILE_EXTENSIONS[self.file_format]}"
+                write_table(df, os.path.join(self.parts_dir, part_name), self.file_format)
+                aggregates = self._merge_aggregates(aggregates, chunk_aggregates(df))
+
+                # Posición y agregados se confirman juntos; los archivos de agregados se derivan después
+                last = df.iloc[-1]
+                rows += len(df)
+                parts += 1
+                state.update(
+                    last_id=int(last["id"]),
+                    last_timestamp=str(last["timestamp"]),
+                    rows=state["rows"] + len(df),
+                    parts=state["parts"] + 1,
+                    exported_at=datetime.now().isoformat(),
+                    format=self.file_format,
+                    aggregates=self._aggregates_to_state(aggregates)
+                )
+                self._save_state(state)
+                self._write_aggregates(aggregates)
+            cursor.close()
+        finally:
+            connection.close()
+
+        elapsed = time.perf_counter() - start
+        log(f"✅ {rows} filas nuevas en {parts} archivos ({elapsed:.1f} s) -> {self.output_dir} "
+            f"| total exportado: {state['rows']}")
+        return {"rows": rows, "parts": parts, "seconds": round(elapsed, 2), "state": state}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=Config.EXPORT_PATH)
+    parser.add_argument("--since", choices=("id", "timestamp"), default="id",
+                        help="Columna para continuar desde la última exportación")
+    parser.add_argument("--format", choices=tuple(FILE_EXTENSIONS), default=Config.EXPORT_FORMAT)
+    parser.add_argument("--chunk-size", type=int, default=Config.EXPORT_CHUNK_SIZE)
+    parser.add_argument("--full", action="store_true", help="Borrar la exportación anterior y empezar de cero")
+    args = parser.parse_args(argv)
+
+    import mysql.connector
+    exporter = PredictionExporter(lambda: mysql.connector.connect(**Config.get_db_config()), args.output,
+                                  chunk_size=args.chunk_size, file_format=args.format)
+    try:
+        exporter.export(since=args.since, full=args.full)
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from src.config import Config
+
+_STOP = object()
+
+class AsyncPredictionLogger:
+    """Registro asíncrono de predicciones en lotes
+
+    Las peticiones solo encolan la fila (sin bloquear); un hilo en segundo
+    plano vacía la cola y escribe con executemany cuando se junta
+    batch_size filas o pasa flush_interval segundos. Si la BD no responde
+    se reintenta con backoff y, con la cola llena, se descartan filas
+    según drop_policy ('drop_new' o 'drop_oldest') en vez de bloquear.
+    """
+
+    def __init__(self, writer, max_queue_size=1000, batch_size=50, flush_interval=2.0,
+                 drop_policy="drop_new", max_retries=3, retry_backoff=0.5):
+        if drop_policy not in ("drop_new", "drop_oldest"):
+            raise ValueError(f"Política de descarte inválida: {drop_policy}")
+
+        self.writer = writer
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drop_policy = drop_policy
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.enqueued = 0
+        self.written = 0
+        self.dropped_full = 0
+        self.dropped_failed = 0
+        self.batches_flushed = 0
+        self.failed_attempts = 0
+        self.last_flush_ms = None
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    def _ensure_started(self):
+        """Arrancar el hilo de vaciado (de nuevo tras un fork de gunicorn)"""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+
+        with self._start_lock:
+            if self._pid != os.getpid():
+                # Tras un fork la cola y el hilo del padre no sirven
+                self._queue = queue.Queue(maxsize=self.max_queue_size)
+                if self._pid is None:
+                    atexit.register(self.shutdown)
+                self._pid = os.getpid()
+
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="prediction-logger", daemon=True)
+                self._thread.start()
+
+    def log(self, row):
+        """Encolar una fila sin bloquear; devuelve False si se descartó"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            if self.drop_policy == "drop_new":
+                with self._stats_lock:
+                    self.dropped_full += 1
+                return False
+
+            try:
+                self._queue.get_nowait()
+                with self._stats_lock:
+                    self.dropped_full += 1
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                with self._stats_lock:
+                    self.dropped_full += 1
+                return False
+
+        with self._stats_lock:
+            self.enqueued += 1
+        return True
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = self.flush_interval if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush(batch)
+                return
+
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+
+    def _flush(self, batch):
+        """Escribir un lote con reintentos; se descarta si la BD sigue caída"""
+        if not batch:
+            return
+
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                self.writer(batch)
+            except Exception as e:
+                with self._stats_lock:
+                    self.failed_attempts += 1
+                logging.warning(f"Error escribiendo lote de predicciones (intento {attempt + 1}): {e}")
+                if attempt < self.max_retries:
+                    time.sleep(self.retry_backoff * (2 ** attempt))
+                continue
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._stats_lock:
+                self.written += len(batch)
+                self.batches_flushed += 1
+                self.last_flush_ms = elapsed_ms
+                self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+                self._total_flush_ms += elapsed_ms
+            return
+
+        with self._stats_lock:
+            self.dropped_failed += len(batch)
+        logging.error(f"Se descartaron {len(batch)} predicciones tras {self.max_retries + 1} intentos")
+
+    def shutdown(self, timeout=10.0):
+        """Vaciar lo pendiente y detener el hilo (idempotente)"""
+        thread = self._thread
+        if thread is None or not thread.is_alive() or self._pid != os.getpid():
+            return
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                self._queue.put(_STOP, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+    def stats(self):
+        """Métricas para /api/health"""
+        with self._stats_lock:
+            return {
+                "enabled": Config.PREDICTION_LOG_ENABLED,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_size": self.max_queue_size,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped_full": self.dropped_full,
+                "dropped_failed": self.dropped_failed,
+                "batches_flushed": self.batches_flushed,
+                "failed_attempts": self.failed_attempts,
+                "last_flush_ms": round(self.last_flush_ms, 2) if self.last_flush_ms is not None else None,
+                "avg_flush_ms": round(self._total_flush_ms / self.batches_flushed, 2) if self.batches_flushed else None,
+                "max_flush_ms": round(self.max_flush_ms, 2)
+            }
+
+def _write_to_database(rows):
+    # Import diferido: mysql.connector solo hace falta si se registra algo
+    from src.database import db_manager
+    db_manager.log_predictions_batch(rows)
+
+def log_prediction_async(symptoms, diagnosis, confidence, model_version, **kwargs):
+    """Encolar una predicción para registrarla en BD (no bloquea la petición)"""
+    if not Config.PREDICTION_LOG_ENABLED:
+        return False
+
+    from src.database import db_manager
+    row = db_manager.build_prediction_row(symptoms, diagnosis, confidence, model_version, **kwargs)
+    return prediction_logger.log(row)
+
+# Instancia global
+prediction_logger = AsyncPredictionLogger(
+    _write_to_database,
+    max_queue_size=Config.PREDICTION_LOG_QUEUE_SIZE,
+    batch_size=Config.PREDICTION_LOG_BATCH_SIZE,
+    flush_interval=Config.PREDICTION_LOG_FLUSH_INTERVAL,
+    drop_policy=Config.PREDICTION_LOG_DROP_POLICY
+)
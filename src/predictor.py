@@ -1,126 +1,89 @@
-import joblib
-import os
-import numpy as np
 from datetime import datetime
 import logging
+from src.config import Config
+from src.model_registry import ModelRegistry, ModelNotFound
 from src.preprocessor import FeatureBuilder, PredictionDecoder
 
+def age_range_for(age, age_classes):
+    """Convertir una edad numérica al rango del encoder ('21-40'); otros valores pasan igual"""
+    try:
+        years = float(age)
+    except (TypeError, ValueError):
+        return age
+    
+    for age_class in age_classes:
+        low, _, high = str(age_class).partition('-')
+        try:
+            if float(low) <= years <= float(high.rstrip('+') or 'inf'):
+                return age_class
+        except ValueError:
+            continue
+    return age
+
 class ModelManager:
-    """Gestor simplificado de modelos"""
+    """Gestor de modelos v6-v10 sobre el registro con carga perezosa"""
     
-    def __init__(self):
-        self.models = {}
-        self.models_dir = 'models'
-        self.load_all_models()
+    def __init__(self, registry=None):
+        self.registry = registry or ModelRegistry(
+            Config.MODEL_PATH,
+            max_models=Config.MODEL_REGISTRY_MAX_MODELS,
+            memory_budget_mb=Config.MODEL_REGISTRY_MEMORY_MB,
+            compiled_dir=Config.COMPILED_MODELS_PATH if Config.TREE_ENGINE == 'compiled' else None,
+            compact_vocab_dir=Config.COMPACT_VOCAB_PATH if Config.VOCABULARY_FORMAT == 'compact' else None
+        )
+        print(f"🤖 Modelos descubiertos: {self.registry.versions() or 'ninguno'}")
     
-    def load_all_models(self):
-        """Cargar todos los modelos disponibles"""
-        print("🤖 Cargando modelos disponibles...")
-        
-        # Modelos a cargar con sus archivos
-        model_configs = {
-            'v6': {
-                'model': 'modelo_diagnostico_v6_xgboost.pkl',
-                'preprocessor': 'preprocesadores_v6.pkl'
-            },
-            'v7': {
-                'model': 'modelo_diagnostico_v7_optimizado.pkl', 
-                'preprocessor': 'preprocesadores_v7.pkl'
-            },
-            'v8': {
-                'model': 'modelo_diagnostico_v8_reentrenado.pkl',
-                'preprocessor': 'preprocesadores_v8_reentrenado.pkl'
-            },
-            'v8_mejorado': {
-                'model': 'modelo_diagnostico_v8_mejorado.pkl',
-                'preprocessor': 'preprocesadores_v8_mejorado.pkl'
-            },
-            'v9': {
-                'model': 'modelo_diagnostico_v9_final.pkl',
-                'preprocessor': 'preprocesadores_v9_final.pkl'
-            }
-        }
-        
-        for version, config in model_configs.items():
-            try:
-                model_path = os.path.join(self.models_dir, config['model'])
-                prep_path = os.path.join(self.models_dir, config['preprocessor'])
-                
-                if os.path.exists(model_path) and os.path.exists(prep_path):
-                    model = joblib.load(model_path)
-                    preprocessor = joblib.load(prep_path)
-                    
-                    self.models[version] = {
-                        'model': model,
-                        'preprocessor': preprocessor,
-                        'loaded': True,
-                        'type': 'binary' if version == 'v9' else 'text'
-                    }
-                    print(f"   ✅ {version}: Cargado exitosamente")
-                    
-                    # Mostrar info del modelo
-                    self._print_model_info(version, preprocessor)
-                else:
-                    print(f"   ❌ {version}: Archivos no encontrados")
-                    
-            except Exception as e:
-                print(f"   ❌ {version}: Error - {e}")
-        
-        print(f"📊 Total modelos cargados: {len(self.models)}")
-    
-    def _print_model_info(self, version, prep):
-        """Mostrar información del modelo cargado"""
-        info_parts = []
-        
-        if 'tfidf_vectorizer' in prep:
-            tfidf_features = prep['tfidf_vectorizer'].get_feature_names_out().shape[0]
-            info_parts.append(f"TF-IDF: {tfidf_features}")
-        
-        if 'age_encoder' in prep:
-            info_parts.append("Age: ✓")
-        
-        if 'gender_encoder' in prep:
-            info_parts.append("Gender: ✓")
-        
-        if 'diagnosis_encoder' in prep:
-            diseases_count = len(prep['diagnosis_encoder'].classes_)
-            info_parts.append(f"Diseases: {diseases_count}")
-        
-        if 'feature_columns' in prep:
-            symptoms_count = len(prep['feature_columns'])
-            info_parts.append(f"Symptoms: {symptoms_count}")
-        
-        print(f"      📋 {' | '.join(info_parts)}")
+    @property
+    def models(self):
+        """Versiones disponibles (se cargan al primer uso)"""
+        return self.registry.versions()
     
     def get_available_models(self):
         """Obtener lista de modelos disponibles"""
-        return list(self.models.keys())
+        return self.registry.versions()
     
-    def predict_text(self, text, model_version='v8', age_range=None, gender=None):
+    def _get_model_data(self, model_version):
+        try:
+            return self.registry.get(model_version), None
+        except ModelNotFound:
+            return None, {"error": f"Modelo {model_version} no disponible"}
+    
+    def model_type(self, model_version):
+        """'text' o 'binary' (carga el modelo si no es residente)"""
+        return self.registry.get(model_version)['type']
+    
+    def feature_count(self, model_version):
+        """Número de síntomas que espera un modelo binario"""
+        return FeatureBuilder.for_model(self.registry.get(model_version)).expected_length
+    
+    def describe(self):
+        """Residencia y tiempos de carga para /api/models"""
+        return self.registry.describe()
+    
+    def predict_text(self, text, model_version='v8', age_range=None, gender=None, top_k=None):
         """Predicción para modelos de texto"""
-        if model_version not in self.models:
-            return {"error": f"Modelo {model_version} no disponible"}
+        top_k = top_k or Config.TOP_K_DIAGNOSES
+        model_data, error = self._get_model_data(model_version)
+        if error:
+            return error
         
         try:
-            model_data = self.models[model_version]
-            
             # Usar FeatureBuilder para construir características
-            feature_builder = FeatureBuilder(model_data)
+            if 'age_encoder' in model_data['preprocessor']:
+                age_range = age_range_for(age_range, model_data['preprocessor']['age_encoder'].classes_)
+            feature_builder = FeatureBuilder.for_model(model_data)
             features, processed_text = feature_builder.build_text_features(text, age_range, gender)
             
-            # Realizar predicción
-            model = model_data['model']
-            prediction = model.predict(features)[0]
-            probabilities = model.predict_proba(features)[0]
+            # Realizar predicción (una sola inferencia)
+            probabilities = model_data['model'].predict_proba(features)[0]
             
-            # Decodificar resultado
-            diagnosis, confidence = PredictionDecoder.decode_prediction(
-                prediction, probabilities, model_data['preprocessor']
-            )
+            # Decodificar resultado con las etiquetas precalculadas
+            top = PredictionDecoder.decode_top(probabilities, PredictionDecoder.labels_for(model_data), top_k)
             
             return {
-                "diagnosis": diagnosis,
-                "confidence": confidence,
+                "diagnosis": top[0]["diagnosis"],
+                "confidence": top[0]["confidence"],
+                "top_diagnoses": top,
                 "model_version": model_version,
                 "processed_text": processed_text,
                 "features_count": features.shape[1],
@@ -131,39 +94,62 @@ class ModelManager:
             logging.error(f"Error en predicción de texto: {e}")
             return {"error": f"Error en predicción: {str(e)}"}
     
-    def predict_binary(self, symptoms_array, model_version='v9'):
-        """Predicción para modelo binario (v9)"""
-        if model_version not in self.models:
-            return {"error": f"Modelo {model_version} no disponible"}
+    def predict_binary(self, symptoms_array=None, model_version='v9', indices=None, names=None,
+                       return_probabilities=False, top_k=None):
+        """Predicción para modelo binario (v9)
+        
+        Los síntomas pueden llegar como arreglo denso de 0/1, como índices de
+        los síntomas presentes o como nombres de feature_columns.
+        """
+        top_k = top_k or Config.TOP_K_DIAGNOSES
+        model_data, error = self._get_model_data(model_version)
+        if error:
+            return error
         
         try:
-            model_data = self.models[model_version]
-            
             # Usar FeatureBuilder para construir características
-            feature_builder = FeatureBuilder(model_data)
-            features = feature_builder.build_binary_features(symptoms_array)
-            
-            # Realizar predicción
-            model = model_data['model']
-            prediction = model.predict(features)[0]
-            probabilities = model.predict_proba(features)[0]
+            feature_builder = FeatureBuilder.for_model(model_data)
+            if indices is not None:
+                features = feature_builder.build_binary_from_indices(indices)
+            elif names is not None:
+                features = feature_builder.build_binary_from_names(names)
+            else:
+                features = feature_builder.build_binary_features(symptoms_array)
             
-            # Decodificar resultado
-            diagnosis, confidence = PredictionDecoder.decode_prediction(
-                prediction, probabilities, model_data['preprocessor']
-            )
+            # Una sola inferencia: la clase es la primera del top-k
+            probabilities = model_data['model'].predict_proba(features)[0]
+            top = PredictionDecoder.decode_top(probabilities, PredictionDecoder.labels_for(model_data), top_k)
             
-            return {
-                "diagnosis": diagnosis,
-                "confidence": confidence,
+            result = {
+                "diagnosis": top[0]["diagnosis"],
+                "confidence": top[0]["confidence"],
+                "top_diagnoses": top,
                 "model_version": model_version,
                 "timestamp": datetime.now().isoformat()
             }
+            if return_probabilities:
+                result["probabilities"] = probabilities.tolist()
+            return result
             
         except Exception as e:
             return {"error": f"Error en predicción binaria: {str(e)}"}
+    
+    def predict_binary_batch(self, bitsets, model_version='v9', top_k=None):
+        """Predicción en bloque sobre una matriz N x n de síntomas (0/1 o np.packbits)
+        
+        Devuelve (diagnósticos, confianzas en %, matriz de probabilidades, top-k por fila).
+        """
+        model_data = self.registry.get(model_version)
+        features = FeatureBuilder.for_model(model_data).build_binary_batch(bitsets)
+        
+        probabilities = model_data['model'].predict_proba(features)
+        top = PredictionDecoder.decode_top(probabilities, PredictionDecoder.labels_for(model_data),
+                                           top_k or Config.TOP_K_DIAGNOSES)
+        diagnoses = [row[0]["diagnosis"] for row in top]
+        confidences = [row[0]["confidence"] for row in top]
+        return diagnoses, confidences, probabilities, top
 
-# Instancia global del gestor de modelos base
+# Instancia global del gestor de modelos base (solo escanea models/)
 model_manager = ModelManager()
 
 # ====== INTEGRACIÓN MODELO V11 ======
@@ -225,13 +211,3 @@ except Exception as e:
             return []
     
     model_manager_v11 = DummyModelManagerV11()
-
-# Crear manager básico dummy para compatibilidad
-class DummyModelManager:
-    def __init__(self):
-        self.models = {}
-    
-    def get_available_models(self):
-        return []
-
-model_manager = DummyModelManager()
\ No newline at end of file
@@ -1,8 +1,23 @@
 import re
 import pandas as pd
 import numpy as np
-from scipy.sparse import hstack
+from scipy.sparse import csr_matrix, hstack
+from src.top_k import top_k
 import logging
+import threading
+
+# Términos médicos importantes que no deben ser eliminados
+MEDICAL_TERMS = frozenset([
+    'patient', 'experiences', 'has', 'shows', 'reports', 
+    'complains', 'presents', 'symptoms', 'pain', 'fever', 
+    'headache', 'nausea', 'chest', 'abdominal', 'breathing'
+])
+
+DEFAULT_TEXT = 'patient presents with general symptoms'
+
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_DIGITS_RE = re.compile(r'\d+')
+_SYMPTOMS_SPECIAL_RE = re.compile(r'[^\w\sáéíóúñü]')
 
 class TextPreprocessor:
     """Preprocesador de texto médico"""
@@ -11,39 +26,84 @@ class TextPreprocessor:
     def clean_medical_text(text):
         """Limpiar texto médico"""
         if pd.isna(text) or text == '':
-            return 'patient presents with general symptoms'
+            return DEFAULT_TEXT
         
         text = str(text).lower()
         
-        # Términos médicos importantes que no deben ser eliminados
-        medical_terms = [
-            'patient', 'experiences', 'has', 'shows', 'reports', 
-            'complains', 'presents', 'symptoms', 'pain', 'fever', 
-            'headache', 'nausea', 'chest', 'abdominal', 'breathing'
-        ]
-        
-        # Limpiar caracteres especiales pero conservar espacios
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\d+', '', text)
-        text = re.sub(r'\s+', ' ', text)
+        # Limpiar caracteres especiales y dígitos (split() normaliza los espacios)
+        text = _PUNCTUATION_RE.sub(' ', text)
+        text = _DIGITS_RE.sub('', text)
         
         # Filtrar palabras muy cortas excepto términos médicos importantes
-        words = text.split()
-        words = [word for word in words if len(word) >= 3 or word in medical_terms]
-        text = ' '.join(words)
+        words = [word for word in text.split() if len(word) >= 3 or word in MEDICAL_TERMS]
         
         # Asegurar que el texto tenga contenido mínimo
-        if len(text.split()) < 3:
-            text = 'patient presents with general symptoms'
+        if len(words) < 3:
+            return DEFAULT_TEXT
             
-        return text.strip()
+        return ' '.join(words)
+    
+    @staticmethod
+    def clean_symptoms(symptoms):
+        """Limpiar síntomas de entrada (normalización del modelo v11)"""
+        if not symptoms:
+            return ""
+        
+        # Minúsculas, sin caracteres especiales pero con acentos, espacios normalizados
+        symptoms = _SYMPTOMS_SPECIAL_RE.sub(' ', symptoms.lower())
+        return ' '.join(symptoms.split())
+
+def append_columns(row, values):
+    """Agregar columnas al final de una fila CSR (1 x n) sin hstack
+    
+    Igual que hstack con un arreglo denso, los ceros no se almacenan: para
+    XGBoost una entrada ausente no es lo mismo que un cero explícito.
+    """
+    width = row.shape[1]
+    extra = [(width + offset, value) for offset, value in enumerate(values) if value != 0]
+    
+    indices = np.empty(row.nnz + len(extra), dtype=row.indices.dtype)
+    data = np.empty(row.nnz + len(extra), dtype=np.float64)
+    indices[:row.nnz] = row.indices
+    data[:row.nnz] = row.data
+    for position, (column, value) in enumerate(extra, start=row.nnz):
+        indices[position] = column
+        data[position] = value
+    
+    return csr_matrix((data, indices, np.array([0, len(data)])), shape=(1, width + len(values)))
 
 class FeatureBuilder:
-    """Constructor de características para predicción"""
+    """Constructor de características para predicción
+    
+    Se crea una vez por versión de modelo (ver for_model): los códigos de
+    edad y género se precalculan en diccionarios y la fila demográfica se
+    agrega directamente a la fila CSR del TF-IDF.
+    """
     
     def __init__(self, model_data):
         self.model = model_data['model']
         self.prep = model_data['preprocessor']
+        self.tfidf = self.prep.get('tfidf_vectorizer')
+        self.has_demographics = 'age_encoder' in self.prep and 'gender_encoder' in self.prep
+        
+        if self.has_demographics:
+            # LabelEncoder codifica cada clase con su posición en classes_
+            self.age_codes = {label: code for code, label in enumerate(self.prep['age_encoder'].classes_)}
+            self.gender_codes = {label: code for code, label in enumerate(self.prep['gender_encoder'].classes_)}
+        
+        self.expected_length = len(self.prep['feature_columns']) if 'feature_columns' in self.prep else None
+        if self.expected_length is not None:
+            self.feature_index = {name: i for i, name in enumerate(self.prep['feature_columns'])}
+            self._local = threading.local()
+    
+    @classmethod
+    def for_model(cls, model_data):
+        """Builder cacheado en los datos del modelo (se libera al desalojarlo)"""
+        builder = model_data.get('feature_builder')
+        if builder is None:
+            builder = cls(model_data)
+            model_data['feature_builder'] = builder
+        return builder
         
     def build_text_features(self, text, age_range=None, gender=None):
         """Construir características para modelos de texto"""
@@ -52,39 +112,21 @@ class FeatureBuilder:
             clean_text = TextPreprocessor.clean_medical_text(text)
             
             # 2. Vectorizar texto con TF-IDF
-            if 'tfidf_vectorizer' not in self.prep:
+            if self.tfidf is None:
                 raise ValueError("TF-IDF vectorizador no encontrado")
                 
-            tfidf = self.prep['tfidf_vectorizer']
-            text_features = tfidf.transform([clean_text])
+            text_features = self.tfidf.transform([clean_text])
             
             # 3. Agregar características demográficas si el modelo las requiere
-            if 'age_encoder' in self.prep and 'gender_encoder' in self.prep:
-                age_encoder = self.prep['age_encoder']
-                gender_encoder = self.prep['gender_encoder']
+            if self.has_demographics:
+                # Valores por defecto; categorías desconocidas -> primera clase (código 0)
+                age_enc = self.age_codes.get(age_range or "25-34", 0)
+                gender_enc = self.gender_codes.get(gender or "Unknown", 0)
                 
-                # Usar valores por defecto
-                if not age_range:
-                    age_range = "25-34"
-                if not gender:
-                    gender = "Unknown"
+                combined_features = append_columns(text_features, (age_enc, gender_enc))
                 
-                # Validar y corregir categorías
-                if age_range not in age_encoder.classes_:
-                    age_range = age_encoder.classes_[0]
-                    
-                if gender not in gender_encoder.classes_:
-                    gender = gender_encoder.classes_[0]
-                
-                # Codificar
-                age_enc = age_encoder.transform([age_range])[0]
-                gender_enc = gender_encoder.transform([gender])[0]
-                
-                # Combinar características
-                demo_features = np.array([[age_enc, gender_enc]])
-                combined_features = hstack([text_features, demo_features])
-                
-                logging.info(f"Características: TF-IDF({text_features.shape[1]}) + Demo(2) = {combined_features.shape[1]}")
+                logging.debug("Características: TF-IDF(%d) + Demo(2) = %d",
+                              text_features.shape[1], combined_features.shape[1])
                 
                 return combined_features, clean_text
             else:
@@ -94,14 +136,34 @@ class FeatureBuilder:
             logging.error(f"Error construyendo características: {e}")
             raise
     
+    def build_text_features_batch(self, texts, age_ranges=None, genders=None):
+        """Características de varios textos con un solo transform del TF-IDF
+
+        Igual que build_text_features fila por fila: los códigos
+        demográficos en cero no se almacenan en la matriz dispersa.
+        """
+        if self.tfidf is None:
+            raise ValueError("TF-IDF vectorizador no encontrado")
+
+        clean_texts = [TextPreprocessor.clean_medical_text(text) for text in texts]
+        text_features = self.tfidf.transform(clean_texts)
+        if not self.has_demographics:
+            return text_features, clean_texts
+
+        age_ranges = age_ranges or [None] * len(texts)
+        genders = genders or [None] * len(texts)
+        codes = np.array([
+            (self.age_codes.get(age_range or "25-34", 0), self.gender_codes.get(gender or "Unknown", 0))
+            for age_range, gender in zip(age_ranges, genders)
+        ], dtype=np.float64).reshape(len(texts), 2)
+        return hstack([text_features, csr_matrix(codes)], format='csr'), clean_texts
+
     def build_binary_features(self, symptoms_array):
         """Construir características para modelo binario"""
         try:
             # Validar longitud esperada
-            if 'feature_columns' in self.prep:
-                expected_length = len(self.prep['feature_columns'])
-                if len(symptoms_array) != expected_length:
-                    raise ValueError(f"Se esperan {expected_length} síntomas, recibidos {len(symptoms_array)}")
+            if self.expected_length is not None and len(symptoms_array) != self.expected_length:
+                raise ValueError(f"Se esperan {self.expected_length} síntomas, recibidos {len(symptoms_array)}")
             
             return np.array(symptoms_array).reshape(1, -1)
             
@@ -109,6 +171,60 @@ class FeatureBuilder:
             logging.error(f"Error construyendo características binarias: {e}")
             raise
 
+    def _binary_vector(self):
+        """Vector 1 x n preasignado por hilo (se reutiliza en cada petición)"""
+        vector = getattr(self._local, 'vector', None)
+        if vector is None:
+            vector = np.zeros((1, self.expected_length), dtype=np.float32)
+            self._local.vector = vector
+        else:
+            vector.fill(0)
+        return vector
+    
+    def build_binary_from_indices(self, indices):
+        """Características binarias a partir de los índices de síntomas presentes
+        
+        Devuelve el vector del hilo actual: usarlo antes de la siguiente llamada.
+        """
+        if self.expected_length is None:
+            raise ValueError("El modelo no tiene feature_columns")
+        
+        indices = np.asarray(indices, dtype=np.intp)
+        if indices.size and (indices.min() < 0 or indices.max() >= self.expected_length):
+            raise ValueError(f"Índices de síntomas fuera de rango (0-{self.expected_length - 1})")
+        
+        vector = self._binary_vector()
+        vector[0, indices] = 1
+        return vector
+    
+    def build_binary_from_names(self, names):
+        """Características binarias a partir de nombres de feature_columns"""
+        if self.expected_length is None:
+            raise ValueError("El modelo no tiene feature_columns")
+        
+        unknown = [name for name in names if name not in self.feature_index]
+        if unknown:
+            raise ValueError(f"Síntomas desconocidos: {', '.join(map(str, unknown))}")
+        return self.build_binary_from_indices([self.feature_index[name] for name in names])
+    
+    def build_binary_batch(self, bitsets):
+        """Matriz N x n para puntuar en bloque
+        
+        Acepta filas 0/1 de n columnas o filas empaquetadas con np.packbits
+        (ceil(n / 8) bytes por fila, uint8).
+        """
+        if self.expected_length is None:
+            raise ValueError("El modelo no tiene feature_columns")
+        
+        matrix = np.atleast_2d(np.asarray(bitsets))
+        packed_width = (self.expected_length + 7) // 8
+        if matrix.dtype == np.uint8 and matrix.shape[1] == packed_width != self.expected_length:
+            matrix = np.unpackbits(matrix, axis=1, count=self.expected_length)
+        
+        if matrix.ndim != 2 or matrix.shape[1] != self.expected_length:
+            raise ValueError(f"Se esperan filas de {self.expected_length} síntomas, recibido {matrix.shape}")
+        return matrix.astype(np.float32, copy=False)
+
 class PredictionDecoder:
     """Decodificador de predicciones"""
     
@@ -127,4 +243,35 @@ class PredictionDecoder:
             
         except Exception as e:
             logging.error(f"Error decodificando predicción: {e}")
-            return str(prediction), 0.0
\ No newline at end of file
+            return str(prediction), 0.0
+    
+    @staticmethod
+    def labels_for(model_data):
+        """Etiqueta de cada columna de predict_proba, calculada una vez por modelo"""
+        labels = model_data.get('labels')
+        if labels is None:
+            classes = getattr(model_data['model'], 'classes_', None)
+            encoder = model_data['preprocessor'].get('diagnosis_encoder')
+            if encoder is None:
+                labels = np.asarray(classes).astype(str)
+            elif classes is None:
+                labels = np.asarray(encoder.classes_)
+            else:
+                labels = np.asarray(encoder.classes_)[np.asarray(classes)]
+            model_data['labels'] = labels
+        return labels
+    
+    @staticmethod
+    def decode_top(probabilities, labels, k=3):
+        """Top-k [{'diagnosis', 'confidence'}] por fila (confianza en %)
+        
+        Acepta un vector o una matriz de probabilidades; con una matriz
+        devuelve una lista por fila.
+        """
+        indices, values = top_k(probabilities, k)
+        names = labels[indices].tolist()
+        confidences = (values * 100).tolist()
+        if indices.ndim == 1:
+            return [{"diagnosis": n, "confidence": c} for n, c in zip(names, confidences)]
+        return [[{"diagnosis": n, "confidence": c} for n, c in zip(row_names, row_confidences)]
+                for row_names, row_confidences in zip(names, confidences)]
@@ -0,0 +1,118 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.config import Config
+
+def _worker_init():
+    """Cargar el modelo una sola vez en cada proceso del pool"""
+    from src.model_loader_v11 import modelo_v11_global
+    modelo_v11_global.inference_backend = None  # el worker predice localmente
+    modelo_v11_global.load_components()
+    modelo_v11_global._ensure_backup_loaded()
+
+def _worker_predict(texts):
+    from src.model_loader_v11 import modelo_v11_global
+    return modelo_v11_global._predict_classes_local(texts)
+
+def _worker_pid(_=None):
+    return os.getpid()
+
+class ProcessInferenceBackend:
+    """Inferencia en un pool de procesos para no competir por el GIL
+
+    Los procesos cargan el modelo en el initializer y solo reciben textos
+    ya limpios; devuelven clase, confianza y top-k, y el proceso principal
+    arma la respuesta. Si un proceso muere (BrokenProcessPool) el pool se recrea y
+    la petición se reintenta una vez; si vuelve a fallar se predice en el
+    proceso principal.
+    """
+
+    def __init__(self, processes=None, start_method="forkserver", fallback=None):
+        self.processes = processes or os.cpu_count() or 1
+        self.start_method = start_method
+        self.fallback = fallback
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.restarts = 0
+        self.fallbacks = 0
+        self.tasks = 0
+
+    def _get_executor(self):
+        with self._lock:
+            # Tras un fork de gunicorn cada worker necesita su propio pool
+            if self._executor is None or self._pid != os.getpid():
+                context = multiprocessing.get_context(self.start_method)
+                self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=context,
+                                                     initializer=_worker_init)
+                self._pid = os.getpid()
+            return self._executor
+
+    def _restart(self, broken):
+        with self._lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                self.restarts += 1
+                logging.warning("♻️ Pool de inferencia caído, recreando procesos")
+
+    def predict_classes(self, texts):
+        """(clases, confianzas) para textos limpios, en el pool de procesos"""
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                result = executor.submit(_worker_predict, list(texts)).result()
+                self.tasks += 1
+                return result
+            except BrokenProcessPool:
+                self._restart(executor)
+
+        if self.fallback is None:
+            raise RuntimeError("El pool de inferencia falló dos veces seguidas")
+        self.fallbacks += 1
+        return self.fallback(texts)
+
+    def warm_up(self):
+        """Arrancar todos los procesos (y su initializer) antes del tráfico"""
+        executor = self._get_executor()
+        pids = set(executor.map(_worker_pid, range(self.processes * 4)))
+        return len(pids)
+
+    def worker_pids(self):
+        executor = self._executor
+        return sorted(executor._processes) if executor is not None else []
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self):
+        """Métricas para /api/health"""
+        return {
+            "backend": "process",
+            "processes": self.processes,
+            "start_method": self.start_method,
+            "alive": len(self.worker_pids()),
+            "tasks": self.tasks,
+            "restarts": self.restarts,
+            "fallbacks": self.fallbacks
+        }
+
+def configure_inference_backend(modelo):
+    """Conectar el backend de procesos al modelo si INFERENCE_BACKEND=process"""
+    if Config.INFERENCE_BACKEND != "process":
+        return None
+    backend = ProcessInferenceBackend(
+        processes=Config.INFERENCE_PROCESSES,
+        start_method=Config.INFERENCE_START_METHOD,
+        fallback=modelo._predict_classes_local
+    )
+    modelo.inference_backend = backend
+    print(f"🧵 Inferencia en pool de {backend.processes} procesos ({backend.start_method})")
+    return backend
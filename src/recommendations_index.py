@@ -0,0 +1,160 @@
+import logging
+import threading
+import time
+
+from src.prediction_cache import PredictionCache
+
+def normalize_name(name):
+    """Clave del índice: nombre del diagnóstico sin espacios extremos y en minúsculas"""
+    return str(name).strip().lower() if name is not None else ""
+
+class RecommendationsIndex:
+    """Índice en memoria de recomendaciones por diagnóstico
+
+    Carga todas las recomendaciones de una vez (loader) en un dict con
+    claves en inglés y en español, así la búsqueda es O(1) y no toca la
+    red. Cuando pasa refresh_interval segundos el índice se recarga en un
+    hilo en segundo plano mientras se siguen sirviendo los datos
+    anteriores. Solo ante un fallo del índice, o mientras no se haya
+    podido cargar, se consulta la BD (fallback); con el índice cargado los
+    nombres desconocidos se recuerdan hasta la próxima recarga para no
+    repetir la consulta. Los nombres vienen del usuario, así que esos
+    fallos van a una LRU acotada (max_misses). El fallback debe lanzar una
+    excepción si la consulta falla: solo una consulta exitosa sin
+    resultados cuenta como nombre desconocido.
+    """
+
+    def __init__(self, loader, fallback=None, refresh_interval=600, retry_interval=60, max_misses=1024):
+        self.loader = loader
+        self.fallback = fallback
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+
+        self._index = {}
+        # Sin TTL propio: se vacía en cada recarga
+        self._misses = PredictionCache(max_misses, ttl_seconds=0)
+        self._loaded_at = None
+        self._last_attempt = None
+        self._last_error = None
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self.hits = 0
+        self.fallback_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    @property
+    def loaded(self):
+        return self._loaded_at is not None
+
+    def refresh(self):
+        """Recargar el índice completo; devuelve el número de diagnósticos"""
+        self._last_attempt = time.monotonic()
+        try:
+            rows = self.loader()
+        except Exception as e:
+            self._last_error = str(e)
+            logging.warning(f"No se pudo cargar el índice de recomendaciones: {e}")
+            raise
+
+        index = {}
+        for name_en, name_es, text in rows:
+            recommendations = index.setdefault(normalize_name(name_en), [])
+            recommendations.append(text)
+            if name_es and normalize_name(name_es) != normalize_name(name_en):
+                index[normalize_name(name_es)] = recommendations
+
+        # Reemplazo atómico: los lectores ven el índice viejo o el nuevo
+        with self._lock:
+            self._index = index
+            self._misses.clear()
+            self._loaded_at = time.monotonic()
+            self._last_error = None
+            self.refreshes += 1
+        print(f"✅ Índice de recomendaciones cargado: {len(index)} nombres de diagnóstico")
+        return len(index)
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh()
+        except Exception:
+            pass
+
+    def _maybe_refresh(self):
+        now = time.monotonic()
+        if not self.loaded:
+            # Primera carga síncrona; si la BD no responde se reintenta más tarde
+            if self._last_attempt is None or now - self._last_attempt >= self.retry_interval:
+                with self._lock:
+                    if self._last_attempt is not None and now - self._last_attempt < self.retry_interval:
+                        return
+                    self._last_attempt = now
+                self._refresh_quietly()
+            return
+
+        if not self.refresh_interval or now - self._loaded_at < self.refresh_interval:
+            return
+        if self._last_attempt is not None and now - self._last_attempt < self.retry_interval:
+            return
+
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._last_attempt = now
+            self._refresh_thread = threading.Thread(target=self._refresh_quietly,
+                                                    name="recommendations-refresh", daemon=True)
+            self._refresh_thread.start()
+
+    def get(self, diagnosis_name):
+        """Recomendaciones del diagnóstico (copia); [] si no hay"""
+        self._maybe_refresh()
+        key = normalize_name(diagnosis_name)
+
+        recommendations = self._index.get(key)
+        if recommendations is not None:
+            self.hits += 1
+            return list(recommendations)
+
+        if self.fallback is None or self._misses.get(key) is not None:
+            self.misses += 1
+            return []
+
+        try:
+            recommendations = self.fallback(diagnosis_name)
+        except Exception as e:
+            # Un error de la BD no dice nada del nombre: no se recuerda
+            logging.warning(f"Fallback de recomendaciones falló para '{diagnosis_name}': {e}")
+            self.misses += 1
+            return []
+        if not self.loaded:
+            # Sin índice (BD caída al arrancar) se consulta cada vez, sin recordar nada
+            if recommendations:
+                self.fallback_hits += 1
+            else:
+                self.misses += 1
+            return list(recommendations)
+
+        with self._lock:
+            if recommendations:
+                self._index[key] = list(recommendations)
+                self.fallback_hits += 1
+            else:
+                self._misses.put(key, True)
+                self.misses += 1
+        return list(recommendations)
+
+    def stats(self):
+        """Métricas para /api/health"""
+        age = time.monotonic() - self._loaded_at if self.loaded else None
+        return {
+            "loaded": self.loaded,
+            "diagnoses": len(self._index),
+            "age_seconds": round(age, 1) if age is not None else None,
+            "refresh_interval": self.refresh_interval,
+            "refreshes": self.refreshes,
+            "hits": self.hits,
+            "fallback_hits": self.fallback_hits,
+            "misses": self.misses,
+            "remembered_misses": self._misses.stats()["size"],
+            "last_error": self._last_error
+        }
@@ -0,0 +1,109 @@
+import re
+from collections import namedtuple
+
+# Señales de género (palabras completas); las femeninas tienen prioridad
+FEMALE_CUES = (
+    "estoy embarazada", "menstruación", "menstrual", "ovarios", "útero",
+    "menopausia", "ginecológico", "soy mujer", "soy femenina", "estoy lactando"
+)
+MALE_CUES = ("próstata", "testículos", "soy hombre", "soy masculino", "andrológico")
+
+# Palabras clave por clase del modelo de backup, en orden de prioridad
+KEYWORD_CLASSES = (
+    (1, ("cabeza", "migraña", "cefalea")),
+    (2, ("estómago", "náusea", "vómito")),
+    (3, ("tos", "respirar", "pecho")),
+    (4, ("muscular", "articular", "dolor")),
+    (5, ("corazón", "palpitaciones")),
+    (6, ("mareo", "confusión")),
+    (7, ("fiebre", "temperatura")),
+    (8, ("piel", "erupción")),
+    (9, ("ansiedad", "nervios")),
+)
+
+# Patrones de edad en orden de prioridad (igual que la búsqueda secuencial original).
+# Se buscan por separado porque se solapan entre sí ("tengo edad 5 años") y
+# finditer sobre una alternancia no devuelve coincidencias solapadas.
+AGE_PATTERNS = tuple(re.compile(p) for p in (
+    r"tengo (\d+) años",
+    r"(\d+) años",
+    r"edad (\d+)",
+    r"soy de (\d+)",
+    r"(\d+) años de edad",
+))
+
+TextSignals = namedtuple("TextSignals", ["age", "gender", "keywords"])
+
+def _alternation(words):
+    # Las más largas primero para que ninguna quede tapada por un prefijo
+    return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+class TextSignalExtractor:
+    """Extrae edad, género y palabras clave médicas con patrones precompilados
+
+    Las señales de género se combinan en una única expresión regular y el
+    género femenino gana al masculino. Las palabras clave se buscan como
+    subcadenas (igual que `in`): el patrón va dentro de un lookahead para
+    no perder las que se solapan ("vómitos" contiene "vómito" y "tos"), y
+    las contenidas en otra palabra clave se agregan aparte. La edad usa sus
+    patrones compilados en orden de prioridad: gana la primera coincidencia
+    de cada patrón si está en el rango 1-120, igual que las búsquedas
+    secuenciales de antes.
+    """
+
+    def __init__(self, keywords=None):
+        if keywords is None:
+            keywords = [w for _, words in KEYWORD_CLASSES for w in words]
+        self.keywords = tuple(w.lower() for w in keywords)
+
+        # Sin IGNORECASE: bajar el texto una vez es ~2x más rápido que ignorar mayúsculas
+        self.gender_pattern = re.compile(
+            rf"\b(?P<female>{_alternation(FEMALE_CUES)})\b|\b(?P<male>{_alternation(MALE_CUES)})\b"
+        )
+        self.keyword_pattern = re.compile(f"(?=({_alternation(self.keywords)}))") if self.keywords else None
+        # En cada posición el lookahead da solo la más larga; las contenidas se agregan aquí
+        self.contained = {
+            w: tuple(k for k in self.keywords if k != w and k in w) for w in self.keywords
+        }
+
+    def extract(self, text):
+        """Devolver TextSignals(age, gender, keywords) del texto"""
+        if not text:
+            return TextSignals(None, "Unknown", frozenset())
+
+        lowered = text.lower()
+        female = male = False
+        keywords = set()
+
+        for match in self.gender_pattern.finditer(lowered):
+            if match.lastgroup == "female":
+                female = True
+                break
+            male = True
+
+        if self.keyword_pattern is not None:
+            for match in self.keyword_pattern.finditer(lowered):
+                keyword = match.group(1)
+                keywords.add(keyword)
+                keywords.update(self.contained[keyword])
+
+        age = None
+        for pattern in AGE_PATTERNS:
+            match = pattern.search(lowered)
+            if match and 1 <= int(match.group(1)) <= 120:
+                age = int(match.group(1))
+                break
+
+        gender = "Female" if female else "Male" if male else "Unknown"
+        return TextSignals(age, gender, frozenset(keywords))
+
+    def keyword_class(self, text):
+        """Clase del modelo de backup por palabras clave (0 si no hay ninguna)"""
+        found = self.extract(text).keywords
+        for diagnosis_class, words in KEYWORD_CLASSES:
+            if any(w in found for w in words):
+                return diagnosis_class
+        return 0
+
+# Instancia global
+text_signals = TextSignalExtractor()
@@ -0,0 +1,30 @@
+import numpy as np
+
+def top_k(probabilities, k):
+    """Índices y probabilidades de las k clases más probables, de mayor a menor
+
+    Acepta un vector (una predicción) o una matriz (una fila por predicción).
+    np.argpartition separa las k mayores en O(n) y solo esas k se ordenan;
+    con empates gana el índice menor, igual que np.argmax.
+    """
+    probabilities = np.asarray(probabilities)
+    n_classes = probabilities.shape[-1]
+    k = max(1, min(int(k), n_classes))
+
+    if probabilities.ndim == 1:
+        # Una sola predicción: indexado directo, sin take_along_axis
+        candidates = np.argpartition(-probabilities, k - 1)[:k] if k < n_classes else np.arange(n_classes)
+        candidates.sort()
+        values = probabilities[candidates]
+        order = np.argsort(-values, kind='stable')
+        return candidates[order], values[order]
+
+    if k < n_classes:
+        # Candidatos en orden de índice para que el ordenamiento estable desempate
+        candidates = np.sort(np.argpartition(-probabilities, k - 1, axis=-1)[..., :k], axis=-1)
+    else:
+        candidates = np.broadcast_to(np.arange(n_classes), probabilities.shape)
+    values = np.take_along_axis(probabilities, candidates, axis=-1)
+
+    order = np.argsort(-values, axis=-1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=-1), np.take_along_axis(values, order, axis=-1)
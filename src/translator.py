@@ -1,14 +1,33 @@
 from deep_translator import GoogleTranslator
 import logging
-import re
+from src.config import Config
+from src.label_translations import LabelTable
+from src.prediction_cache import PredictionCache
+from src.text_signals import text_signals
 
 class TranslatorManager:
-    """Gestor de traducción usando deep-translator (compatible con Python 3.13)"""
+    """Gestor de traducción usando deep-translator (compatible con Python 3.13)
     
-    def __init__(self):
+    Las etiquetas de diagnóstico se traducen con la tabla bilingüe local y
+    los demás textos pasan por una LRU; Google Translate solo se usa ante
+    un fallo de ambas y con TRANSLATION_ONLINE_FALLBACK=true.
+    """
+    
+    def __init__(self, label_table=None):
         self.translator_es_to_en = GoogleTranslator(source='es', target='en')
         self.translator_en_to_es = GoogleTranslator(source='en', target='es')
-        print("✅ Translator Manager inicializado con deep-translator")
+        self.label_table = label_table if label_table is not None else LabelTable.load(Config.LABEL_TRANSLATIONS_PATH)
+        # Sin TTL: una traducción no caduca
+        self.translation_cache = PredictionCache(Config.TRANSLATION_CACHE_SIZE, ttl_seconds=0)
+        self.online_fallback = Config.TRANSLATION_ONLINE_FALLBACK
+        print(f"✅ Translator Manager inicializado con deep-translator ({len(self.label_table)} etiquetas locales)")
+    
+    def _translate_offline(self, text, target):
+        """Traducción sin red: tabla de etiquetas y luego LRU"""
+        label = self.label_table.to_spanish(text) if target == 'es' else self.label_table.to_english(text)
+        if label is not None:
+            return label
+        return self.translation_cache.get((target, text))
     
     def translate_to_english(self, text_spanish):
         """Traducir texto de español a inglés"""
@@ -21,10 +40,17 @@ class TranslatorManager:
             if len(text_cleaned) == 0:
                 return ""
             
+            cached = self._translate_offline(text_cleaned, 'en')
+            if cached is not None:
+                return cached
+            if not self.online_fallback:
+                return text_spanish
+            
             # Traducir
             result = self.translator_es_to_en.translate(text_cleaned)
             
             if result:
+                self.translation_cache.put(('en', text_cleaned), result)
                 print(f"🔄 Traducido ES→EN: '{text_spanish[:50]}...' → '{result[:50]}...'")
                 return result
             else:
@@ -47,10 +73,17 @@ class TranslatorManager:
             if len(text_cleaned) == 0:
                 return ""
             
+            cached = self._translate_offline(text_cleaned, 'es')
+            if cached is not None:
+                return cached
+            if not self.online_fallback:
+                return text_english
+            
             # Traducir
             result = self.translator_en_to_es.translate(text_cleaned)
             
             if result:
+                self.translation_cache.put(('es', text_cleaned), result)
                 print(f"🔄 Traducido EN→ES: '{text_english[:50]}...' → '{result[:50]}...'")
                 return result
             else:
@@ -62,27 +95,17 @@ class TranslatorManager:
             print(f"❌ Error traduciendo: {e}")
             return text_english  # Retornar original si hay error
     
+    def analyze_text(self, text):
+        """Edad, género y palabras clave del texto con patrones precompilados"""
+        return text_signals.extract(text)
+    
     def extract_age_from_text(self, text):
         """Extraer edad del texto en español"""
         try:
-            # Patrones para detectar edad
-            age_patterns = [
-                r'tengo (\d+) años',
-                r'(\d+) años',
-                r'edad (\d+)',
-                r'soy de (\d+)',
-                r'(\d+) años de edad'
-            ]
-            
-            for pattern in age_patterns:
-                match = re.search(pattern, text.lower())
-                if match:
-                    age = int(match.group(1))
-                    if 1 <= age <= 120:  # Validar rango razonable
-                        print(f"📅 Edad extraída: {age} años")
-                        return age
-            
-            return None
+            age = text_signals.extract(text).age
+            if age is not None:
+                logging.debug(f"📅 Edad extraída: {age} años")
+            return age
             
         except Exception as e:
             logging.error(f"Error extrayendo edad: {e}")
@@ -111,45 +134,9 @@ class TranslatorManager:
     def detect_gender(self, text):
         """Detectar género desde el texto en español"""
         try:
-            text_lower = text.lower()
-            
-            # Patrones para detectar género femenino
-            female_patterns = [
-                r'\bestoy embarazada\b',
-                r'\bmenstruación\b',
-                r'\bmenstrual\b',
-                r'\bovarios\b',
-                r'\bútero\b',
-                r'\bmenopausia\b',
-                r'\bginecológico\b',
-                r'\bsoy mujer\b',
-                r'\bsoy femenina\b',
-                r'\bestoy lactando\b'
-            ]
-            
-            # Patrones para detectar género masculino
-            male_patterns = [
-                r'\bpróstata\b',
-                r'\btestículos\b',
-                r'\bsoy hombre\b',
-                r'\bsoy masculino\b',
-                r'\bandrológico\b'
-            ]
-            
-            # Buscar patrones femeninos
-            for pattern in female_patterns:
-                if re.search(pattern, text_lower):
-                    print(f"👩 Género detectado: Female (patrón: {pattern})")
-                    return "Female"
-            
-            # Buscar patrones masculinos
-            for pattern in male_patterns:
-                if re.search(pattern, text_lower):
-                    print(f"👨 Género detectado: Male (patrón: {pattern})")
-                    return "Male"
-            
-            print("❓ Género no detectado, usando Unknown")
-            return "Unknown"
+            gender = text_signals.extract(text).gender
+            logging.debug(f"Género detectado: {gender}")
+            return gender
             
         except Exception as e:
             logging.error(f"Error detectando género: {e}")
@@ -0,0 +1,40 @@
+import os
+import shutil
+import sys
+sys.path.append('..')
+
+from src.artifact_loader import load_artifact_bundle, write_manifest
+from src.config import Config
+
+def test_shipped_bundle_reports_real_and_fallback():
+    """Test del bundle v11 incluido: encoders reales, pipeline en fallback"""
+    bundle = load_artifact_bundle(Config.V11_COMPONENTS_PATH)
+
+    for name in ("age_encoder", "gender_encoder", "diagnosis_encoder", "metadata"):
+        assert bundle.report[name]["source"] == "real", f"{name} debería cargarse real"
+
+    # Sin clasificador real el TF-IDF real (5000 columnas) no sirve al backup
+    assert bundle.report["modelo"]["source"] == "fallback", "No se incluye clasificador v11"
+    assert bundle.report["tfidf_vectorizer"]["source"] == "fallback", "El pipeline debe ser atómico"
+    assert not bundle.pipeline_ready, "El pipeline no debería estar listo"
+    print("✅ Reporte real/fallback del bundle v11 correcto")
+
+def test_checksum_mismatch_falls_back(tmp_path):
+    """Test de rechazo de un artefacto con checksum alterado"""
+    for filename in ("age_encoder.pkl", "gender_encoder.pkl"):
+        shutil.copy(os.path.join(Config.V11_COMPONENTS_PATH, filename), tmp_path / filename)
+    write_manifest(str(tmp_path))
+
+    with open(tmp_path / "gender_encoder.pkl", "ab") as f:
+        f.write(b"corrupto")
+
+    bundle = load_artifact_bundle(str(tmp_path))
+
+    assert bundle.report["age_encoder"]["source"] == "real", "El archivo intacto debe cargarse"
+    assert bundle.report["gender_encoder"]["source"] == "fallback", "El archivo alterado debe rechazarse"
+    assert bundle.report["gender_encoder"]["reason"] == "checksum no coincide"
+    print("✅ Checksum alterado detectado")
+
+if __name__ == '__main__':
+    test_shipped_bundle_reports_real_and_fallback()
+    print("🎉 Todos los tests pasaron")
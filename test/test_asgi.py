@@ -0,0 +1,58 @@
+import asyncio
+import json
+import sys
+sys.path.append('..')
+
+from asgi import app
+
+def call(method, path, body=b""):
+    """Ejecutar una petición HTTP contra la app ASGI sin servidor"""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": []}
+    asyncio.run(app(scope, receive, send))
+
+    status = sent[0]["status"]
+    payload = sent[1]["body"]
+    return status, json.loads(payload) if payload else None
+
+def test_asgi_predict_and_health():
+    """Test de las rutas ASGI: predicción, health y test-model"""
+    status, payload = call("POST", "/api/predict-v11", json.dumps({"symptoms": "dolor de cabeza"}).encode())
+    assert status == 200 and payload["success"], f"Predicción fallida: {payload}"
+    assert "diagnostico" in payload["result"]
+
+    status, payload = call("GET", "/api/health")
+    assert status == 200 and payload["status"] == "healthy"
+
+    status, payload = call("GET", "/api/test-model")
+    assert status == 200 and payload["status"] == "success"
+
+    status, payload = call("GET", "/api/models")
+    assert status == 200 and payload["models"][0]["default"]
+
+    status, payload = call("POST", "/api/predict-v11", json.dumps({"symptoms": "fiebre", "model": "v99"}).encode())
+    assert status == 404 and "available_models" in payload
+    print("✅ Rutas ASGI")
+
+def test_asgi_errors_and_backpressure():
+    """Test de errores ASGI: JSON inválido, rutas desconocidas y cola llena"""
+    assert call("POST", "/api/predict-v11", b"no es json")[0] == 400
+    assert call("POST", "/api/predict-v11", b"{}")[0] == 400
+    assert call("GET", "/api/no-existe")[0] == 404
+    assert call("GET", "/api/predict-v11")[0] == 405
+
+    app.pending, previous = app.max_pending, app.pending
+    try:
+        status, payload = call("POST", "/api/predict-v11", json.dumps({"symptoms": "tos"}).encode())
+        assert status == 503, "Con la cola llena se responde 503"
+    finally:
+        app.pending = previous
+    print("✅ Errores y backpressure ASGI")
@@ -0,0 +1,87 @@
+import os
+import sys
+import tempfile
+sys.path.append('..')
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import LabelEncoder
+
+from src.model_registry import ModelRegistry
+from src.predictor import ModelManager
+
+N_SYMPTOMS = 132
+
+def make_binary_manager():
+    """Registro temporal con un modelo binario de juguete (132 síntomas, como v9)"""
+    rng = np.random.default_rng(0)
+    X = (rng.random((300, N_SYMPTOMS)) < 0.1).astype(np.int8)
+    labels = np.array(["Flu", "Migraine", "Gastritis"])[X[:, :3].argmax(axis=1)]
+    encoder = LabelEncoder().fit(labels)
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, encoder.transform(labels))
+
+    models_dir = tempfile.mkdtemp()
+    joblib.dump(model, os.path.join(models_dir, "modelo_diagnostico_v9_final.pkl"))
+    joblib.dump({
+        "diagnosis_encoder": encoder,
+        "feature_columns": [f"symptom_{i}" for i in range(N_SYMPTOMS)]
+    }, os.path.join(models_dir, "preprocesadores_v9_final.pkl"))
+    return ModelManager(ModelRegistry(models_dir)), model, X
+
+def test_indices_names_and_dense_agree():
+    """Test de entradas binarias: índices, nombres y arreglo denso dan lo mismo"""
+    manager, model, _ = make_binary_manager()
+    dense = [0] * N_SYMPTOMS
+    for i in (1, 7, 40):
+        dense[i] = 1
+
+    by_dense = manager.predict_binary(dense, 'v9', return_probabilities=True)
+    by_indices = manager.predict_binary(indices=[1, 7, 40], model_version='v9', return_probabilities=True)
+    by_names = manager.predict_binary(names=["symptom_1", "symptom_7", "symptom_40"], model_version='v9')
+
+    expected = model.predict_proba(np.array([dense]))[0]
+    assert np.allclose(by_indices["probabilities"], expected)
+    assert by_dense["diagnosis"] == by_indices["diagnosis"] == by_names["diagnosis"]
+    assert by_dense["confidence"] == by_indices["confidence"] == by_names["confidence"]
+
+    # El vector del hilo se reutiliza: una predicción sin síntomas no arrastra los anteriores
+    empty = manager.predict_binary(indices=[], model_version='v9', return_probabilities=True)
+    assert np.allclose(empty["probabilities"], model.predict_proba(np.zeros((1, N_SYMPTOMS)))[0])
+
+    assert "error" in manager.predict_binary(indices=[N_SYMPTOMS], model_version='v9')
+    assert "error" in manager.predict_binary(names=["no_existe"], model_version='v9')
+    print("✅ Índices, nombres y arreglo denso equivalentes")
+
+def test_batch_accepts_bitsets_and_packed_rows():
+    """Test del modo por lotes: matriz N x 132 de 0/1 o empaquetada con np.packbits"""
+    manager, model, X = make_binary_manager()
+    rows = X[:25]
+
+    diagnoses, confidences, probabilities, top = manager.predict_binary_batch(rows, 'v9', top_k=2)
+    packed = manager.predict_binary_batch(np.packbits(rows, axis=1), 'v9')
+
+    assert np.allclose(probabilities, model.predict_proba(rows))
+    assert [row[0]["diagnosis"] for row in top] == diagnoses and all(len(row) == 2 for row in top)
+    assert packed[0] == diagnoses and np.allclose(packed[2], probabilities)
+    single = manager.predict_binary(rows[3].tolist(), 'v9')
+    assert diagnoses[3] == single["diagnosis"] and abs(confidences[3] - single["confidence"]) < 1e-9
+    print("✅ Lotes binarios y empaquetados")
+
+def test_api_rejects_malformed_binary_symptoms(monkeypatch):
+    """Test de la API: listas de síntomas mal formadas responden 400 con las formas aceptadas"""
+    import src.predictor
+    from src.api import _predict_registry_response
+
+    manager, _, _ = make_binary_manager()
+    monkeypatch.setattr(src.predictor, "model_manager", manager)
+    version = manager.models[0]
+
+    for symptoms in ([{"a": 1}], [1.5, 2], [1, "symptom_2"], [True, False], [N_SYMPTOMS], "symptom_1"):
+        payload, status = _predict_registry_response(version, symptoms, None, None)
+        assert status == 400, f"{symptoms!r}: {status} {payload}"
+        assert "0/1" in payload["error"]
+
+    payload, status = _predict_registry_response(version, [1, 7, 40], None, None)
+    assert status == 200, payload
+    print("✅ Síntomas binarios mal formados rechazados con 400")
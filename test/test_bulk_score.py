@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+import tempfile
+sys.path.append('..')
+
+from src.bulk_score import bulk_score
+
+COMPLAINTS = [
+    "tengo dolor de cabeza muy fuerte",
+    "fiebre alta y escalofríos",
+    "tos y dificultad para respirar",
+    "dolor de estómago y vómitos",
+]
+
+def write_lines(path, lines, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        for line in lines:
+            f.write(line + "\n")
+
+def read_output(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_bulk_score_resumes_from_checkpoint():
+    """Test de puntuación en lote: errores por línea y reanudación sin duplicados"""
+    directory = tempfile.mkdtemp()
+    input_path, output_path = os.path.join(directory, "in.jsonl"), os.path.join(directory, "out.jsonl")
+    records = [json.dumps({"id": i, "symptoms": COMPLAINTS[i % 4]}, ensure_ascii=False) for i in range(10)]
+
+    write_lines(input_path, records[:6] + ["no es json", "", json.dumps({"id": "sin texto"})])
+    summary = bulk_score(input_path, output_path, batch_size=4, log=lambda message: None)
+    assert summary["records"] == 8 and summary["errors"] == 2, summary
+
+    # Basura escrita después del checkpoint (p. ej. un corte a mitad de lote) y entrada nueva
+    write_lines(output_path, ['{"id": 999, "incompleto'], mode="a")
+    write_lines(input_path, records[6:], mode="a")
+    summary = bulk_score(input_path, output_path, batch_size=4, resume=True, log=lambda message: None)
+    assert summary["records"] == 4 and summary["total_records"] == 12, summary
+
+    output = read_output(output_path)
+    scored = [row["id"] for row in output if "prediccion" in row]
+    assert scored == list(range(10)), scored
+    assert output[7] == {"id": "sin texto", "error": "Falta el texto (symptoms / sintomas / text / texto)"}
+    assert output[0]["prediccion"]["diagnostico"] == output[0]["prediccion"]["top_diagnosticos"][0]["diagnostico"]
+    print("✅ Puntuación en lote con checkpoint")
@@ -0,0 +1,121 @@
+import os
+import sys
+import tempfile
+sys.path.append('..')
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.tree import DecisionTreeClassifier
+
+from src.compact_vocab import CompactTfidfVectorizer, build_compact_vocabulary, load_compact_vocabulary, used_features
+from src.model_registry import ModelRegistry
+
+CORPUS = [
+    "severe headache with fever and nausea",
+    "chest pain radiating to left arm",
+    "itchy skin rash after eating peanuts",
+    "persistent cough with yellow sputum and fever",
+    "abdominal pain and acidity after meals",
+    "joint pain and swelling in the knees",
+]
+
+def make_vectorizer():
+    """TF-IDF con los mismos parámetros que los modelos de texto (v8)"""
+    return TfidfVectorizer(ngram_range=(1, 2), stop_words='english', strip_accents='ascii',
+                           sublinear_tf=True).fit(CORPUS)
+
+def test_compact_transform_matches_sklearn():
+    """Test de paridad: mismo ancho, mismas columnas y mismos valores que sklearn"""
+    vectorizer = make_vectorizer()
+    directory = tempfile.mkdtemp()
+    build_compact_vocabulary(vectorizer, directory)
+    compact = CompactTfidfVectorizer(directory)
+
+    texts = CORPUS + ["fever fever and headache, unknown words", ""]
+    expected = vectorizer.transform(texts)
+    actual = compact.transform(texts)
+    assert actual.shape == expected.shape
+    assert np.array_equal(actual.indptr, expected.indptr) and np.array_equal(actual.indices, expected.indices)
+    assert np.allclose(actual.data, expected.data, atol=1e-6)
+    print("✅ Vocabulario compacto idéntico a sklearn")
+
+def test_compact_transform_ignores_longer_tokens():
+    """Test de paridad: un token más largo que todos los términos no coincide con su prefijo"""
+    vectorizer = make_vectorizer()
+    directory = tempfile.mkdtemp()
+    build_compact_vocabulary(vectorizer, directory)
+    compact = CompactTfidfVectorizer(directory)
+
+    longest = max(vectorizer.vocabulary_, key=lambda term: len(term.encode("utf-8")))
+    assert len(longest.encode("utf-8")) == compact.terms.dtype.itemsize
+    texts = [longest + "zzz", "fever " + longest + "zzz"]
+    expected = vectorizer.transform(texts)
+    actual = compact.transform(texts)
+    assert np.array_equal(actual.indptr, expected.indptr) and np.array_equal(actual.indices, expected.indices)
+    assert np.allclose(actual.data, expected.data, atol=1e-6)
+    print("✅ Tokens largos sin falsas coincidencias")
+
+def test_pruning_keeps_used_columns_exact():
+    """Test de poda: las columnas sin uso desaparecen y las usadas no cambian"""
+    vectorizer = make_vectorizer()
+    X = vectorizer.transform(CORPUS)
+    model = DecisionTreeClassifier(random_state=0).fit(X, np.arange(len(CORPUS)) % 3)
+    used = used_features(model)
+
+    directory = tempfile.mkdtemp()
+    n_terms, pruned = build_compact_vocabulary(vectorizer, directory, model=model)
+    assert pruned == n_terms - len(used), f"Podados: {pruned}"
+
+    actual = CompactTfidfVectorizer(directory).transform(CORPUS)
+    assert set(actual.indices) <= set(used), "No deben emitirse columnas podadas"
+    assert np.allclose(actual[:, used].toarray(), X[:, used].toarray(), atol=1e-6)
+    assert np.array_equal(model.predict(actual), model.predict(X))
+    print("✅ Poda exacta de términos sin uso")
+
+def test_registry_swaps_compact_vocabulary():
+    """Test del registro: con compact_vocab_dir se usa el vocabulario compacto"""
+    models_dir, vocab_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+    prep_path = os.path.join(models_dir, "preprocesadores_vt.pkl")
+    joblib.dump({"modelo": "juguete"}, os.path.join(models_dir, "modelo_diagnostico_vt.pkl"))
+    joblib.dump({"tfidf_vectorizer": make_vectorizer()}, prep_path)
+    build_compact_vocabulary(make_vectorizer(), os.path.join(vocab_dir, "vt"), source_path=prep_path)
+
+    data = ModelRegistry(models_dir, compact_vocab_dir=vocab_dir).get("vt")
+    assert isinstance(data['preprocessor']['tfidf_vectorizer'], CompactTfidfVectorizer)
+    assert data['type'] == 'text'
+    print("✅ Registro con vocabulario compacto")
+
+def test_compact_vocabulary_staleness_uses_sha256():
+    """Test de vigencia: un preprocesador distinto del mismo tamaño o ausente invalida el vocabulario"""
+    directory, source_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+    source_path = os.path.join(source_dir, "preprocesadores_vt.pkl")
+    with open(source_path, "wb") as f:
+        f.write(b"a" * 128)
+    build_compact_vocabulary(make_vectorizer(), directory, source_path=source_path)
+    assert load_compact_vocabulary(directory, source_path) is not None
+
+    with open(source_path, "wb") as f:
+        f.write(b"b" * 128)
+    assert load_compact_vocabulary(directory, source_path) is None, "Mismo tamaño, distinto contenido"
+    os.remove(source_path)
+    assert load_compact_vocabulary(directory, source_path) is None, "Sin el original no se puede verificar"
+    print("✅ Vigencia del vocabulario compacto por sha256")
+
+def test_backup_ignores_compact_vocabulary_after_retraining(monkeypatch):
+    """Test del backup v11: si el bundle se rechaza y se reentrena, no se usa el vocabulario compacto"""
+    from src.config import Config
+    from src.model_loader_v11 import ModeloV11Fallback
+
+    monkeypatch.setattr(Config, "VOCABULARY_FORMAT", "compact")
+    monkeypatch.setattr(Config, "MODEL_ARTIFACT_FORMAT", "pickle")
+
+    modelo = ModeloV11Fallback()
+    modelo._ensure_backup_loaded()
+    assert isinstance(modelo.tfidf_vectorizer, CompactTfidfVectorizer), "Bundle verificado: se usa el compacto"
+
+    retrained = ModeloV11Fallback()
+    monkeypatch.setattr(retrained, "_load_backup_bundle", lambda: None)
+    retrained._ensure_backup_loaded()
+    assert isinstance(retrained.tfidf_vectorizer, TfidfVectorizer), "Backup reentrenado: el compacto no corresponde"
+    print("✅ Vocabulario compacto del backup solo con el bundle verificado")
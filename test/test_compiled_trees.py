@@ -0,0 +1,108 @@
+import os
+import sys
+import tempfile
+sys.path.append('..')
+
+import joblib
+import numpy as np
+from scipy.sparse import random as sparse_random
+from sklearn.ensemble import RandomForestClassifier
+from xgboost import XGBClassifier
+
+from src.compiled_trees import CompiledBoosterClassifier, compile_model, is_stale, load_compiled_model
+from src.mmap_artifacts import MmapForestClassifier, export_forest
+from src.model_registry import ModelRegistry
+
+def make_data(n_rows=400, n_features=60, n_classes=5):
+    """Datos dispersos tipo TF-IDF (la mayoría de entradas ausentes)"""
+    X = sparse_random(n_rows, n_features, density=0.08, format='csr', random_state=0, dtype=np.float32)
+    y = np.asarray(X[:, :n_classes].argmax(axis=1)).ravel()
+    return X, y
+
+def test_compiled_forest_and_booster_match_original():
+    """Test de paridad: RandomForest y XGBoost compilados dan las mismas probabilidades"""
+    X, y = make_data()
+    models = [
+        RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0).fit(X, y),
+        XGBClassifier(n_estimators=20, max_depth=4).fit(X, y),
+    ]
+    for model in models:
+        directory = tempfile.mkdtemp()
+        compile_model(model, directory)
+        compiled = load_compiled_model(directory)
+
+        # Disperso (entradas ausentes), denso y una sola fila
+        for sample in (X, X.toarray(), X[3]):
+            expected = model.predict_proba(sample)
+            assert np.allclose(compiled.predict_proba(sample), expected, atol=1e-6), type(model).__name__
+        assert (compiled.predict(X) == model.predict(X)).all()
+
+    # Recorrido NumPy del booster también para lotes (normalmente van a inplace_predict)
+    vectorized = CompiledBoosterClassifier(directory, vectorized_max_rows=10**6)
+    for sample in (X, X.toarray()):
+        assert np.allclose(vectorized.predict_proba(sample), models[1].predict_proba(sample), atol=1e-6)
+    print("✅ Motor compilado con las mismas probabilidades")
+
+def test_registry_prefers_compiled_model():
+    """Test del registro: con compiled_dir usa el compilado vigente y lo reporta"""
+    X, y = make_data()
+    models_dir, compiled_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+    model_path = os.path.join(models_dir, "modelo_diagnostico_vx.pkl")
+    joblib.dump(XGBClassifier(n_estimators=5, max_depth=3).fit(X, y), model_path)
+    joblib.dump({}, os.path.join(models_dir, "preprocesadores_vx.pkl"))
+    compile_model(joblib.load(model_path), os.path.join(compiled_dir, "vx"), source_path=model_path)
+
+    assert ModelRegistry(models_dir, compiled_dir=compiled_dir).get("vx")["engine"] == "compiled"
+    assert ModelRegistry(models_dir).get("vx")["engine"] == "native"
+
+    # Si el modelo original cambia, el compilado se ignora
+    joblib.dump(XGBClassifier(n_estimators=9, max_depth=3).fit(X, y), model_path)
+    assert ModelRegistry(models_dir, compiled_dir=compiled_dir).get("vx")["engine"] == "native"
+    print("✅ Registro con motor compilado")
+
+def test_compiled_staleness_uses_sha256():
+    """Test de vigencia: un original del mismo tamaño pero distinto o ausente invalida el compilado"""
+    X, y = make_data()
+    directory, source_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+    source_path = os.path.join(source_dir, "modelo.pkl")
+    with open(source_path, "wb") as f:
+        f.write(b"a" * 128)
+    compile_model(RandomForestClassifier(n_estimators=3, random_state=0).fit(X, y), directory, source_path=source_path)
+    assert not is_stale(directory, source_path)
+
+    with open(source_path, "wb") as f:
+        f.write(b"b" * 128)
+    assert is_stale(directory, source_path), "Mismo tamaño, distinto contenido"
+    os.remove(source_path)
+    assert is_stale(directory, source_path), "Sin el original no se puede verificar"
+    print("✅ Vigencia del compilado por sha256")
+
+def test_compiled_forest_reuses_exported_arrays():
+    """Test de bosque compilado que apunta a arreglos ya exportados (bundle mmap)"""
+    X, y = make_data()
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    arrays_dir, directory = tempfile.mkdtemp(), tempfile.mkdtemp()
+    export_forest(model, arrays_dir)
+    compile_model(model, directory, arrays_dir=arrays_dir)
+
+    assert os.listdir(directory) == ["engine.json"], "No se duplican los arreglos"
+    assert np.allclose(load_compiled_model(directory).predict_proba(X), model.predict_proba(X), atol=1e-6)
+    print("✅ Bosque compilado sobre arreglos existentes")
+
+def test_backup_ignores_compiled_after_retraining(monkeypatch):
+    """Test del backup v11: si el bundle se rechaza y se reentrena, no se usa el bosque compilado"""
+    from src.config import Config
+    from src.model_loader_v11 import ModeloV11Fallback
+
+    monkeypatch.setattr(Config, "TREE_ENGINE", "compiled")
+    monkeypatch.setattr(Config, "MODEL_ARTIFACT_FORMAT", "pickle")
+
+    modelo = ModeloV11Fallback()
+    modelo._ensure_backup_loaded()
+    assert isinstance(modelo.modelo_xgb, MmapForestClassifier), "Bundle verificado: se usa el compilado"
+
+    retrained = ModeloV11Fallback()
+    monkeypatch.setattr(retrained, "_load_backup_bundle", lambda: None)
+    retrained._ensure_backup_loaded()
+    assert isinstance(retrained.modelo_xgb, RandomForestClassifier), "Backup reentrenado: el compilado no corresponde"
+    print("✅ Compilado del backup solo con el bundle verificado")
@@ -0,0 +1,104 @@
+import sqlite3
+import sys
+import threading
+import time
+sys.path.append('..')
+
+from src.db_pool import ConnectionPool, PoolExhausted
+
+class CountingFactory:
+    """Fábrica de conexiones SQLite en memoria que cuenta las aperturas"""
+
+    def __init__(self):
+        self.opened = 0
+
+    def __call__(self):
+        self.opened += 1
+        return sqlite3.connect(":memory:", check_same_thread=False)
+
+def test_pool_reuses_connections():
+    """Test de reutilización: varias consultas usan la misma conexión"""
+    factory = CountingFactory()
+    pool = ConnectionPool(factory, max_size=2)
+
+    for _ in range(20):
+        with pool.connection() as conn:
+            assert conn.execute("SELECT 1").fetchone() == (1,)
+
+    assert factory.opened == 1, f"Se abrieron {factory.opened} conexiones"
+    assert pool.stats()["borrowed_total"] == 20
+    print("✅ Reutilización de conexiones")
+
+def test_pool_health_check_and_lifetime():
+    """Test de health check al prestar y reciclaje por antigüedad"""
+    factory = CountingFactory()
+    pool = ConnectionPool(factory, max_size=1, max_lifetime=0.05)
+
+    with pool.connection() as conn:
+        conn.close()  # conexión rota que vuelve al pool
+    with pool.connection() as conn:
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    assert pool.stats()["failed_health_checks"] == 1, "La conexión cerrada debe descartarse"
+
+    time.sleep(0.1)
+    with pool.connection():
+        pass
+    assert pool.stats()["recycled_total"] == 1, "La conexión vieja debe reciclarse"
+    assert factory.opened == 3
+    print("✅ Health check y tiempo de vida máximo")
+
+def test_pool_limit_and_error_discard():
+    """Test de límite del pool y descarte de conexiones con error"""
+    factory = CountingFactory()
+    pool = ConnectionPool(factory, max_size=1, borrow_timeout=0.1)
+
+    holding, release = threading.Event(), threading.Event()
+
+    def hold():
+        with pool.connection():
+            holding.set()
+            release.wait()
+
+    t = threading.Thread(target=hold)
+    t.start()
+    holding.wait()
+    try:
+        with pool.connection():
+            pass
+        raise AssertionError("Debería agotarse el pool")
+    except PoolExhausted:
+        pass
+    release.set()
+    t.join()
+
+    try:
+        with pool.connection():
+            raise RuntimeError("fallo en la consulta")
+    except RuntimeError:
+        pass
+    assert pool.stats()["open"] == 0, "La conexión con error no debe volver al pool"
+    print("✅ Límite del pool y descarte por error")
+
+def test_database_manager_handles_exhausted_pool():
+    """Test de pool agotado en DatabaseManager: se registra el error y no se lanza"""
+    from src.database import DatabaseManager
+
+    manager = DatabaseManager()
+    manager._pool = ConnectionPool(CountingFactory(), max_size=1, borrow_timeout=0.1)
+    holding, release = threading.Event(), threading.Event()
+
+    def hold():
+        with manager._pool.connection():
+            holding.set()
+            release.wait()
+
+    t = threading.Thread(target=hold)
+    t.start()
+    holding.wait()
+    try:
+        assert manager.log_prediction("fiebre", "Infección/Fiebre", 80.0, "v11") is False
+        assert manager.fetch_recommendations("Migraine") == []
+    finally:
+        release.set()
+        t.join()
+    print("✅ Pool agotado sin errores en la petición")
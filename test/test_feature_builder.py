@@ -0,0 +1,55 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+from scipy.sparse import hstack
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import LabelEncoder
+
+from src.preprocessor import FeatureBuilder, TextPreprocessor, append_columns
+
+def make_model_data():
+    """Preprocesador de juguete con TF-IDF y encoders demográficos"""
+    corpus = ["patient has fever and headache", "chest pain when breathing", "abdominal pain with nausea"]
+    return {
+        'model': None,
+        'preprocessor': {
+            'tfidf_vectorizer': TfidfVectorizer().fit(corpus),
+            'age_encoder': LabelEncoder().fit(["0-20", "21-40", "41-60"]),
+            'gender_encoder': LabelEncoder().fit(["Female", "Male", "Unknown"])
+        }
+    }
+
+def legacy_features(prep, text, age_range, gender):
+    """Construcción original: LabelEncoder.transform + hstack"""
+    text_features = prep['tfidf_vectorizer'].transform([TextPreprocessor.clean_medical_text(text)])
+    age_enc = prep['age_encoder'].transform([age_range if age_range in prep['age_encoder'].classes_ else prep['age_encoder'].classes_[0]])[0]
+    gender_enc = prep['gender_encoder'].transform([gender if gender in prep['gender_encoder'].classes_ else prep['gender_encoder'].classes_[0]])[0]
+    return hstack([text_features, np.array([[age_enc, gender_enc]])]).tocsr()
+
+def test_features_match_legacy_hstack():
+    """Test de paridad: misma fila (y mismos ceros implícitos) que con hstack"""
+    model_data = make_model_data()
+    builder = FeatureBuilder(model_data)
+    cases = [
+        ("Patient has fever and headache!!", "21-40", "Male"),
+        ("chest pain", "0-20", "Female"),          # códigos 0: no se almacenan
+        ("abdominal pain nausea", "99+", "Otro"),  # categorías desconocidas
+        ("", None, None),
+    ]
+    for text, age_range, gender in cases:
+        features, _ = builder.build_text_features(text, age_range, gender)
+        expected = legacy_features(model_data['preprocessor'], text, age_range or "25-34", gender or "Unknown")
+        assert features.shape == expected.shape
+        assert features.nnz == expected.nnz, f"nnz distinto para {text!r}"
+        assert np.allclose(features.toarray(), expected.toarray())
+    print("✅ Características idénticas a la construcción con hstack")
+
+def test_builder_is_cached_per_model():
+    """Test de caché: un builder por versión, guardado con los datos del modelo"""
+    model_data = make_model_data()
+    assert FeatureBuilder.for_model(model_data) is FeatureBuilder.for_model(model_data)
+    row = FeatureBuilder(model_data).tfidf.transform(["fever"])
+    combined = append_columns(row, (0, 2))
+    assert combined.shape == (1, row.shape[1] + 2) and combined.nnz == row.nnz + 1
+    print("✅ FeatureBuilder cacheado por versión")
@@ -0,0 +1,51 @@
+import sys
+import tempfile
+sys.path.append('..')
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.hashing_features import HashingTfidfVectorizer, load_hashing_bundle, train_streaming
+from src.model_loader_v11 import BACKUP_TRAINING_DATA, ModeloV11Fallback
+
+TEXTS = [text for text, _ in BACKUP_TRAINING_DATA]
+
+def test_hashing_matches_tfidf_and_partial_fit():
+    """Test de equivalencia: mismo TF-IDF que sklearn, ajustado por lotes y recargado"""
+    vectorizer = HashingTfidfVectorizer(n_features=2 ** 20, ngram_range=(1, 1))
+    vectorizer.partial_fit(TEXTS[:4]).partial_fit(TEXTS[4:])
+    expected = TfidfVectorizer(sublinear_tf=True).fit(TEXTS).transform(TEXTS)
+
+    actual = vectorizer.transform(TEXTS)
+    assert actual.shape[1] == 2 ** 20 and actual.nnz == expected.nnz
+    for row in range(len(TEXTS)):
+        assert np.allclose(np.sort(actual[row].data), np.sort(expected[row].data), atol=1e-6)
+
+    directory = tempfile.mkdtemp()
+    vectorizer.save(directory)
+    loaded = HashingTfidfVectorizer.load(directory)
+    assert abs(loaded.transform(TEXTS) - actual).max() == 0
+    loaded.partial_fit(TEXTS)  # se puede seguir ajustando sobre el arreglo mapeado
+    assert loaded.n_documents == 2 * len(TEXTS)
+    print("✅ Hashing TF-IDF equivalente a sklearn")
+
+def test_streaming_training_and_loader_selection():
+    """Test de entrenamiento en flujo y selección del pipeline en el modelo v11"""
+    directory = tempfile.mkdtemp()
+    stream = lambda: (item for _ in range(20) for item in BACKUP_TRAINING_DATA)
+    vectorizer = HashingTfidfVectorizer(n_features=2 ** 12)
+    train_streaming(stream, directory, batch_size=16, vectorizer=vectorizer)
+
+    bundle = load_hashing_bundle(directory)
+    clean = [bundle['tfidf_vectorizer'].clean_text(text) for text in TEXTS]
+    predicted = bundle['modelo'].predict(bundle['tfidf_vectorizer'].transform(clean))
+    assert list(predicted) == [label for _, label in BACKUP_TRAINING_DATA]
+
+    model = ModeloV11Fallback()
+    assert model._load_hashing_pipeline(directory)
+    response = model.predict_symptoms("fiebre alta y escalofríos")
+    assert response['diagnostico'] == "Infección/Fiebre", response
+    assert response['recomendaciones'] == model._get_basic_recommendations(7), "Clases del backup: recomendaciones por clase"
+    assert response['recomendaciones'] != model._get_basic_recommendations(0)
+    assert model.get_model_info()['caracteristicas'] == "HashingTfidfVectorizer"
+    print("✅ Entrenamiento en flujo y pipeline hashing seleccionable")
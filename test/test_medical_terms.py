@@ -0,0 +1,76 @@
+import sys
+sys.path.append('..')
+
+from src.medical_terms import AhoCorasick, MedicalTermExtractor
+from src.model_loader_v11 import ModeloV11Fallback
+from src.text_signals import KEYWORD_CLASSES
+
+def test_automaton_finds_overlapping_patterns():
+    """Test del autómata: coincidencias solapadas y por enlaces de fallo"""
+    automaton = AhoCorasick([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+    matches = sorted((start, end, value) for start, end, value in automaton.iter_matches("ushers"))
+    assert matches == [(1, 4, 2), (2, 4, 1), (2, 6, 4)], f"Coincidencias inesperadas: {matches}"
+    print("✅ Autómata Aho-Corasick")
+
+def test_extractor_whole_words_and_synonyms():
+    """Test del extractor: sinónimos a síntoma canónico y palabras completas"""
+    extractor = MedicalTermExtractor({
+        "tos": ["tos", "tos seca"],
+        "dificultad_respirar": ["falta de aire"],
+        "fiebre": ["calentura"]
+    })
+    assert extractor.extract("Tengo TOS seca y falta  de aire") == ["tos", "dificultad_respirar"]
+    assert extractor.extract("mis gastos subieron") == [], "'tos' dentro de 'gastos' no cuenta"
+    assert extractor.extract("dificultad respirar") == ["dificultad_respirar"], "La clave canónica también es un término"
+    assert extractor.extract("") == []
+    print("✅ Extracción de síntomas canónicos")
+
+def test_model_uses_terms_for_keyword_fallback():
+    """Test de integración: síntomas detectados y fallback por palabras clave"""
+    modelo = ModeloV11Fallback()
+    assert modelo.extract_symptoms("me da calentura y vértigo") == ["fiebre", "mareo"]
+    assert modelo._predict_by_keywords("ganas de vomitar y vértigo") == 2, "Gana la clase de mayor prioridad"
+    assert modelo._predict_by_keywords("ansiedad constante") == 9, "Sin términos se usan las palabras clave"
+
+    modelo.medical_dict.update({"gripe": ["influenza"]})
+    modelo.term_extractor = MedicalTermExtractor(modelo.medical_dict)
+    assert "gripe" in modelo.extract_symptoms("creo que tengo influenza")
+    print("✅ Términos médicos en el modelo v11")
+
+def _legacy_keyword_class(s):
+    """Cadena if/elif original de _predict_by_keywords"""
+    s = s.lower()
+    if any(word in s for word in ["cabeza", "migraña", "cefalea"]):
+        return 1
+    elif any(word in s for word in ["estómago", "náusea", "vómito"]):
+        return 2
+    elif any(word in s for word in ["tos", "respirar", "pecho"]):
+        return 3
+    elif any(word in s for word in ["muscular", "articular", "dolor"]):
+        return 4
+    elif any(word in s for word in ["corazón", "palpitaciones"]):
+        return 5
+    elif any(word in s for word in ["mareo", "confusión"]):
+        return 6
+    elif any(word in s for word in ["fiebre", "temperatura"]):
+        return 7
+    elif any(word in s for word in ["piel", "erupción"]):
+        return 8
+    elif any(word in s for word in ["ansiedad", "nervios"]):
+        return 9
+    return 0
+
+def test_keyword_fallback_parity():
+    """Test de paridad: misma clase que la cadena if/elif con las palabras clave originales"""
+    modelo = ModeloV11Fallback()
+    words = [w for _, group in KEYWORD_CLASSES for w in group]
+    texts = ["fiebre y palpitaciones", "vómitos y tos", "dolor de pecho", "sin nada"]
+    for a in words:
+        for b in words:
+            texts.append(f"tengo {a} y {b}")
+            texts.append(f"{a}{b}")
+    for text in texts:
+        expected = _legacy_keyword_class(text)
+        assert modelo._predict_by_keywords(text) == expected, f"'{text}': esperado {expected}"
+    assert modelo._predict_by_keywords("fiebre y palpitaciones") == 5
+    print("✅ Paridad del fallback por palabras clave")
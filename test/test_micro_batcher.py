@@ -0,0 +1,57 @@
+import sys
+import threading
+sys.path.append('..')
+
+from src.micro_batcher import MicroBatcher
+
+class FakeModel:
+    """Modelo de prueba que registra los lotes recibidos"""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        if self.fail:
+            raise RuntimeError("modelo caído")
+        return [{"eco": item} for item in items]
+
+def test_concurrent_requests_are_coalesced():
+    """Test de micro-batching: peticiones concurrentes comparten lote y orden"""
+    model = FakeModel()
+    batcher = MicroBatcher(model, max_batch_size=8, max_delay_ms=200)
+
+    futures = [batcher.submit(i) for i in range(20)]
+    results = [f.result(timeout=5) for f in futures]
+
+    assert results == [{"eco": i} for i in range(20)], "Cada petición recibe su propia respuesta"
+    assert [len(b) for b in model.batches] == [8, 8, 4], f"Lotes: {[len(b) for b in model.batches]}"
+    stats = batcher.stats()
+    assert stats["batch_size_histogram"] == {"4": 1, "8": 2}
+    assert stats["items"] == 20
+    print("✅ Peticiones agrupadas en lotes")
+
+def test_single_request_waits_at_most_max_delay():
+    """Test de retraso máximo: una petición sola no espera a llenar el lote"""
+    batcher = MicroBatcher(FakeModel(), max_batch_size=64, max_delay_ms=1)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(batcher.predict("x", timeout=2))) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [{"eco": "x"}] * 3
+    print("✅ Retraso máximo respetado")
+
+def test_batch_errors_reach_every_caller():
+    """Test de errores: un fallo del lote llega a todas las peticiones"""
+    batcher = MicroBatcher(FakeModel(fail=True), max_batch_size=4, max_delay_ms=50)
+    futures = [batcher.submit(i) for i in range(3)]
+    for future in futures:
+        try:
+            future.result(timeout=5)
+            raise AssertionError("Debería propagar el error")
+        except RuntimeError as e:
+            assert "modelo caído" in str(e)
+    print("✅ Errores propagados a cada petición")
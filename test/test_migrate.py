@@ -0,0 +1,99 @@
+import csv
+import json
+import os
+import sys
+import tempfile
+sys.path.append('..')
+
+from migrate import ALL_DISEASES_DATA, CSV_COLUMNS, load_catalog, sync_catalog
+
+class FakeCursor:
+    """Cursor de prueba que registra las consultas y devuelve ids para el catálogo"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.result = []
+
+    def execute(self, query, params=()):
+        self.connection.calls.append(("execute", " ".join(query.split())[:40], len(params)))
+        if "SELECT id, name_en" in query:
+            self.result = [(i + 1, name) for i, name in enumerate(params)]
+
+    def executemany(self, query, rows):
+        self.connection.calls.append(("executemany", " ".join(query.split())[:40], len(rows)))
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self):
+        self.calls = []
+        self.committed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+def test_sync_catalog_batches_queries():
+    """Test de carga por lotes: una consulta por paso y recomendaciones por bloques"""
+    connection = FakeConnection()
+    diseases, recommendations = sync_catalog(connection, ALL_DISEASES_DATA, chunk_size=40)
+
+    total = sum(len(data["recommendations"]) for data in ALL_DISEASES_DATA.values())
+    assert (diseases, recommendations) == (len(ALL_DISEASES_DATA), total)
+    kinds = [(kind, query.split()[0]) for kind, query, _ in connection.calls]
+    chunks = -(-total // 40)
+    assert kinds == [("executemany", "INSERT"), ("execute", "SELECT"), ("execute", "UPDATE")] \
+        + [("executemany", "INSERT")] * chunks, kinds
+    assert sum(size for kind, query, size in connection.calls[3:]) == total
+    assert connection.committed
+    print("✅ Catálogo cargado por lotes")
+
+def test_load_catalog_from_csv():
+    """Test del catálogo en CSV: una fila por recomendación"""
+    path = os.path.join(tempfile.mkdtemp(), "catalogo.csv")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerow(["Migraine", "Migraña", "Dolor de cabeza recurrente", "Descansa en un lugar oscuro", "lifestyle", 1])
+        writer.writerow(["Migraine", "Migraña", "Dolor de cabeza recurrente", "Mantente hidratado", "diet", 2])
+
+    catalog = load_catalog(path)
+    assert catalog == {"Migraine": {
+        "name_es": "Migraña",
+        "description": "Dolor de cabeza recurrente",
+        "recommendations": [("Descansa en un lugar oscuro", "lifestyle", 1), ("Mantente hidratado", "diet", 2)]
+    }}
+    print("✅ Catálogo desde CSV")
+
+def test_load_catalog_rejects_duplicate_priorities():
+    """Test de prioridades repetidas: se rechazan en lugar de pisarse en el upsert"""
+    directory = tempfile.mkdtemp()
+    csv_path = os.path.join(directory, "catalogo.csv")
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerow(["Migraine", "Migraña", "Dolor de cabeza recurrente", "Descansa en un lugar oscuro", "lifestyle", 1])
+        writer.writerow(["Migraine", "Migraña", "Dolor de cabeza recurrente", "Mantente hidratado", "diet", 1])
+
+    json_path = os.path.join(directory, "catalogo.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"Migraine": {"name_es": "Migraña", "recommendations": [
+            ["Descansa en un lugar oscuro", "lifestyle", 2], ["Mantente hidratado", "diet", 2]
+        ]}}, f)
+
+    for path in (csv_path, json_path):
+        try:
+            load_catalog(path)
+            raise AssertionError(f"{path}: debería rechazar prioridades repetidas")
+        except ValueError as e:
+            assert "Migraine" in str(e), e
+    print("✅ Prioridades repetidas rechazadas")
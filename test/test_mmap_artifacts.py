@@ -0,0 +1,74 @@
+import os
+import sys
+sys.path.append('..')
+
+import joblib
+import numpy as np
+
+from src.config import Config
+from src.mmap_artifacts import export_mmap_bundle, is_bundle_stale, load_mmap_bundle
+
+TEXTS = [
+    "patient presents with severe headache and chest pain",
+    "dolor de cabeza intenso y náuseas",
+    "fever cough cough cough",
+    ""
+]
+
+def test_mmap_tfidf_matches_original(tmp_path):
+    """Test de paridad del TF-IDF v11 exportado a mmap"""
+    tfidf = joblib.load(os.path.join(Config.V11_COMPONENTS_PATH, "tfidf_vectorizer.pkl"))
+    export_mmap_bundle({"tfidf_vectorizer": tfidf}, str(tmp_path))
+    mmap_tfidf = load_mmap_bundle(str(tmp_path))["tfidf_vectorizer"]
+
+    expected = tfidf.transform(TEXTS)
+    actual = mmap_tfidf.transform(TEXTS)
+
+    assert actual.shape == expected.shape, "Dimensiones distintas"
+    assert abs(expected - actual).max() < 1e-12, "Pesos TF-IDF distintos"
+    print("✅ TF-IDF mmap coincide con el original")
+
+def test_mmap_tfidf_ignores_longer_tokens(tmp_path):
+    """Test de regresión: un token más largo que todos los términos no coincide con su prefijo"""
+    tfidf = joblib.load(os.path.join(Config.V11_COMPONENTS_PATH, "tfidf_vectorizer.pkl"))
+    export_mmap_bundle({"tfidf_vectorizer": tfidf}, str(tmp_path))
+    mmap_tfidf = load_mmap_bundle(str(tmp_path))["tfidf_vectorizer"]
+
+    longest = max(tfidf.vocabulary_, key=lambda term: len(term.encode("utf-8")))
+    texts = [longest + "xyz", "fiebre " + longest + "xyz"]
+    expected = tfidf.transform(texts)
+    actual = mmap_tfidf.transform(texts)
+
+    assert actual.nnz == expected.nnz, f"Coincidencias falsas: {actual.nnz} vs {expected.nnz}"
+    assert abs(expected - actual).max() < 1e-12, "Pesos TF-IDF distintos"
+    print("✅ TF-IDF mmap sin falsas coincidencias por prefijo")
+
+def test_mmap_backup_forest_matches_original(tmp_path):
+    """Test de paridad del bosque de backup exportado a mmap"""
+    bundle = joblib.load(Config.V11_BACKUP_BUNDLE)
+    export_mmap_bundle({"modelo": bundle["modelo"], "tfidf_vectorizer": bundle["tfidf_vectorizer"]}, str(tmp_path))
+    mmap_bundle = load_mmap_bundle(str(tmp_path))
+
+    X = bundle["tfidf_vectorizer"].transform(TEXTS)
+    expected = bundle["modelo"].predict_proba(X)
+    actual = mmap_bundle["modelo"].predict_proba(mmap_bundle["tfidf_vectorizer"].transform(TEXTS))
+
+    assert np.allclose(expected, actual), "Probabilidades distintas"
+    print("✅ Bosque mmap coincide con el original")
+
+def test_mmap_bundle_verified_against_source(tmp_path):
+    """Test de vigencia del bundle mmap: sha256 del pickle de origen"""
+    source_path = str(tmp_path / "backup.pkl")
+    with open(source_path, "wb") as f:
+        f.write(b"a" * 128)
+    directory = str(tmp_path / "mmap")
+    tfidf = joblib.load(os.path.join(Config.V11_COMPONENTS_PATH, "tfidf_vectorizer.pkl"))
+    export_mmap_bundle({"tfidf_vectorizer": tfidf}, directory, source_path=source_path)
+    assert not is_bundle_stale(directory, source_path)
+
+    with open(source_path, "wb") as f:
+        f.write(b"b" * 128)
+    assert is_bundle_stale(directory, source_path), "Mismo tamaño, distinto contenido"
+    os.remove(source_path)
+    assert is_bundle_stale(directory, source_path), "Sin el original no se puede verificar"
+    print("✅ Bundle mmap verificado por sha256")
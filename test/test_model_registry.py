@@ -0,0 +1,70 @@
+import json
+import os
+import sys
+import tempfile
+sys.path.append('..')
+
+import joblib
+
+from src.model_registry import ModelRegistry, ModelNotFound, discover_models
+
+def make_models_dir(versions):
+    """Directorio temporal con pares modelo/preprocesador de juguete"""
+    models_dir = tempfile.mkdtemp()
+    for suffix, prep_suffix in versions:
+        joblib.dump({"nombre": suffix}, os.path.join(models_dir, f"modelo_diagnostico_{suffix}.pkl"))
+        joblib.dump({"feature_columns": ["fever"]}, os.path.join(models_dir, f"preprocesadores_{prep_suffix}.pkl"))
+    return models_dir
+
+def test_discovery_pairs_models_and_aliases():
+    """Test de descubrimiento: pares completos y alias históricos (v6_xgboost -> v6)"""
+    models_dir = make_models_dir([("v6_xgboost", "v6"), ("v8_mejorado", "v8_mejorado")])
+    joblib.dump({}, os.path.join(models_dir, "modelo_diagnostico_v7_optimizado.pkl"))  # sin preprocesador
+
+    found = discover_models(models_dir)
+    assert sorted(found) == ["v6", "v8_mejorado"], f"Versiones: {sorted(found)}"
+    print("✅ Descubrimiento de versiones")
+
+def test_lazy_loading_and_lru_eviction():
+    """Test del registro: carga perezosa, máximo residentes y desalojo LRU"""
+    models_dir = make_models_dir([("va", "va"), ("vb", "vb"), ("vc", "vc")])
+    loaded = []
+
+    def loader(path):
+        loaded.append(os.path.basename(path))
+        return joblib.load(path)
+
+    registry = ModelRegistry(models_dir, max_models=2, loader=loader)
+    assert loaded == [] and registry.resident_versions() == [], "No debe cargar nada al crearse"
+
+    assert registry.get("va")["model"] == {"nombre": "va"}
+    assert registry.get("va")["type"] == "binary"
+    registry.get("vb")
+    registry.get("va")   # va pasa a ser el más reciente
+    registry.get("vc")   # desaloja vb
+    assert registry.resident_versions() == ["va", "vc"], registry.resident_versions()
+    assert len(loaded) == 6, "Cada versión se carga una sola vez mientras es residente"
+
+    info = {m["version"]: m for m in registry.describe()["models"]}
+    assert info["vb"]["resident"] is False and info["vb"]["evictions"] == 1
+    assert info["va"]["load_time_ms"] is not None and info["va"]["hits"] == 2
+    json.dumps(registry.describe())
+
+    try:
+        registry.get("v99")
+        raise AssertionError("Debería fallar con una versión desconocida")
+    except ModelNotFound:
+        pass
+    print("✅ Carga perezosa y desalojo LRU")
+
+def test_memory_budget_limits_residents():
+    """Test del presupuesto de memoria: nunca se supera salvo con un único modelo"""
+    models_dir = make_models_dir([("va", "va"), ("vb", "vb")])
+    registry = ModelRegistry(models_dir, max_models=5, memory_budget_mb=0)
+    per_model = registry._entries["va"].estimated_bytes
+    registry.memory_budget_bytes = int(per_model * 1.5)
+
+    registry.get("va")
+    registry.get("vb")
+    assert registry.resident_versions() == ["vb"], registry.resident_versions()
+    print("✅ Presupuesto de memoria respetado")
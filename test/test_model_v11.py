@@ -0,0 +1,65 @@
+import sys
+sys.path.append('..')
+
+import time
+from src.model_loader_v11 import modelo_v11_global
+from src.prediction_cache import PredictionCache
+
+def test_batch_matches_single_predictions():
+    """Test de paridad entre predicción individual y por lotes"""
+    texts = ["dolor de cabeza intenso", "tos y dificultad para respirar", "fiebre alta"]
+
+    batch = modelo_v11_global.predict_symptoms_batch([{"symptoms": t} for t in texts])
+    single = [modelo_v11_global.predict_symptoms(t) for t in texts]
+
+    assert len(batch) == len(texts), "El lote no devolvió un resultado por item"
+    for b, s in zip(batch, single):
+        assert b["diagnostico"] == s["diagnostico"], "Diagnóstico distinto en lote"
+        assert b["confianza"] == s["confianza"], "Confianza distinta en lote"
+    print("✅ Predicción por lotes coincide con la individual")
+
+def test_batch_per_item_errors():
+    """Test de errores por item sin afectar al resto del lote"""
+    items = [{"symptoms": "dolor de estómago"}, "no es un dict", {"symptoms": 123}, {}]
+
+    results = modelo_v11_global.predict_symptoms_batch(items)
+
+    assert "error" not in results[0], "El item válido no debería fallar"
+    assert "error" in results[1], "Item que no es dict debería fallar"
+    assert "error" in results[2], "Síntomas no textuales deberían fallar"
+    assert results[3]["diagnostico"] == "Consulta Médica General", "Item vacío usa respuesta por defecto"
+    print("✅ Errores por item aislados")
+
+def test_prediction_cache_lru_and_ttl():
+    """Test de desalojo LRU y expiración por TTL"""
+    cache = PredictionCache(max_size=2, ttl_seconds=0.05)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    cache.get("a")
+    cache.put("c", {"v": 3})  # desaloja "b", el menos usado
+
+    assert cache.get("b") is None, "La entrada menos usada debería desalojarse"
+    assert cache.get("a") == {"v": 1}, "La entrada usada recientemente debe seguir"
+
+    time.sleep(0.06)
+    assert cache.get("c") is None, "La entrada debería expirar por TTL"
+    print("✅ Caché LRU con TTL funciona")
+
+def test_prediction_cache_hits_on_normalized_text():
+    """Test de acierto de caché con texto equivalente tras la limpieza"""
+    modelo_v11_global.prediction_cache.clear()
+    hits_before = modelo_v11_global.prediction_cache.hits
+
+    first = modelo_v11_global.predict_symptoms("Dolor de cabeza!!", 30, "Male")
+    second = modelo_v11_global.predict_symptoms("  dolor   de cabeza ", 30, "Male")
+
+    assert first == second, "La respuesta cacheada debe ser idéntica"
+    assert modelo_v11_global.prediction_cache.hits == hits_before + 1, "Debería haber un acierto"
+    print("✅ Caché de predicciones acierta con texto normalizado")
+
+if __name__ == '__main__':
+    test_batch_matches_single_predictions()
+    test_batch_per_item_errors()
+    test_prediction_cache_lru_and_ttl()
+    test_prediction_cache_hits_on_normalized_text()
+    print("🎉 Todos los tests pasaron")
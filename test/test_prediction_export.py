@@ -0,0 +1,160 @@
+import os
+import sqlite3
+import sys
+import tempfile
+sys.path.append('..')
+
+from src.prediction_export import PredictionExporter, read_table
+
+CREATE_TABLE = """
+    CREATE TABLE predictions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, symptoms TEXT, diagnosis TEXT, confidence REAL,
+        model_version TEXT, age_detected TEXT, age_range TEXT, gender TEXT, gender_origin TEXT,
+        symptoms_processed TEXT, timestamp TEXT
+    )
+"""
+
+INSERT = """
+    INSERT INTO predictions (symptoms, diagnosis, confidence, model_version, timestamp)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+def make_database(rows):
+    path = os.path.join(tempfile.mkdtemp(), "predicciones.db")
+    connection = sqlite3.connect(path)
+    connection.execute(CREATE_TABLE)
+    connection.executemany(INSERT, rows)
+    connection.commit()
+    connection.close()
+    return path
+
+def test_incremental_export_and_aggregates():
+    """Test de exportación: bloques, continuación por id y agregados acumulados"""
+    rows = [("fiebre", "Infección/Fiebre", 15.0 + i * 10, "v11", f"2026-10-0{1 + i % 2} 10:00:00") for i in range(7)]
+    database = make_database(rows)
+    output_dir = tempfile.mkdtemp()
+    exporter = PredictionExporter(lambda: sqlite3.connect(database), output_dir, chunk_size=3,
+                                  file_format="csv", placeholder="?")
+
+    first = exporter.export(log=lambda message: None)
+    assert first["rows"] == 7 and first["parts"] == 3, first
+
+    connection = sqlite3.connect(database)
+    connection.executemany(INSERT, [("tos", "Síntomas Respiratorios", 99.0, "v8", "2026-10-02 11:00:00")] * 2)
+    connection.commit()
+    connection.close()
+
+    second = exporter.export(log=lambda message: None)
+    assert second["rows"] == 2 and second["state"]["last_id"] == 9, second
+    assert exporter.export(log=lambda message: None)["rows"] == 0, "Sin filas nuevas no se exporta nada"
+
+    parts = sorted(os.listdir(os.path.join(output_dir, "predictions")))
+    exported_ids = sorted(i for part in parts
+                          for i in read_table(os.path.join(output_dir, "predictions", part), "csv")["id"])
+    assert exported_ids == list(range(1, 10)), exported_ids
+
+    daily, by_model = exporter.load_aggregates()
+    assert daily.loc[("2026-10-01", "Infección/Fiebre"), "count"] == 4
+    assert daily.loc[("2026-10-02", "Síntomas Respiratorios"), "count"] == 2
+    assert by_model.loc[("v8", 90), "count"] == 2
+    assert by_model.xs("v11")["count"].tolist() == [1] * 7, "Confianzas 15-75 en tramos de 10"
+    print("✅ Exportación incremental y agregados")
+
+def test_incremental_export_by_timestamp():
+    """Test de exportación por timestamp: no se pierden filas con el mismo timestamp"""
+    rows = [("fiebre", "Infección/Fiebre", 50.0, "v11", "2026-10-01 10:00:00")] * 4
+    database = make_database(rows)
+    exporter = PredictionExporter(lambda: sqlite3.connect(database), tempfile.mkdtemp(), chunk_size=2,
+                                  file_format="csv", placeholder="?")
+
+    assert exporter.export(since="timestamp", log=lambda message: None)["rows"] == 4
+    connection = sqlite3.connect(database)
+    connection.executemany(INSERT, rows[:1] + [("tos", "Síntomas Respiratorios", 60.0, "v11", "2026-10-01 12:00:00")])
+    connection.commit()
+    connection.close()
+    assert exporter.export(since="timestamp", log=lambda message: None)["rows"] == 2
+    print("✅ Exportación incremental por timestamp")
+
+def test_interrupted_export_does_not_double_count():
+    """Test de corte entre el estado y los archivos de agregados: el bloque no se cuenta dos veces"""
+    rows = [("fiebre", "Infección/Fiebre", 50.0, "v11", "2026-10-01 10:00:00")] * 5
+    database = make_database(rows)
+    output_dir = tempfile.mkdtemp()
+    exporter = PredictionExporter(lambda: sqlite3.connect(database), output_dir, chunk_size=2,
+                                  file_format="csv", placeholder="?")
+
+    write_aggregates = exporter._write_aggregates
+
+    def crash(aggregates):
+        raise RuntimeError("corte del proceso")
+
+    exporter._write_aggregates = crash
+    try:
+        exporter.export(log=lambda message: None)
+        raise AssertionError("La corrida debía cortarse")
+    except RuntimeError:
+        pass
+    exporter._write_aggregates = write_aggregates
+
+    assert exporter.export(log=lambda message: None)["rows"] == 3
+    daily, by_model = exporter.load_aggregates()
+    assert daily.loc[("2026-10-01", "Infección/Fiebre"), "count"] == 5, daily
+    assert by_model.loc[("v11", 50), "count"] == 5
+    print("✅ Corte a mitad de bloque sin doble conteo")
+
+def test_since_mode_mismatch_requires_full():
+    """Test de criterio incremental: cambiar --since entre corridas exige --full"""
+    rows = [("fiebre", "Infección/Fiebre", 50.0, "v11", "2026-10-01 10:00:00")] * 3
+    database = make_database(rows)
+    exporter = PredictionExporter(lambda: sqlite3.connect(database), tempfile.mkdtemp(), chunk_size=2,
+                                  file_format="csv", placeholder="?")
+
+    assert exporter.export(since="timestamp", log=lambda message: None)["rows"] == 3
+    try:
+        exporter.export(since="id", log=lambda message: None)
+        raise AssertionError("Debía rechazar el cambio de criterio")
+    except ValueError as e:
+        assert "--full" in str(e)
+    summary = exporter.export(since="id", full=True, log=lambda message: None)
+    assert summary["rows"] == 3 and summary["state"]["since"] == "id"
+    print("✅ Cambio de criterio incremental solo con --full")
+
+def test_timestamp_parts_do_not_overwrite():
+    """Test de nombres de bloque: con --since timestamp un id puede volver a exportarse sin pisar bloques"""
+    rows = [("fiebre", "Infección/Fiebre", 50.0, "v11", "2026-10-01 10:00:00")] * 4
+    database = make_database(rows)
+    output_dir = tempfile.mkdtemp()
+    exporter = PredictionExporter(lambda: sqlite3.connect(database), output_dir, chunk_size=2,
+                                  file_format="csv", placeholder="?")
+    assert exporter.export(since="timestamp", log=lambda message: None)["rows"] == 4
+
+    # Filas 1 y 2 corregidas más tarde: vuelven a salir con el mismo rango de ids
+    connection = sqlite3.connect(database)
+    connection.execute("UPDATE predictions SET timestamp = '2026-10-03 10:00:00' WHERE id IN (1, 2)")
+    connection.commit()
+    connection.close()
+    assert exporter.export(since="timestamp", log=lambda message: None)["rows"] == 2
+
+    parts_dir = os.path.join(output_dir, "predictions")
+    parts = sorted(os.listdir(parts_dir))
+    assert parts == ["part-000001.csv.gz", "part-000002.csv.gz", "part-000003.csv.gz"], parts
+    exported_ids = sorted(i for part in parts for i in read_table(os.path.join(parts_dir, part), "csv")["id"])
+    assert exported_ids == [1, 1, 2, 2, 3, 4], exported_ids
+    print("✅ Bloques numerados sin sobrescribir")
+
+def test_full_export_only_removes_its_own_files():
+    """Test de --full: borra bloques, agregados y estado, pero no otros archivos del directorio"""
+    rows = [("fiebre", "Infección/Fiebre", 50.0, "v11", "2026-10-01 10:00:00")] * 3
+    database = make_database(rows)
+    output_dir = tempfile.mkdtemp()
+    with open(os.path.join(output_dir, "notas.txt"), "w", encoding="utf-8") as f:
+        f.write("no borrar")
+    exporter = PredictionExporter(lambda: sqlite3.connect(database), output_dir, chunk_size=2,
+                                  file_format="csv", placeholder="?")
+
+    exporter.export(log=lambda message: None)
+    summary = exporter.export(full=True, log=lambda message: None)
+    assert summary["rows"] == 3 and summary["state"]["rows"] == 3, summary
+    assert os.path.exists(os.path.join(output_dir, "notas.txt")), "--full no debe borrar archivos ajenos"
+    assert sorted(os.listdir(os.path.join(output_dir, "predictions"))) == ["part-000001.csv.gz", "part-000002.csv.gz"]
+    print("✅ --full solo borra la exportación")
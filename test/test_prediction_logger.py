@@ -0,0 +1,67 @@
+import sys
+import threading
+sys.path.append('..')
+
+from src.prediction_logger import AsyncPredictionLogger
+
+class FakeWriter:
+    """Escritor de prueba que registra los lotes recibidos"""
+
+    def __init__(self, fail_times=0, block=None):
+        self.batches = []
+        self.fail_times = fail_times
+        self.block = block
+
+    def __call__(self, rows):
+        if self.block is not None:
+            self.block.wait()
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise ConnectionError("BD caída")
+        self.batches.append(list(rows))
+
+def test_flush_by_size_and_on_shutdown():
+    """Test de vaciado por tamaño de lote y al apagar"""
+    writer = FakeWriter()
+    logger = AsyncPredictionLogger(writer, batch_size=3, flush_interval=60)
+
+    for i in range(7):
+        assert logger.log(("fila", i)), "No debería descartar con la cola vacía"
+    logger.shutdown()
+
+    sizes = [len(b) for b in writer.batches]
+    assert sizes == [3, 3, 1], f"Lotes inesperados: {sizes}"
+    assert logger.stats()["written"] == 7, "Todas las filas deben escribirse"
+    print("✅ Vaciado por tamaño y al apagar")
+
+def test_drop_new_when_queue_full():
+    """Test de backpressure: con la BD bloqueada no se bloquea la petición"""
+    release = threading.Event()
+    writer = FakeWriter(block=release)
+    logger = AsyncPredictionLogger(writer, max_queue_size=2, batch_size=1, flush_interval=60)
+
+    accepted = [logger.log(("fila", i)) for i in range(10)]
+    release.set()
+    logger.shutdown()
+
+    assert not all(accepted), "Con la cola llena deben descartarse filas"
+    assert logger.stats()["dropped_full"] == accepted.count(False)
+    print("✅ Filas descartadas sin bloquear")
+
+def test_retry_then_succeed():
+    """Test de reintento con backoff cuando la BD falla temporalmente"""
+    writer = FakeWriter(fail_times=2)
+    logger = AsyncPredictionLogger(writer, batch_size=1, flush_interval=60, retry_backoff=0.01)
+
+    logger.log(("fila", 1))
+    logger.shutdown()
+
+    stats = logger.stats()
+    assert stats["written"] == 1 and stats["failed_attempts"] == 2, f"Estadísticas inesperadas: {stats}"
+    print("✅ Reintentos funcionan")
+
+if __name__ == '__main__':
+    test_flush_by_size_and_on_shutdown()
+    test_drop_new_when_queue_full()
+    test_retry_then_succeed()
+    print("🎉 Todos los tests pasaron")
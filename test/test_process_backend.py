@@ -0,0 +1,45 @@
+import os
+import signal
+import sys
+sys.path.append('..')
+
+from src.model_loader_v11 import ModeloV11Fallback
+from src.process_backend import ProcessInferenceBackend
+
+def test_process_backend_matches_local_and_recovers():
+    """Test del backend de procesos: paridad con el local y recuperación tras caída"""
+    modelo = ModeloV11Fallback()
+    texts = ["dolor de cabeza y fiebre", "tos seca por las noches", "me duele el estómago"]
+    expected_classes, expected_conf, expected_top = modelo._predict_classes_local(texts)
+
+    backend = ProcessInferenceBackend(processes=1, fallback=modelo._predict_classes_local)
+    try:
+        classes, confidences, top = backend.predict_classes(texts)
+        assert classes == expected_classes, f"Clases distintas: {classes} vs {expected_classes}"
+        assert all(abs(a - b) < 1e-9 for a, b in zip(confidences, expected_conf))
+        assert top == expected_top
+
+        # Matar el proceso del pool: la siguiente petición debe recrearlo
+        os.kill(backend.worker_pids()[0], signal.SIGKILL)
+        classes, _, _ = backend.predict_classes(texts)
+        assert classes == expected_classes
+        assert backend.stats()["restarts"] >= 1, "El pool caído debe recrearse"
+    finally:
+        backend.shutdown()
+    print("✅ Backend de procesos con paridad y recuperación")
+
+def test_warm_up_starts_pool_only_in_workers():
+    """Test de precalentamiento: el maestro no arranca el pool, cada worker sí"""
+    modelo = ModeloV11Fallback()
+    backend = ProcessInferenceBackend(processes=1, fallback=modelo._predict_classes_local)
+    modelo.inference_backend = backend
+    try:
+        assert modelo.warm_up(start_backend=False)
+        assert backend.worker_pids() == [], "El maestro de gunicorn no debe crear el pool"
+
+        assert modelo.warm_up()
+        assert len(backend.worker_pids()) == 1, "El worker debe arrancar sus procesos"
+        assert backend.stats()["tasks"] == 1, "La predicción de prueba va al pool"
+    finally:
+        backend.shutdown()
+    print("✅ Pool de inferencia precalentado por worker")
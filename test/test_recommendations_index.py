@@ -0,0 +1,106 @@
+import sys
+import time
+sys.path.append('..')
+
+from src.recommendations_index import RecommendationsIndex
+
+ROWS = [
+    ("Hypertension", "Hipertensión", "Reduce el consumo de sal en tu dieta"),
+    ("Hypertension", "Hipertensión", "Controla tu presión arterial regularmente"),
+    ("Asthma", "Asma", "Evita los alérgenos conocidos"),
+]
+
+class FakeSource:
+    """Origen de datos de prueba que cuenta las consultas"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.loads = 0
+        self.lookups = []
+
+    def load(self):
+        self.loads += 1
+        return list(self.rows)
+
+    def fetch(self, name):
+        self.lookups.append(name)
+        return ["Recomendación desde BD"] if name == "Migraine" else []
+
+def test_lookup_by_english_and_spanish_name():
+    """Test de búsqueda en memoria por nombre en inglés y en español"""
+    source = FakeSource(ROWS)
+    index = RecommendationsIndex(source.load, source.fetch, refresh_interval=0)
+
+    assert index.get("Hypertension") == [r[2] for r in ROWS[:2]], "Orden por prioridad"
+    assert index.get(" hipertensión ") == index.get("Hypertension"), "Clave en español normalizada"
+    assert index.get("Asma") == ["Evita los alérgenos conocidos"]
+    assert source.loads == 1, "El índice se carga una sola vez"
+    assert source.lookups == [], "Los aciertos no consultan la BD"
+    print("✅ Búsqueda por nombre en inglés y español")
+
+def test_fallback_only_on_miss():
+    """Test de consulta a BD solo ante un fallo del índice"""
+    source = FakeSource(ROWS)
+    index = RecommendationsIndex(source.load, source.fetch, refresh_interval=0)
+
+    assert index.get("Migraine") == ["Recomendación desde BD"]
+    assert index.get("Migraine") == ["Recomendación desde BD"]
+    assert index.get("Desconocido") == []
+    assert index.get("Desconocido") == []
+    assert source.lookups == ["Migraine", "Desconocido"], f"Consultas a BD: {source.lookups}"
+    print("✅ Fallback a BD solo ante fallos")
+
+def test_periodic_refresh_picks_up_changes():
+    """Test de recarga periódica en segundo plano"""
+    source = FakeSource(ROWS)
+    index = RecommendationsIndex(source.load, source.fetch, refresh_interval=0.05, retry_interval=0)
+
+    assert index.get("Asthma") == ["Evita los alérgenos conocidos"]
+    source.rows = [("Asthma", "Asma", "Usa el inhalador según indicación")]
+    time.sleep(0.1)
+    index.get("Asthma")  # dispara la recarga y sirve el índice anterior
+
+    deadline = time.time() + 2
+    while index.get("Asthma") != ["Usa el inhalador según indicación"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert index.get("Asthma") == ["Usa el inhalador según indicación"], "El índice debe recargarse"
+    assert index.stats()["refreshes"] >= 2
+    print("✅ Recarga periódica del índice")
+
+def test_fallback_while_index_not_loaded():
+    """Test de fallo en la primera carga: se consulta la BD por diagnóstico sin recordar fallos"""
+    source = FakeSource(ROWS)
+
+    def failing_load():
+        raise ConnectionError("BD no disponible")
+
+    index = RecommendationsIndex(failing_load, source.fetch, refresh_interval=0, retry_interval=3600)
+    assert index.get("Migraine") == ["Recomendación desde BD"]
+    assert index.get("Desconocido") == []
+    assert index.get("Desconocido") == []
+    assert not index.loaded
+    assert source.lookups == ["Migraine", "Desconocido", "Desconocido"], f"Consultas a BD: {source.lookups}"
+    print("✅ Fallback a BD sin índice cargado")
+
+def test_misses_are_bounded_and_skip_db_errors():
+    """Test de fallos recordados: LRU acotada y sin recordar errores de la BD"""
+    source = FakeSource(ROWS)
+    index = RecommendationsIndex(source.load, source.fetch, refresh_interval=0, max_misses=2)
+
+    for name in ("Uno", "Dos", "Tres", "Uno"):
+        assert index.get(name) == []
+    assert source.lookups == ["Uno", "Dos", "Tres", "Uno"], "'Uno' salió de la LRU y se vuelve a consultar"
+    assert index.stats()["remembered_misses"] == 2
+
+    calls = []
+
+    def failing_fetch(name):
+        calls.append(name)
+        raise ConnectionError("BD no disponible")
+
+    index = RecommendationsIndex(source.load, failing_fetch, refresh_interval=0)
+    assert index.get("Migraine") == []
+    assert index.get("Migraine") == []
+    assert calls == ["Migraine", "Migraine"], "Un error de la BD no cuenta como nombre desconocido"
+    assert index.stats()["remembered_misses"] == 0
+    print("✅ Fallos acotados y sin errores de BD")
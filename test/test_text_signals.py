@@ -0,0 +1,35 @@
+import sys
+sys.path.append('..')
+
+from src.text_signals import TextSignalExtractor, text_signals
+
+def test_age_priority_and_range():
+    """Test de edad: prioridad de patrones y rango válido 1-120"""
+    assert text_signals.extract("hace 3 años que me duele, tengo 40 años").age == 40, "'tengo N años' tiene prioridad"
+    assert text_signals.extract("Tengo 34 AÑOS y tos").age == 34, "Sin distinguir mayúsculas"
+    assert text_signals.extract("edad 45, cansancio").age == 45
+    assert text_signals.extract("soy de 29 y tengo ansiedad").age == 29
+    assert text_signals.extract("tengo 150 años y luego 30 años").age is None, "Solo el primer candidato por patrón"
+    assert text_signals.extract("tengo edad 5 años y mi padre 40 años").age == 5, "Patrones solapados en orden de prioridad"
+    assert text_signals.extract("sin edad").age is None
+    print("✅ Extracción de edad")
+
+def test_gender_cues():
+    """Test de género: palabras completas y prioridad femenina"""
+    assert text_signals.extract("Estoy embarazada y tengo mareo").gender == "Female"
+    assert text_signals.extract("soy hombre con dolor en la próstata").gender == "Male"
+    assert text_signals.extract("soy hombre pero hablo del útero de mi esposa").gender == "Female"
+    assert text_signals.extract("menstruaciones irregulares").gender == "Unknown", "Debe ser palabra completa"
+    assert text_signals.extract("").gender == "Unknown"
+    print("✅ Detección de género")
+
+def test_keywords_single_pass():
+    """Test de palabras clave: subcadenas y clase por prioridad"""
+    signals = text_signals.extract("Dolor de cabeza con náuseas y tos")
+    assert {"dolor", "cabeza", "náusea", "tos"} <= signals.keywords
+    assert text_signals.keyword_class("me duele el estómago y el pecho") == 2
+    assert text_signals.keyword_class("nada relevante") == 0
+
+    custom = TextSignalExtractor(keywords=["Gripe"])
+    assert custom.extract("creo que es gripe").keywords == {"gripe"}
+    print("✅ Palabras clave en una sola pasada")
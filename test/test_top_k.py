@@ -0,0 +1,35 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from src.config import Config
+from src.model_loader_v11 import ModeloV11Fallback
+from src.top_k import top_k
+
+def test_top_k_matches_full_sort():
+    """Test de top-k: igual que ordenar todo, con empates resueltos como argmax"""
+    rng = np.random.default_rng(0)
+    matrix = rng.random((50, 89))
+    indices, values = top_k(matrix, 5)
+    expected = np.argsort(-matrix, axis=1, kind='stable')[:, :5]
+    assert (indices == expected).all()
+    assert np.allclose(values, np.take_along_axis(matrix, expected, axis=1))
+
+    tied = np.array([0.1, 0.4, 0.4, 0.1])
+    assert top_k(tied, 2)[0].tolist() == [1, 2] and top_k(tied, 1)[0][0] == np.argmax(tied)
+    assert top_k(tied, 10)[0].tolist() == [1, 2, 0, 3], "k mayor que las clases devuelve todas"
+    print("✅ Top-k por partición parcial")
+
+def test_v11_returns_top_k_diagnoses():
+    """Test de top_diagnosticos: k entradas ordenadas, la primera es el diagnóstico"""
+    modelo = ModeloV11Fallback()
+    single = modelo.predict_symptoms("dolor de cabeza intenso con náuseas y fiebre")
+    batch = modelo.predict_symptoms_batch([{"symptoms": "tos seca y dolor de pecho"}, {"symptoms": "ansiedad"}])
+
+    for result in [single] + batch:
+        top = result["top_diagnosticos"]
+        assert len(top) == Config.TOP_K_DIAGNOSES, f"Se esperaban {Config.TOP_K_DIAGNOSES}: {top}"
+        assert top[0]["diagnostico"] == result["diagnostico"]
+        assert [t["confianza"] for t in top] == sorted((t["confianza"] for t in top), reverse=True)
+    print("✅ Top-k en predicción individual y por lote")
@@ -0,0 +1,54 @@
+import glob
+import os
+import sys
+import joblib
+sys.path.append('..')
+
+from src.config import Config
+from src.label_translations import LabelTable
+from src.translator import TranslatorManager
+
+class FakeGoogle:
+    """Traductor remoto de prueba que cuenta las llamadas"""
+
+    def __init__(self):
+        self.calls = []
+
+    def translate(self, text):
+        self.calls.append(text)
+        return f"[es] {text}"
+
+def test_shipped_table_covers_encoder_labels():
+    """Test de cobertura: todas las clases del encoder v11 y del registro tienen traducción local"""
+    table = LabelTable.load(Config.LABEL_TRANSLATIONS_PATH)
+    encoder = joblib.load(os.path.join(Config.V11_COMPONENTS_PATH, 'diagnosis_encoder.pkl'))
+    labels = [str(c) for c in encoder.classes_]
+    for path in glob.glob(os.path.join(Config.MODEL_PATH, 'preprocesadores_*.pkl')):
+        labels += [str(c) for c in joblib.load(path)['diagnosis_encoder'].classes_ if str(c) != 'nan']
+
+    missing = sorted({label for label in labels if table.to_spanish(label) is None})
+    assert not missing, f"Etiquetas sin traducción: {missing}"
+    assert table.to_spanish("Peptic ulcer diseae") == "Úlcera péptica"
+    assert table.to_spanish("  central nervous system/  neuromuscular ") == "Sistema Nervioso Central/Neuromuscular"
+    assert table.to_spanish("Migraña") == "Migraña", "Una etiqueta en español se devuelve tal cual"
+    print(f"✅ Tabla local con {len(table)} etiquetas")
+
+def test_labels_never_leave_the_process():
+    """Test de traducción sin red: etiquetas desde la tabla, textos desde la LRU"""
+    manager = TranslatorManager(LabelTable({"Chronic Pain": "Dolor crónico"}))
+    manager.online_fallback = True
+    google = FakeGoogle()
+    manager.translator_en_to_es = google
+
+    assert manager.translate_to_spanish("Chronic Pain") == "Dolor crónico"
+    assert google.calls == [], "Las etiquetas conocidas no deben llamar a Google"
+
+    assert manager.translate_to_spanish("sore throat") == "[es] sore throat"
+    assert manager.translate_to_spanish("sore throat") == "[es] sore throat"
+    assert google.calls == ["sore throat"], "La segunda traducción debe salir de la LRU"
+
+    assert not TranslatorManager(LabelTable()).online_fallback, "Sin red por defecto"
+    manager.online_fallback = False
+    assert manager.translate_to_spanish("back pain") == "back pain", "Sin red se devuelve el original"
+    assert google.calls == ["sore throat"]
+    print("✅ Traducción de etiquetas sin salir del proceso")